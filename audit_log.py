@@ -0,0 +1,178 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Prediction Audit Log
+# ----------------------------------------------------------------------
+# Append-only record of every prediction: time, source (form, combined,
+# batch, api), disease, model version, features, result and the
+# severity / age group used for advice. Callers only append to a bounded
+# in-memory queue; a background thread writes it to SQLite (WAL mode) in
+# batches, one transaction per batch, so request threads never wait on
+# disk. When the queue is full, interactive callers drop the rows that do
+# not fit (counted in healthguard_audit_rows_total{result="dropped"});
+# offline callers can pass block=True and wait for room instead.
+#
+#   python audit_log.py stats
+#   python audit_log.py export predictions.parquet --disease Diabetes
+# ----------------------------------------------------------------------
+import argparse
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+import feature_schema
+import metrics
+
+DEFAULT_PATH = "audit/predictions.sqlite3"
+DEFAULT_MAX_PENDING_ROWS = 200_000 # ~35 MB of Parkinson's features at worst
+DEFAULT_BATCH_ROWS = 2_000
+DEFAULT_FLUSH_SECONDS = 1.0
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY, ts REAL NOT NULL, source TEXT NOT NULL, disease TEXT NOT NULL, model_version TEXT,
+    features TEXT NOT NULL, prediction INTEGER NOT NULL, severity TEXT, age_group TEXT, trace_id TEXT);
+CREATE INDEX IF NOT EXISTS predictions_disease_ts ON predictions (disease, ts);
+"""
+INSERT_SQL = "INSERT INTO predictions (ts, source, disease, model_version, features, prediction, severity, age_group, trace_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+rows_total = metrics.registry.counter("healthguard_audit_rows_total", "Prediction log rows by result (written, dropped, failed).")
+pending_gauge = metrics.registry.gauge("healthguard_audit_pending_rows", "Prediction log rows queued in memory, not yet on disk.")
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL"); conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA_SQL)
+    return conn
+
+
+class AuditLog:
+    """Bounded queue of prediction records drained to SQLite by one writer thread."""
+
+    def __init__(self, path=DEFAULT_PATH, max_pending_rows=DEFAULT_MAX_PENDING_ROWS, batch_rows=DEFAULT_BATCH_ROWS, flush_seconds=DEFAULT_FLUSH_SECONDS):
+        self.path = path; self.max_pending_rows = max_pending_rows; self.batch_rows = batch_rows; self.flush_seconds = flush_seconds
+        self.pending = deque(); self.pending_rows = 0; self.closed = False; self.thread = None
+        lock = threading.Lock(); self.has_rows = threading.Condition(lock); self.has_room = threading.Condition(lock)
+        self.written = 0; self.dropped = 0; self.failed = 0
+
+    def start(self):
+        """Creates the database (errors surface here, not in the writer) and starts the writer thread."""
+        if os.path.dirname(self.path): os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connect(self.path).close()
+        self.thread = threading.Thread(target=self._run, name="healthguard-audit-log", daemon=True); self.thread.start()
+        atexit.register(self.close)
+        return self
+
+    def record(self, disease, model_version, rows, predictions, source, severity=None, age_group=None, trace_id=None, block=False):
+        """Queues one predict call's rows; returns False if any were dropped (queue full or log closed)."""
+        X = np.asarray(rows, dtype=np.float64).reshape(len(rows), -1); predictions = np.asarray(predictions).astype(np.int64, copy=False)
+        meta = (time.time(), source, disease, model_version, severity, age_group, trace_id)
+        step = max(min(self.batch_rows, self.max_pending_rows), 1); queued = 0 # big inputs are queued piecewise
+        for start in range(0, len(X), step):
+            taken = self._put(meta, X[start:start + step], predictions[start:start + step], block); queued += taken
+            if taken < len(X[start:start + step]): break # queue full (non-blocking) or log closed: the rest is dropped
+        lost = len(X) - queued
+        if lost:
+            rows_total.inc(lost, result="dropped")
+            with self.has_room: self.dropped += lost
+        return not lost
+
+    def _put(self, meta, X, predictions, block):
+        """Queues as many rows as fit (a blocking caller waits until all of them fit); returns how many were queued."""
+        with self.has_room:
+            while block and not self.closed and self.pending_rows + len(X) > self.max_pending_rows: self.has_room.wait()
+            n = 0 if self.closed else max(min(len(X), self.max_pending_rows - self.pending_rows), 0)
+            if n:
+                self.pending.append((meta, X[:n], predictions[:n])); self.pending_rows += n
+                pending_gauge.set(self.pending_rows); self.has_rows.notify()
+        return n
+
+    def _take(self):
+        """Waits for a batch (batch_rows queued, or flush_seconds after the first record); returns (items, closing)."""
+        with self.has_rows:
+            while not self.pending and not self.closed: self.has_rows.wait()
+            deadline = time.monotonic() + self.flush_seconds
+            while not self.closed and self.pending_rows < self.batch_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0: break
+                self.has_rows.wait(remaining)
+            items = list(self.pending); self.pending.clear(); self.pending_rows = 0
+            pending_gauge.set(0); self.has_room.notify_all()
+            return items, self.closed
+
+    def _run(self):
+        conn = connect(self.path)
+        try:
+            while True:
+                items, closing = self._take()
+                if items: self._write(conn, items)
+                if closing and not items: break
+        finally: conn.close()
+
+    def _write(self, conn, items):
+        rows = [(ts, source, disease, version, json.dumps(features), prediction, severity, age_group, trace_id)
+                for (ts, source, disease, version, severity, age_group, trace_id), X, predictions in items
+                for features, prediction in zip(X.tolist(), predictions.tolist())]
+        try:
+            with metrics.timer("audit_flush"):
+                with conn: conn.executemany(INSERT_SQL, rows) # one transaction per batch
+            self.written += len(rows); rows_total.inc(len(rows), result="written")
+        except sqlite3.Error as e:
+            self.failed += len(rows); rows_total.inc(len(rows), result="failed")
+            print(f"Audit log: {len(rows)} rows not written to {self.path}: {e}")
+
+    def close(self, timeout=10.0):
+        """Flushes what is queued and stops the writer."""
+        with self.has_rows:
+            self.closed = True; self.has_rows.notify_all(); self.has_room.notify_all()
+        if self.thread is not None and self.thread is not threading.current_thread(): self.thread.join(timeout)
+
+    def stats(self):
+        with self.has_rows:
+            return {"path": self.path, "pending_rows": self.pending_rows, "max_pending_rows": self.max_pending_rows,
+                    "written": self.written, "dropped": self.dropped, "failed": self.failed}
+
+
+# ----------------------------------------------------------------------
+# --- READING (audits & retraining exports) ---
+# ----------------------------------------------------------------------
+def read_frame(path=DEFAULT_PATH, disease=None, since=None):
+    """Logged predictions as a DataFrame; with `disease`, features are expanded into the model's columns."""
+    import pandas as pd
+    query = "SELECT * FROM predictions WHERE 1=1"; params = []
+    if disease: query += " AND disease = ?"; params.append(disease)
+    if since: query += " AND ts >= ?"; params.append(since)
+    with sqlite3.connect(path) as conn: frame = pd.read_sql_query(query + " ORDER BY id", conn, params=params)
+    frame["ts"] = pd.to_datetime(frame["ts"], unit="s", utc=True)
+    if disease:
+        features = pd.DataFrame(frame.pop("features").map(json.loads).tolist(), columns=feature_schema.FEATURE_COLUMNS[disease], index=frame.index)
+        frame = pd.concat([frame, features], axis=1)
+    return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or export the HealthGuard prediction audit log.")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Row counts by disease, source and result")
+    export = commands.add_parser("export", help="Write one disease's log as .csv or .parquet (features as columns)")
+    export.add_argument("output"); export.add_argument("--disease", required=True, choices=list(feature_schema.SCHEMA))
+    args = parser.parse_args(argv)
+    if args.command == "stats":
+        with sqlite3.connect(args.db) as conn:
+            for disease, source, prediction, count in conn.execute("SELECT disease, source, prediction, COUNT(*) FROM predictions GROUP BY 1, 2, 3 ORDER BY 1, 2, 3"):
+                print(f"{disease:<14} {source:<9} prediction={prediction}  {count}")
+    else:
+        frame = read_frame(args.db, args.disease)
+        if args.output.endswith(".parquet"): frame.to_parquet(args.output, index=False)
+        else: frame.to_csv(args.output, index=False)
+        print(f"Exported {len(frame)} {args.disease} predictions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
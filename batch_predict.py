@@ -0,0 +1,117 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Batch (CSV) Screening Helpers
+# ----------------------------------------------------------------------
+# Validates an uploaded screening-camp CSV against the feature schema
+# (feature_schema.py), converts it into a single float matrix in the
+# column order each model was trained on, and scores
+# it chunk by chunk with one vectorized `predict` call per chunk.
+# ----------------------------------------------------------------------
+import argparse
+import io
+
+import numpy as np
+import pandas as pd
+
+import audit_log
+import feature_schema
+from feature_schema import FEATURE_COLUMNS # model input order
+
+RESULT_LABELS = {1: "High risk", 0: "Low risk"}
+DEFAULT_CHUNK_SIZE = 50_000
+MAX_REPORTED_ERRORS = 10
+
+
+class BatchValidationError(ValueError):
+    """Raised when an uploaded CSV cannot be scored; message is user-facing."""
+
+
+# ----------------------------------------------------------------------
+# --- CSV -> MATRIX ---
+# ----------------------------------------------------------------------
+def read_batch_csv(file_obj, disease):
+    """Reads a screening CSV and returns (frame, X) with X a float64 matrix in model column order."""
+    columns = FEATURE_COLUMNS[disease]
+    try:
+        frame = pd.read_csv(file_obj, encoding="utf-8-sig", skipinitialspace=True)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise BatchValidationError(f"Could not read CSV file: {e}")
+    frame.columns = [str(c).strip() for c in frame.columns]
+    missing = [c for c in columns if c not in frame.columns]
+    if missing: raise BatchValidationError(f"Missing required column(s): {', '.join(missing)}")
+    if frame.empty: raise BatchValidationError("The CSV file has no data rows.")
+    return frame, to_feature_matrix(frame, disease)
+
+
+def to_feature_matrix(frame, disease):
+    """Validates the model columns of `frame` against the feature schema (one vectorized pass); reports bad cells by row/column."""
+    result = feature_schema.validate(disease, frame)
+    if not result.ok:
+        details = [f"row {row + 2}, column '{column}' ({message})" for row, fields in result.errors(MAX_REPORTED_ERRORS).items() for column, message in fields.items()]
+        more = f" (+{result.n_errors - MAX_REPORTED_ERRORS} more)" if result.n_errors > MAX_REPORTED_ERRORS else ""
+        raise BatchValidationError("Invalid values at " + "; ".join(details) + more)
+    return np.ascontiguousarray(result.X)
+
+
+# ----------------------------------------------------------------------
+# --- VECTORIZED SCORING ---
+# ----------------------------------------------------------------------
+def predict_in_chunks(model, X, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """Yields (start, predictions) with one `model.predict` call per chunk of rows (through `cache` if given)."""
+    score = model.predict if cache is None else (lambda rows: cache.predict(model, rows))
+    for start in range(0, X.shape[0], chunk_size):
+        yield start, np.asarray(score(X[start:start + chunk_size])).astype(np.int8, copy=False)
+
+
+def predict_batch(model, X, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """Scores the whole matrix and returns a 1-D int8 array of predictions."""
+    predictions = np.empty(X.shape[0], dtype=np.int8)
+    for start, chunk in predict_in_chunks(model, X, chunk_size, cache):
+        predictions[start:start + chunk.shape[0]] = chunk
+    return predictions
+
+
+# ----------------------------------------------------------------------
+# --- RESULT FILE ---
+# ----------------------------------------------------------------------
+def iter_results_csv(frame, predictions, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields the input rows plus prediction/risk columns as UTF-8 CSV bytes, one chunk at a time."""
+    labels = np.array([RESULT_LABELS[0], RESULT_LABELS[1]], dtype=object)
+    for start in range(0, len(frame), chunk_size):
+        part = frame.iloc[start:start + chunk_size].copy()
+        part["prediction"] = predictions[start:start + chunk_size]
+        part["risk"] = labels[part["prediction"].to_numpy()]
+        yield part.to_csv(index=False, header=(start == 0)).encode("utf-8")
+
+
+def results_csv_bytes(frame, predictions, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Assembles the streamed result chunks into one downloadable payload."""
+    buffer = io.BytesIO()
+    for piece in iter_results_csv(frame, predictions, chunk_size): buffer.write(piece)
+    return buffer.getvalue()
+
+
+# ----------------------------------------------------------------------
+# --- COMMAND LINE (e.g. offline screening-camp exports) ---
+# ----------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a screening CSV with a HealthGuard model.")
+    parser.add_argument("disease", choices=list(FEATURE_COLUMNS))
+    parser.add_argument("input_csv"); parser.add_argument("output_csv")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--audit-log", help="Also append the predictions to this SQLite audit log (see audit_log.py)")
+    args = parser.parse_args(argv)
+    from model_registry import ModelRegistry # imports this module
+    registry = ModelRegistry(preload=[args.disease]); model = registry.get(args.disease)
+    if model is None: raise SystemExit(f"{args.disease} model failed to load: {registry.errors.get(args.disease)}")
+    frame, X = read_batch_csv(args.input_csv, args.disease)
+    predictions = predict_batch(model, X, args.chunk_size)
+    if args.audit_log:
+        log = audit_log.AuditLog(args.audit_log).start()
+        log.record(args.disease, registry.version(args.disease), X, predictions, "cli", block=True); log.close(timeout=None)
+    with open(args.output_csv, "wb") as out:
+        for piece in iter_results_csv(frame, predictions, args.chunk_size): out.write(piece)
+    print(f"Scored {len(predictions)} rows ({int(predictions.sum())} high risk) -> {args.output_csv}")
+
+
+if __name__ == "__main__":
+    main()
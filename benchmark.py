@@ -0,0 +1,240 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Benchmark Suite
+# ----------------------------------------------------------------------
+# Reproducible timings for the hot paths of the app, written to JSON so
+# two runs (e.g. before/after a change) can be diffed:
+#   * full rerun of each page, driven headlessly through AppTest
+#   * predict throughput per model, batch sizes 1 .. 100k (dataset rows)
+#   * filter_doctors on synthetic registries of 100 .. 1M providers
+#   * display_sanjeevani_advice for every (disease, severity, age) triple
+# filter_doctors (doctor_search.py) and display_sanjeevani_advice
+# (sanjeevani_advice.py) are the modules app.py itself imports, run
+# inside small AppTest scripts so st.cache_resource behaves as in the app.
+#
+#   python benchmark.py                      # full run -> benchmark_results.json
+#   python benchmark.py --quick -o quick.json
+# ----------------------------------------------------------------------
+import argparse
+import json
+import os
+import pickle
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import batch_predict
+import gazetteer
+import linear_kernel
+import remedy_store
+
+APP_PATH = "app.py"
+DATASET_FILES = {"Diabetes": "dataset/diabetes.csv", "Heart Disease": "dataset/heart.csv", "Parkinsons": "dataset/parkinsons.csv"}
+PAGES = {"Diabetes": "Diabetes Prediction", "Heart Disease": "Heart Disease Prediction", "Parkinsons": "Parkinsons Prediction"}
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+REGISTRY_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+AGE_SAMPLES = {"Young": "12", "Adult": "40", "Senior": "70"} # one age per age group
+QUICK = {"repeat": 3, "batch_sizes": BATCH_SIZES[:5], "registry_sizes": REGISTRY_SIZES[:4]}
+
+
+def summarize(samples):
+    """Seconds -> {n, min, median, mean, p95, max} in milliseconds."""
+    ms = sorted(s * 1000 for s in samples)
+    return {"n": len(ms), "min_ms": ms[0], "median_ms": statistics.median(ms), "mean_ms": statistics.fmean(ms),
+            "p95_ms": ms[min(len(ms) - 1, int(round(0.95 * (len(ms) - 1))))], "max_ms": ms[-1]}
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter(); fn(); samples.append(time.perf_counter() - start)
+    return samples
+
+
+def load_features(disease):
+    frame = pd.read_csv(DATASET_FILES[disease], encoding="utf-8-sig")
+    return frame[batch_predict.FEATURE_COLUMNS[disease]].to_numpy(dtype=np.float64)
+
+
+# ----------------------------------------------------------------------
+# --- PAGE RERUNS (AppTest) ---
+# ----------------------------------------------------------------------
+def _select_page(page):
+    """AppTest cannot click the option_menu component, so the sidebar selection is fixed per run."""
+    menu = types.ModuleType("streamlit_option_menu"); menu.option_menu = lambda *args, **kwargs: page
+    sys.modules["streamlit_option_menu"] = menu
+
+
+def _patch_selectbox_index():
+    """AppTest's Selectbox.index looks the formatted label up in the raw options (fails with format_func); use the proto default instead."""
+    from streamlit.testing.v1 import element_tree
+    original = element_tree.Selectbox.index.fget
+    def index(self):
+        try: return original(self)
+        except ValueError: return self.proto.default
+    element_tree.Selectbox.index = property(index)
+
+
+def bench_page_reruns(repeat):
+    from streamlit.testing.v1 import AppTest
+    _patch_selectbox_index(); results = {}
+    for disease, page in PAGES.items():
+        _select_page(page)
+        start = time.perf_counter(); at = AppTest.from_file(APP_PATH, default_timeout=300).run(); first = time.perf_counter() - start
+        if at.exception: raise RuntimeError(f"{page} raised: {at.exception[0].message}")
+        results[disease] = {"first_run_ms": first * 1000, "rerun": summarize(timed(at.run, repeat))}
+        print(f"  page {disease}: first {first * 1000:.0f} ms, rerun median {results[disease]['rerun']['median_ms']:.1f} ms")
+    return results
+
+
+# ----------------------------------------------------------------------
+# --- MODEL SCORING THROUGHPUT ---
+# ----------------------------------------------------------------------
+def bench_predict(batch_sizes, repeat, seed=0):
+    rng = np.random.default_rng(seed); results = {}
+    for disease, model_path in linear_kernel.MODEL_FILES.items():
+        X_all = load_features(disease)
+        with open(model_path, "rb") as file, warnings.catch_warnings():
+            warnings.simplefilter("ignore"); estimator = pickle.load(file) # InconsistentVersionWarning
+        backends = {"scoring_model": linear_kernel.load_scoring_model(model_path), "sklearn": estimator}
+        results[disease] = {}
+        for name, model in backends.items():
+            rows = {}
+            for size in batch_sizes:
+                X = X_all[rng.integers(0, len(X_all), size)]
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore") # sklearn feature-name warnings on bare arrays
+                    samples = timed(lambda: model.predict(X), repeat)
+                stats = summarize(samples); stats["rows_per_s"] = size / (stats["median_ms"] / 1000)
+                rows[str(size)] = stats
+            results[disease][name] = rows
+            print(f"  predict {disease} [{name}]: " + ", ".join(f"{k}: {v['rows_per_s']:,.0f}/s" for k, v in rows.items()))
+    return results
+
+
+# ----------------------------------------------------------------------
+# --- DOCTOR SEARCH ON SYNTHETIC REGISTRIES ---
+# ----------------------------------------------------------------------
+def write_synthetic_registry(path, size, seed=0):
+    """`size` providers: half spread over India, half clustered around the gazetteer's towns."""
+    rng = np.random.default_rng(seed)
+    places = gazetteer.Gazetteer.load(); cities = np.column_stack([places.lat, places.lon])
+    spread = size // 2
+    lat = np.concatenate([rng.uniform(8.0, 35.0, spread), cities[rng.integers(0, len(cities), size - spread), 0] + rng.normal(0, 0.2, size - spread)])
+    lon = np.concatenate([rng.uniform(68.0, 97.0, spread), cities[rng.integers(0, len(cities), size - spread), 1] + rng.normal(0, 0.2, size - spread)])
+    ids = np.arange(size)
+    pd.DataFrame({"disease": "Diabetes", "kind": np.where(ids % 5 == 0, "hospital", "doctor"), "name": [f"Provider {i}" for i in ids],
+                  "specialty": "Diabetologist", "region": "Synthetic", "latitude": lat.round(6), "longitude": lon.round(6),
+                  "rating": rng.uniform(3.0, 5.0, size).round(1), "address": "N/A", "contact": "N/A", "link": ""}).to_csv(path, index=False)
+
+
+def measure_doctor_search(registry_path, repeat):
+    """Runs inside an AppTest script (st.cache_resource only caches under a Streamlit runtime)."""
+    import doctor_search # imports streamlit
+    places = gazetteer.Gazetteer.load(); filter_doctors, locations = doctor_search.filter_doctors, list(zip(places.lat.tolist(), places.lon.tolist()))
+    def reset():
+        for fn in (doctor_search._load_doctor_registry, doctor_search.get_doctor_index, doctor_search.get_doctor_search_cache): fn.clear()
+    default_path = doctor_search.DOCTOR_REGISTRY_PATH; doctor_search.DOCTOR_REGISTRY_PATH = registry_path; reset()
+    start = time.perf_counter(); doctor_search.load_doctor_registry(); load_s = time.perf_counter() - start
+    search_cache = doctor_search.get_doctor_search_cache()
+    start = time.perf_counter(); filter_doctors(locations[0], "Diabetes"); first_s = time.perf_counter() - start # includes the index build
+    def uncached():
+        for loc in locations: search_cache.clear(); filter_doctors(loc, "Diabetes")
+    def cached():
+        for loc in locations: filter_doctors(loc, "Diabetes")
+    cached() # fill the cache
+    result = {"registry_load_ms": load_s * 1000, "first_search_ms": first_s * 1000,
+              "uncached_search": summarize([s / len(locations) for s in timed(uncached, repeat)]),
+              "cached_search": summarize([s / len(locations) for s in timed(cached, repeat)]),
+              "mean_results": statistics.fmean(len(filter_doctors(loc, "Diabetes")) for loc in locations),
+              "search_cache": search_cache.stats()}
+    reset(); doctor_search.DOCTOR_REGISTRY_PATH = default_path
+    return result
+
+
+def bench_doctor_search(registry_sizes, repeat):
+    from streamlit.testing.v1 import AppTest
+    script = "\n".join(["import streamlit as st", "import benchmark", "s = st.session_state",
+                        "s['result'] = benchmark.measure_doctor_search(s['registry_path'], s['repeat'])"])
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in registry_sizes:
+            path = os.path.join(tmp, f"providers_{size}.csv"); write_synthetic_registry(path, size)
+            at = AppTest.from_string(script, default_timeout=3600)
+            at.session_state["registry_path"] = path; at.session_state["repeat"] = repeat
+            at.run()
+            if at.exception: raise RuntimeError(f"filter_doctors ({size:,} providers) raised: {at.exception[0].message}")
+            results[str(size)] = result = at.session_state["result"]
+            print(f"  filter_doctors {size:,}: load {result['registry_load_ms']:.0f} ms, first {result['first_search_ms']:.0f} ms, "
+                  f"uncached {result['uncached_search']['median_ms']:.2f} ms/search, cached {result['cached_search']['median_ms']:.3f} ms/search")
+    return results
+
+
+# ----------------------------------------------------------------------
+# --- SANJEEVANI ADVICE RENDERING (AppTest) ---
+# ----------------------------------------------------------------------
+def bench_sanjeevani(repeat):
+    from streamlit.testing.v1 import AppTest
+    script = "\n".join(["import streamlit as st", "from sanjeevani_advice import display_sanjeevani_advice",
+                        "s = st.session_state", "display_sanjeevani_advice(s['disease'], s['age'], s['severity'])"])
+    results = {}
+    for disease in PAGES:
+        for severity in remedy_store.SEVERITIES:
+            for age_group, age in AGE_SAMPLES.items():
+                at = AppTest.from_string(script, default_timeout=120)
+                at.session_state["disease"] = disease; at.session_state["age"] = age; at.session_state["severity"] = severity
+                start = time.perf_counter(); at.run(); first = time.perf_counter() - start
+                if at.exception: raise RuntimeError(f"advice {disease}/{severity}/{age_group} raised: {at.exception[0].message}")
+                results[f"{disease} / {severity} / {age_group}"] = {"first_run_ms": first * 1000, "rerun": summarize(timed(at.run, repeat)),
+                                                                  "elements": len(at.markdown) + len(at.warning) + len(at.get("expandable"))}
+    medians = [r["rerun"]["median_ms"] for r in results.values()]
+    print(f"  sanjeevani advice: {len(results)} triples, median rerun {statistics.median(medians):.1f} ms (max {max(medians):.1f} ms)")
+    return results
+
+
+# ----------------------------------------------------------------------
+# --- RUN ---
+# ----------------------------------------------------------------------
+def environment():
+    import sklearn, streamlit
+    try: commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception: commit = None
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "git_commit": commit, "python": platform.python_version(),
+            "platform": platform.platform(), "cpu_count": os.cpu_count(), "numpy": np.__version__, "pandas": pd.__version__,
+            "scikit_learn": sklearn.__version__, "streamlit": streamlit.__version__}
+
+
+SUITES = ["pages", "predict", "doctors", "sanjeevani"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page reruns, model scoring, doctor search and remedy rendering.")
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES, help="Run a subset of the suites")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--quick", action="store_true", help=f"repeat={QUICK['repeat']}, batches <= {QUICK['batch_sizes'][-1]:,}, registries <= {QUICK['registry_sizes'][-1]:,}")
+    args = parser.parse_args(argv)
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # app.py, dataset/ and saved_models/ are relative paths
+    repeat = QUICK["repeat"] if args.quick else args.repeat
+    batch_sizes = QUICK["batch_sizes"] if args.quick else BATCH_SIZES
+    registry_sizes = QUICK["registry_sizes"] if args.quick else REGISTRY_SIZES
+    report = {"environment": environment(), "config": {"repeat": repeat, "batch_sizes": batch_sizes, "registry_sizes": registry_sizes}}
+    suites = {"pages": lambda: bench_page_reruns(repeat), "predict": lambda: bench_predict(batch_sizes, repeat),
+              "doctors": lambda: bench_doctor_search(registry_sizes, repeat), "sanjeevani": lambda: bench_sanjeevani(repeat)}
+    for name in SUITES:
+        if name in args.only:
+            print(f"[{name}]"); start = time.perf_counter()
+            report[name] = suites[name](); report[name + "_total_s"] = time.perf_counter() - start
+    with open(args.output, "w", encoding="utf-8") as file: json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Bounded, Observable Result Cache
+# ----------------------------------------------------------------------
+# An in-process LRU with an explicit byte budget, an entry cap and a TTL,
+# for helpers whose results were previously kept forever by a bare
+# @st.cache_data. Entries belong to a "generation" (e.g. the registry
+# version): when the generation changes, everything cached for the old
+# one is dropped. Sizes, hits and evictions are exported via metrics.py.
+# Values are returned as-is (no pickling), so callers must not mutate them.
+# ----------------------------------------------------------------------
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+requests = metrics.registry.counter("healthguard_cache_requests_total", "Cache lookups by cache and result (hit, miss).")
+evictions = metrics.registry.counter("healthguard_cache_evictions_total", "Cache entries dropped by cache and reason (lru, ttl, invalidated, oversize).")
+size_bytes = metrics.registry.gauge("healthguard_cache_size_bytes", "Estimated bytes held per cache.")
+size_entries = metrics.registry.gauge("healthguard_cache_entries", "Entries held per cache.")
+
+
+class BoundedCache:
+    """Thread-safe LRU bounded by max_bytes and max_entries, with optional TTL and generation-based invalidation."""
+
+    def __init__(self, name, max_bytes, max_entries=None, ttl_seconds=None, clock=time.monotonic):
+        self.name = name; self.max_bytes = max_bytes; self.max_entries = max_entries; self.ttl = ttl_seconds; self.clock = clock
+        self.entries = OrderedDict(); self.bytes = 0; self.generation = None; self.lock = threading.Lock()
+        self.hits = 0; self.misses = 0; self.evicted = {"lru": 0, "ttl": 0, "invalidated": 0, "oversize": 0}
+
+    def _drop(self, key, reason):
+        _value, size, _expires = self.entries.pop(key)
+        self.bytes -= size; self.evicted[reason] += 1
+        evictions.inc(cache=self.name, reason=reason)
+
+    def _publish(self):
+        size_bytes.set(self.bytes, cache=self.name); size_entries.set(len(self.entries), cache=self.name)
+
+    def set_generation(self, generation):
+        """Drops every entry if `generation` differs from the one the cache was filled under."""
+        with self.lock:
+            if generation == self.generation: return
+            for key in list(self.entries): self._drop(key, "invalidated")
+            self.generation = generation; self._publish()
+
+    def get(self, key, build, size_of=sys.getsizeof):
+        """Cached value for `key`, calling build() on a miss; values larger than max_bytes are returned but not kept."""
+        now = self.clock()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and (entry[2] is None or entry[2] > now):
+                self.entries.move_to_end(key); self.hits += 1
+                requests.inc(cache=self.name, result="hit")
+                return entry[0]
+            if entry is not None: self._drop(key, "ttl")
+            self.misses += 1; generation = self.generation
+        requests.inc(cache=self.name, result="miss")
+        value = build() # built outside the lock; a concurrent duplicate build is harmless
+        size = size_of(value)
+        with self.lock:
+            if generation != self.generation: return value # invalidated while building
+            if size > self.max_bytes: self.evicted["oversize"] += 1; evictions.inc(cache=self.name, reason="oversize"); return value
+            if key in self.entries: self.bytes -= self.entries.pop(key)[1] # concurrent duplicate build
+            self.entries[key] = (value, size, now + self.ttl if self.ttl else None); self.bytes += size
+            while self.bytes > self.max_bytes or (self.max_entries and len(self.entries) > self.max_entries):
+                self._drop(next(iter(self.entries)), "lru")
+            self._publish()
+        return value
+
+    def clear(self):
+        with self.lock:
+            for key in list(self.entries): self._drop(key, "invalidated")
+            self._publish()
+
+    def stats(self):
+        with self.lock:
+            looked_up = self.hits + self.misses
+            return {"name": self.name, "entries": len(self.entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "max_entries": self.max_entries, "ttl_seconds": self.ttl, "generation": self.generation, "hits": self.hits,
+                    "misses": self.misses, "hit_rate": self.hits / looked_up if looked_up else 0.0, "evicted": dict(self.evicted)}
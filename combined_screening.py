@@ -0,0 +1,48 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Combined (All-Disease) Screening
+# ----------------------------------------------------------------------
+# One patient record holding the union of the three models' inputs
+# (shared fields such as age are entered once) is split per model,
+# validated and scored by every selected model concurrently on a small
+# process-wide thread pool. Each disease succeeds or fails on its own,
+# so one incomplete section does not block the others.
+# ----------------------------------------------------------------------
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import feature_schema
+import metrics
+import prediction_cache
+
+DISEASES = list(feature_schema.SCHEMA)
+# Combined-form field -> the column it fills in each model that uses it.
+SHARED_FIELDS = {"age": {"Diabetes": "Age", "Heart Disease": "age"}}
+
+executor = ThreadPoolExecutor(max_workers=len(DISEASES), thread_name_prefix="screen") # threads start on first use
+
+
+def split_record(record, diseases=DISEASES):
+    """{disease: record keyed by that model's columns}; shared fields fan out to every model that uses them."""
+    split = {}
+    for disease in diseases:
+        part = {column: record.get(column) for column in feature_schema.FEATURE_COLUMNS[disease]}
+        for field, columns in SHARED_FIELDS.items():
+            if disease in columns and field in record: part[columns[disease]] = record[field]
+        split[disease] = part
+    return split
+
+
+def score_one(disease, model, record):
+    """(prediction, None, model input row) or (None, error, None) for one disease."""
+    try:
+        with metrics.timer("parse_input", disease=disease, source="combined"): row = feature_schema.validate_record(disease, record)
+        with metrics.timer("predict", disease=disease, source="combined"): return int(prediction_cache.predict(model, [row])[0]), None, row
+    except Exception as e: return None, e, None
+
+
+def screen(models, record, pool=executor):
+    """Scores `record` with every model in `models` ({disease: model}) concurrently; returns {disease: (prediction, error, row)}."""
+    records = split_record(record, models)
+    # Each task runs in a copy of the caller's context, so its stages land in the current rerun's trace.
+    futures = {disease: pool.submit(contextvars.copy_context().run, score_one, disease, model, records[disease]) for disease, model in models.items()}
+    return {disease: future.result() for disease, future in futures.items()}
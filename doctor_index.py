@@ -0,0 +1,124 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Spatial Index for the Doctor Finder
+# ----------------------------------------------------------------------
+# Providers are bucketed once into a lat/lon grid. A search only visits
+# the grid cells overlapping the search radius, prunes those candidates
+# with a vectorized haversine, computes the exact ellipsoidal distance
+# for the survivors in one array pass, and keeps the k nearest.
+#
+# The index is plain arrays (coordinates, ratings, and the grid as sorted
+# cell keys + offsets into one id array), so it can also be built once into
+# a memory-mapped bundle (shared_arrays.py) that every worker process maps
+# read-only. A mapped index keeps no provider dicts: `fetch(ids)` loads
+# just the rows a search returns from the registry.
+# ----------------------------------------------------------------------
+import math
+
+import numpy as np
+
+import geo_distance
+import shared_arrays
+from geo_distance import HAVERSINE_ERROR
+
+MILES_PER_DEGREE_LAT = 69.05
+DEFAULT_CELL_DEGREES = 0.25
+_CELL_OFFSET = 1 << 24 # (lat cell, lon cell) -> one sortable int64 key
+
+
+def _cell_keys(lat_cells, lon_cells):
+    return (np.asarray(lat_cells, dtype=np.int64) + _CELL_OFFSET) * (2 * _CELL_OFFSET) + (np.asarray(lon_cells, dtype=np.int64) + _CELL_OFFSET)
+
+
+def build_arrays(lat, lon, rating, cell_degrees=DEFAULT_CELL_DEGREES, ids=None):
+    """Index arrays for valid coordinates: (arrays, meta) as stored in a shared bundle. `ids` (default: positions) are what `fetch` receives."""
+    lat = np.asarray(lat, dtype=np.float64); lon = np.asarray(lon, dtype=np.float64); rating = np.asarray(rating, dtype=np.float64)
+    ids = np.arange(len(lat), dtype=np.int64) if ids is None else np.asarray(ids, dtype=np.int64)
+    valid = np.isfinite(lat) & np.isfinite(lon) & (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    lat, lon, rating, ids = lat[valid], lon[valid], rating[valid], ids[valid]
+    keys = _cell_keys(np.floor(lat / cell_degrees), np.floor(lon / cell_degrees))
+    order = np.argsort(keys, kind="stable") # cell by cell, registry order within a cell
+    cell_keys, starts = np.unique(keys[order], return_index=True)
+    return ({"lat": lat, "lon": lon, "rating": rating, "ids": ids, "cell_keys": cell_keys,
+             "cell_starts": np.append(starts, len(order)).astype(np.int64), "cell_members": order.astype(np.int64)},
+            {"cell_degrees": cell_degrees, "skipped": int((~valid).sum())})
+
+
+def _valid_location(location):
+    return (isinstance(location, tuple) and len(location) == 2 and all(isinstance(c, (int, float)) for c in location)
+            and -90 <= location[0] <= 90 and -180 <= location[1] <= 180)
+
+
+def _rating_value(doctor):
+    try: return float(doctor.get("rating"))
+    except (ValueError, TypeError): return None
+
+
+class DoctorIndex:
+    """Grid index over a list of provider dicts with a "location": (lat, lon) tuple."""
+
+    def __init__(self, doctors, cell_degrees=DEFAULT_CELL_DEGREES):
+        doctors = list(doctors)
+        valid = [d for d in doctors if _valid_location(d.get("location"))]
+        if len(valid) < len(doctors): print(f"Warning: DoctorIndex skipped {len(doctors) - len(valid)} entries with missing/invalid location")
+        coords = np.array([d["location"] for d in valid], dtype=np.float64).reshape(-1, 2)
+        rating = np.array([_rating_value(d) for d in valid], dtype=np.float64)  # None -> nan
+        arrays, meta = build_arrays(coords[:, 0], coords[:, 1], rating, cell_degrees)
+        self._init_arrays(arrays, meta, lambda ids: [valid[i] for i in ids])
+
+    @classmethod
+    def from_arrays(cls, arrays, meta, fetch):
+        """Index over prebuilt (possibly memory-mapped) arrays; fetch(ids) -> provider dicts in that order."""
+        index = cls.__new__(cls); index._init_arrays(arrays, meta, fetch)
+        return index
+
+    @classmethod
+    def shared(cls, shared_dir, name, load_locations, fetch, cell_degrees=DEFAULT_CELL_DEGREES):
+        """Maps bundle `name` from shared_dir, building it from load_locations() -> (ids, lat, lon, rating) if absent."""
+        def build():
+            ids, lat, lon, rating = load_locations()
+            return build_arrays(lat, lon, rating, cell_degrees, ids)
+        return cls.from_arrays(*shared_arrays.shared_bundle(shared_dir, name, build), fetch)
+
+    def _init_arrays(self, arrays, meta, fetch):
+        self.cell_degrees = meta["cell_degrees"]; self.fetch = fetch
+        self.lat, self.lon, self.rating, self.ids = arrays["lat"], arrays["lon"], arrays["rating"], arrays["ids"]
+        self.cell_keys, self.cell_starts, self.cell_members = arrays["cell_keys"], arrays["cell_starts"], arrays["cell_members"]
+
+    def __len__(self):
+        return len(self.lat)
+
+    def _candidates(self, user_lat, user_lon, max_distance):
+        """Ids in every grid cell overlapping the radius' bounding box."""
+        d_lat = max_distance / MILES_PER_DEGREE_LAT * (1 + HAVERSINE_ERROR)
+        cos_lat = max(math.cos(math.radians(min(abs(user_lat) + d_lat, 89.9))), 1e-6)
+        d_lon = min(d_lat / cos_lat, 180.0)
+        c = self.cell_degrees
+        lat_range = range(math.floor((user_lat - d_lat) / c), math.floor((user_lat + d_lat) / c) + 1)
+        if d_lon >= 180.0: lon_range = range(math.floor(-180 / c), math.floor(180 / c) + 1)
+        else: lon_range = range(math.floor((user_lon - d_lon) / c), math.floor((user_lon + d_lon) / c) + 1)
+        wrap = lambda j: math.floor((((j + 0.5) * c + 180) % 360 - 180) / c)  # cells past the antimeridian
+        cells = {(i, wrap(j)) for i in lat_range for j in lon_range}
+        keys = _cell_keys(*zip(*cells)); found = np.searchsorted(self.cell_keys, keys)
+        hit = found < len(self.cell_keys); found = found[hit]; found = found[self.cell_keys[found] == keys[hit]]
+        parts = [self.cell_members[self.cell_starts[f]:self.cell_starts[f + 1]] for f in found.tolist()]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+    def query_ids(self, user_lat, user_lon, max_distance=30, min_rating=0.0, top_k=None):
+        """(ids, geodesic_miles) arrays within max_distance, nearest first, at most top_k."""
+        ids = self._candidates(user_lat, user_lon, max_distance)
+        if min_rating > 0 and ids.size: ids = ids[np.nan_to_num(self.rating[ids], nan=-1.0) >= min_rating]
+        if not ids.size: return ids, np.empty(0, dtype=np.float64)
+        found, miles = geo_distance.distances_within(user_lat, user_lon, self.lat[ids], self.lon[ids], max_distance)
+        ids = ids[found]
+        if top_k and len(miles) > top_k: # O(n) selection; only the survivors are sorted
+            keep = miles <= np.partition(miles, top_k - 1)[top_k - 1] # the top_k nearest plus any tied with the last of them
+            ids, miles = ids[keep], miles[keep]
+        order = np.lexsort((ids, miles))[:top_k] # nearest first, registry order on ties
+        return ids[order], miles[order]
+
+    def results(self, ids, miles):
+        return list(zip(self.fetch(self.ids[ids].tolist()), miles.tolist()))
+
+    def query(self, user_lat, user_lon, max_distance=30, min_rating=0.0, top_k=None):
+        """Returns [(doctor, geodesic_miles)] within max_distance, nearest first, at most top_k."""
+        return self.results(*self.query_ids(user_lat, user_lon, max_distance, min_rating, top_k))
@@ -0,0 +1,144 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Doctor / Hospital Registry Store
+# ----------------------------------------------------------------------
+# The provider registry lives in doctor_data/providers.csv (one row per
+# provider per disease) or in a prebuilt SQLite file for national-scale
+# registries. Either way it is served from SQLite with indexed
+# (disease, region) and (specialty, region) lookups.
+#
+#   python doctor_registry.py build doctor_data/providers.csv doctor_data/providers.sqlite
+# ----------------------------------------------------------------------
+import argparse
+import csv
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+COLUMNS = ["disease", "kind", "name", "specialty", "region", "latitude", "longitude", "rating", "address", "contact", "link"]
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS providers (
+    id INTEGER PRIMARY KEY, disease TEXT NOT NULL, kind TEXT NOT NULL, name TEXT NOT NULL, specialty TEXT NOT NULL,
+    region TEXT NOT NULL, latitude REAL NOT NULL, longitude REAL NOT NULL, rating REAL,
+    address TEXT, contact TEXT, link TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_providers_disease_region ON providers (disease, region);
+CREATE INDEX IF NOT EXISTS idx_providers_specialty_region ON providers (specialty, region);
+"""
+
+
+def _rows_from_csv(path):
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            rating = row["rating"].strip()
+            yield (row["disease"], row["kind"], row["name"], row["specialty"], row["region"], float(row["latitude"]), float(row["longitude"]),
+                   float(rating) if rating else None, row["address"], row["contact"], row["link"])
+
+
+def build_database(csv_path, conn):
+    """Loads the CSV rows into `conn` (creating the table and indexes)."""
+    conn.executescript(SCHEMA)
+    conn.executemany(f"INSERT INTO providers ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", _rows_from_csv(csv_path))
+    conn.commit()
+    return conn
+
+
+def doctor_card_parts(doctor):
+    """Pre-builds a result card's HTML around the per-search distance: (head, tail)."""
+    link_html = ""
+    if 'link' in doctor and doctor['link'] and isinstance(doctor['link'], str) and doctor['link'].startswith('http'):
+         link_html = f" [<a href='{doctor['link']}' target='_blank'>Website/Book</a>]"
+    rating_display = ""
+    if 'rating' in doctor and doctor['rating'] != "N/A":
+        try: rating_val = float(doctor['rating']); rating_display = f" ({rating_val:.1f} ★)"
+        except (ValueError, TypeError): pass
+    address = doctor.get('address', 'N/A')
+    contact = doctor.get('contact', 'N/A')
+    return f"**{doctor['name']}** {rating_display}<br>", f"{link_html}<br><small>Address: {address}<br>Contact: {contact}</small><br> "
+
+
+def _file_version(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""): digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+class DoctorRegistry:
+    """Read-only view of the provider table; rows come back in the dict shape the doctor finder uses."""
+
+    def __init__(self, conn, version):
+        self.conn = conn; self.version = version
+        self._lock = threading.Lock() # one connection shared by all Streamlit sessions
+
+    def _query(self, sql, params=()):
+        with self._lock: return self.conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _as_doctor(row):
+        name, specialty, lat, lon, rating, address, contact, link = row
+        doctor = {"name": name, "location": (lat, lon), # display name as listed, e.g. "Ruby Hall Clinic (Cardiology)"
+                  "address": address, "contact": contact, "specialty": specialty}
+        if rating is not None: doctor["rating"] = rating
+        if link: doctor["link"] = link
+        doctor["card_head"], doctor["card_tail"] = doctor_card_parts(doctor) # rendered once, at load time
+        return doctor
+
+    def providers(self, disease=None, region=None, specialty=None):
+        """Providers filtered by disease and/or specialty, optionally within one region; registry order."""
+        clauses, params = [], []
+        for column, value in (("disease", disease), ("specialty", specialty), ("region", region)):
+            if value is not None: clauses.append(f"{column} = ?"); params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._query(f"SELECT name, specialty, latitude, longitude, rating, address, contact, link FROM providers {where} ORDER BY id", params)
+        return [self._as_doctor(row) for row in rows]
+
+    def locations(self, disease=None):
+        """(ids, lat, lon, rating) arrays for one disease's providers in registry order; no provider dicts are built."""
+        where, params = ("WHERE disease = ?", (disease,)) if disease is not None else ("", ())
+        rows = self._query(f"SELECT id, latitude, longitude, rating FROM providers {where} ORDER BY id", params)
+        ids, lat, lon, rating = (zip(*rows) if rows else ([], [], [], []))
+        return (np.array(ids, dtype=np.int64), np.array(lat, dtype=np.float64), np.array(lon, dtype=np.float64),
+                np.array([np.nan if r is None else r for r in rating], dtype=np.float64))
+
+    def providers_by_id(self, ids):
+        """Provider dicts for registry ids, in the order given (a mapped DoctorIndex fetches its results this way)."""
+        if not ids: return []
+        rows = self._query(f"SELECT id, name, specialty, latitude, longitude, rating, address, contact, link FROM providers WHERE id IN ({', '.join('?' * len(ids))})", list(ids))
+        by_id = {row[0]: self._as_doctor(row[1:]) for row in rows}
+        return [by_id[i] for i in ids]
+
+    def regions(self, disease=None):
+        if disease is None: return [r[0] for r in self._query("SELECT DISTINCT region FROM providers ORDER BY region")]
+        return [r[0] for r in self._query("SELECT DISTINCT region FROM providers WHERE disease = ? ORDER BY region", (disease,))]
+
+    def diseases(self):
+        return [r[0] for r in self._query("SELECT DISTINCT disease FROM providers ORDER BY disease")]
+
+    def __len__(self):
+        return self._query("SELECT COUNT(*) FROM providers")[0][0]
+
+
+def load_registry(path):
+    """Opens a .sqlite registry read-only, or loads a .csv registry into an in-memory SQLite database."""
+    if not os.path.exists(path): raise FileNotFoundError(f"Doctor registry not found: {path}")
+    if path.endswith((".sqlite", ".db")):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    else:
+        conn = build_database(path, sqlite3.connect(":memory:", check_same_thread=False))
+    return DoctorRegistry(conn, _file_version(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an on-disk SQLite doctor registry from CSV.")
+    parser.add_argument("command", choices=["build"]); parser.add_argument("csv_path"); parser.add_argument("sqlite_path")
+    args = parser.parse_args(argv)
+    if os.path.exists(args.sqlite_path): os.remove(args.sqlite_path)
+    conn = sqlite3.connect(args.sqlite_path); build_database(args.csv_path, conn); conn.close()
+    print(f"{args.csv_path} -> {args.sqlite_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Doctor Search (registry, spatial index, result cache)
+# ----------------------------------------------------------------------
+# The doctor finder's data path, shared by app.py and benchmark.py: the
+# provider registry (reloaded when its file changes), one spatial index
+# per disease and registry version, and a bounded process-wide cache of
+# search results. Objects are held with st.cache_resource, so they are
+# shared by every session of a Streamlit process.
+#
+#   HEALTHGUARD_DOCTOR_REGISTRY   providers .csv or .sqlite (default doctor_data/providers.csv)
+#   HEALTHGUARD_SHARED_DIR        map index arrays from bundles shared with other workers
+# ----------------------------------------------------------------------
+import os
+
+import streamlit as st
+
+import bounded_cache
+import doctor_registry
+from doctor_index import DoctorIndex
+
+# --- DOCTOR / HOSPITAL REGISTRY (doctor_data/providers.csv - **VERIFY ALL DETAILS!**) ---
+DOCTOR_REGISTRY_PATH = os.environ.get("HEALTHGUARD_DOCTOR_REGISTRY", 'doctor_data/providers.csv') # or a .sqlite built with `python doctor_registry.py build`
+SHARED_DIR = os.environ.get("HEALTHGUARD_SHARED_DIR")
+
+DOCTOR_SEARCH_LIMIT = 100 # Nearest results kept per search (partial selection, then a sort of the survivors)
+# Search result cache budget: entries hold result id/distance arrays (~1.6 KB at the limit), not provider dicts.
+DOCTOR_CACHE_MAX_BYTES = 16 * 1024 * 1024
+DOCTOR_CACHE_MAX_ENTRIES = 10_000
+DOCTOR_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_doctor_registry(path, mtime_ns, size):
+    return doctor_registry.load_registry(path)
+
+def load_doctor_registry(path=None):
+    """Loads the provider registry (default DOCTOR_REGISTRY_PATH) once per file revision (indexed by disease/specialty + region). Handles errors."""
+    path = path or DOCTOR_REGISTRY_PATH
+    try:
+        stat = os.stat(path) # an edited/replaced file is reloaded; its new version invalidates the indexes and search cache
+        return _load_doctor_registry(path, stat.st_mtime_ns, stat.st_size)
+    except Exception as e: st.error(f"Error loading doctor registry {path}: {e}"); return None
+
+@st.cache_resource(max_entries=8, show_spinner=False) # 3 diseases x (current + previous registry version)
+def get_doctor_index(registry_key, registry_version):
+    """Builds the spatial index for one disease's provider list once per registry version (mapped from SHARED_DIR if set)."""
+    registry = load_doctor_registry()
+    if registry is not None and SHARED_DIR:
+        name = f"doctors-{registry_key.lower().replace(' ', '_')}-{registry_version}"
+        return DoctorIndex.shared(SHARED_DIR, name, lambda: registry.locations(registry_key), registry.providers_by_id)
+    return DoctorIndex(registry.providers(disease=registry_key) if registry is not None else [])
+
+@st.cache_resource(show_spinner=False)
+def get_doctor_search_cache():
+    """One bounded search-result cache per process, shared by all sessions."""
+    return bounded_cache.BoundedCache("filter_doctors", DOCTOR_CACHE_MAX_BYTES, DOCTOR_CACHE_MAX_ENTRIES, DOCTOR_CACHE_TTL_SECONDS)
+
+def filter_doctors(user_location, registry_key, max_distance=30, min_rating=0.0, top_k=DOCTOR_SEARCH_LIMIT):
+    """Filters doctors by distance from a (lat, lon) float pair using the spatial index; results are cached per registry version."""
+    user_lat, user_lon = round(float(user_location[0]), 4), round(float(user_location[1]), 4) # ~10 m; nearby users share cache entries
+    if not (-90 <= user_lat <= 90 and -180 <= user_lon <= 180):
+         print(f"Error: Invalid coordinates passed to filter_doctors: {user_location}")
+         return []
+    registry = load_doctor_registry()
+    registry_version = registry.version if registry is not None else None
+    index = get_doctor_index(registry_key, registry_version)
+    cache = get_doctor_search_cache(); cache.set_generation(registry_version) # a new registry file drops all cached searches
+    ids, miles = cache.get((registry_key, user_lat, user_lon, max_distance, min_rating, top_k),
+                           lambda: index.query_ids(user_lat, user_lon, max_distance, min_rating, top_k),
+                           size_of=lambda result: result[0].nbytes + result[1].nbytes + 256)
+    return index.results(ids, miles)
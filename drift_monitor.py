@@ -0,0 +1,264 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Input Drift Monitor
+# ----------------------------------------------------------------------
+# The models were fitted on small public datasets; this watches whether
+# the inputs they now score still look like them. Every predict call's
+# rows update constant-size running statistics per feature: Welford/Chan
+# mean and variance, min/max, and a fixed-bin histogram sketch over the
+# training set's 20-quantile bins (resources/drift_reference.json). The
+# sketch gives the population stability index (PSI) against the training
+# distribution and approximate quantiles. Memory is O(features x bins)
+# per model and an update is a few vectorized passes over the batch,
+# whatever the traffic.
+#
+# Features whose PSI passes PSI_MODERATE / PSI_MAJOR (after MIN_ROWS
+# inputs) raise alerts: Prometheus gauges (healthguard_drift_*), a log
+# line on each new alert, and the JSON summary at GET /drift.
+#
+#   python drift_monitor.py build                   # reference from dataset/*.csv
+#   python drift_monitor.py report --audit-db audit/predictions.sqlite3
+# ----------------------------------------------------------------------
+import argparse
+import hashlib
+import json
+import threading
+import time
+
+import numpy as np
+
+import feature_schema
+import metrics
+
+REFERENCE_PATH = "resources/drift_reference.json"
+N_BINS = 20
+QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+PSI_MODERATE = 0.1 # the usual PSI reading: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 major shift
+PSI_MAJOR = 0.25
+MIN_ROWS = 1000 # no alerts before this many inputs: sampling noise alone gives PSI ~ (bins - 1) / rows
+CHECK_SECONDS = 10.0 # alerts/gauges are re-evaluated at most this often from observe()
+PSI_EPSILON = 1e-4
+_BROADCAST_CELLS = 1 << 20 # bin rows x features x edges in one comparison up to this size
+
+rows_total = metrics.registry.counter("healthguard_drift_rows_total", "Model input rows seen by the drift monitor, by disease.")
+psi_gauge = metrics.registry.gauge("healthguard_drift_psi", "Population stability index of each model input against the training data.")
+shift_gauge = metrics.registry.gauge("healthguard_drift_mean_shift", "(running mean - training mean) / training std per model input.")
+alerts_gauge = metrics.registry.gauge("healthguard_drift_alerts", "Model inputs currently in drift alert, by disease and level.")
+
+
+# ----------------------------------------------------------------------
+# --- REFERENCE (dataset/*.csv -> resources/drift_reference.json) ---
+# ----------------------------------------------------------------------
+def build_reference(dataset_files=feature_schema.DATASET_FILES, n_bins=N_BINS):
+    """{disease: {column: mean, std, quantiles, interior bin edges and the training share per bin}} plus source checksums."""
+    import pandas as pd
+    reference = {"n_bins": n_bins, "quantiles": QUANTILES, "sources": {}, "models": {}}
+    for disease, path in dataset_files.items():
+        with open(path, "rb") as file: reference["sources"][disease] = hashlib.sha256(file.read()).hexdigest()[:16]
+        frame = pd.read_csv(path, encoding="utf-8-sig")
+        columns = reference["models"][disease] = {}
+        for name in feature_schema.FEATURE_COLUMNS[disease]:
+            values = frame[name].to_numpy(dtype=np.float64)
+            edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1])) # ties (coded fields) merge bins
+            counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+            columns[name] = {"n": int(len(values)), "mean": float(values.mean()), "std": float(values.std(ddof=1)),
+                             "min": float(values.min()), "max": float(values.max()), "quantiles": np.quantile(values, QUANTILES).tolist(),
+                             "edges": edges.tolist(), "shares": (counts / len(values)).tolist()}
+    return reference
+
+
+_reference = None
+
+def load_reference(path=REFERENCE_PATH):
+    """Reference statistics (loaded once per process); {} disables the monitor."""
+    global _reference
+    if _reference is None:
+        try:
+            with open(path, encoding="utf-8") as file: _reference = json.load(file)["models"]
+        except FileNotFoundError:
+            print(f"Drift monitor: {path} not found; run 'python drift_monitor.py build' to enable it"); _reference = {}
+    return _reference
+
+
+def psi(expected, actual, epsilon=PSI_EPSILON):
+    """Population stability index between two share vectors (last axis)."""
+    expected = np.clip(expected, epsilon, None); actual = np.clip(actual, epsilon, None)
+    return np.sum((actual - expected) * np.log(actual / expected), axis=-1)
+
+
+# ----------------------------------------------------------------------
+# --- STREAMING STATISTICS ---
+# ----------------------------------------------------------------------
+class FeatureStream:
+    """Running statistics of one model's input columns; every array is sized by features (x bins), never by rows."""
+
+    def __init__(self, disease, reference):
+        self.disease = disease; self.columns = feature_schema.FEATURE_COLUMNS[disease]
+        columns = [reference[name] for name in self.columns]; n_edges = max(len(c["edges"]) for c in columns)
+        self.edges = np.full((len(columns), n_edges), np.inf) # +inf padding: padded bins never receive rows
+        self.ref_shares = np.zeros((len(columns), n_edges + 1))
+        for i, column in enumerate(columns):
+            self.edges[i, :len(column["edges"])] = column["edges"]; self.ref_shares[i, :len(column["shares"])] = column["shares"]
+        self.ref_mean = np.array([c["mean"] for c in columns]); self.ref_std = np.array([c["std"] or 1.0 for c in columns])
+        self.ref_quantiles = np.array([c["quantiles"] for c in columns])
+        self.lock = threading.Lock(); self.reset()
+
+    def reset(self):
+        f = len(self.columns)
+        with self.lock:
+            self.count = 0; self.mean = np.zeros(f); self.m2 = np.zeros(f)
+            self.min = np.full(f, np.inf); self.max = np.full(f, -np.inf)
+            self.hist = np.zeros((f, self.edges.shape[1] + 1), dtype=np.int64); self.since = time.time()
+
+    def _bins(self, X):
+        n, f = X.shape
+        if n * self.edges.size <= _BROADCAST_CELLS: return (X[:, :, None] >= self.edges[None]).sum(axis=2)
+        return np.column_stack([np.searchsorted(self.edges[i], X[:, i], side="right") for i in range(f)])
+
+    def update(self, X):
+        """Merges a batch (n x features) in: Chan's parallel form of Welford's update plus one bincount for the sketch; returns n."""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.columns)); n = len(X)
+        if not n: return 0
+        batch_mean = X.mean(axis=0); batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        bins = self._bins(X); width = self.hist.shape[1]
+        counts = np.bincount((bins + np.arange(X.shape[1]) * width).ravel(), minlength=self.hist.size).reshape(self.hist.shape)
+        batch_min, batch_max = X.min(axis=0), X.max(axis=0)
+        with self.lock:
+            total = self.count + n; delta = batch_mean - self.mean
+            self.mean += delta * (n / total); self.m2 += batch_m2 + delta ** 2 * (self.count * n / total); self.count = total
+            np.minimum(self.min, batch_min, out=self.min); np.maximum(self.max, batch_max, out=self.max)
+            self.hist += counts
+        return n
+
+    def snapshot(self):
+        with self.lock: return self.count, self.mean.copy(), self.m2.copy(), self.min.copy(), self.max.copy(), self.hist.copy()
+
+    def quantiles(self, hist, low, high, probs=QUANTILES):
+        """Approximate quantiles per feature by linear interpolation inside the sketch's bins (outer bins end at min/max)."""
+        count = hist.sum(axis=1, keepdims=True); cumulative = np.cumsum(hist, axis=1)
+        lower = np.column_stack([low, self.edges]); upper = np.column_stack([self.edges, high])
+        lower = np.clip(lower, low[:, None], high[:, None]); upper = np.clip(upper, low[:, None], high[:, None])
+        result = np.empty((len(self.columns), len(probs)))
+        for j, p in enumerate(probs):
+            target = p * count[:, 0]; k = np.minimum((cumulative < target[:, None]).sum(axis=1), hist.shape[1] - 1)
+            rows = np.arange(len(self.columns)); before = np.where(k > 0, cumulative[rows, k - 1], 0)
+            inside = np.where(hist[rows, k] > 0, (target - before) / np.maximum(hist[rows, k], 1), 0.0)
+            result[:, j] = lower[rows, k] + np.clip(inside, 0, 1) * (upper[rows, k] - lower[rows, k])
+        return result
+
+    def report(self):
+        """Per-feature comparison with the training data; `level` is None, "moderate" or "major" (None until MIN_ROWS)."""
+        count, mean, m2, low, high, hist = self.snapshot()
+        if not count: return {"disease": self.disease, "rows": 0, "since": self.since, "features": {}}
+        scores = psi(self.ref_shares, hist / count); shift = (mean - self.ref_mean) / self.ref_std
+        std = np.sqrt(m2 / (count - 1)) if count > 1 else np.zeros_like(mean); quantiles = self.quantiles(hist, low, high)
+        features = {}
+        for i, name in enumerate(self.columns):
+            level = None if count < MIN_ROWS else "major" if scores[i] >= PSI_MAJOR else "moderate" if scores[i] >= PSI_MODERATE else None
+            features[name] = {"psi": round(float(scores[i]), 4), "mean_shift": round(float(shift[i]), 3), "level": level,
+                              "mean": float(mean[i]), "std": float(std[i]), "min": float(low[i]), "max": float(high[i]),
+                              "quantiles": [round(float(q), 4) for q in quantiles[i]], "reference_quantiles": self.ref_quantiles[i].tolist()}
+        return {"disease": self.disease, "rows": count, "since": self.since, "features": features}
+
+
+class DriftMonitor:
+    """One FeatureStream per model, created on the first input; alerts are re-evaluated at most every CHECK_SECONDS."""
+
+    def __init__(self, reference_path=REFERENCE_PATH, check_seconds=CHECK_SECONDS):
+        self.reference_path = reference_path; self.check_seconds = check_seconds
+        self.streams = {}; self.alerts = {}; self._lock = threading.Lock(); self._next_check = 0.0
+
+    def stream(self, disease):
+        stream = self.streams.get(disease)
+        if stream is None:
+            reference = load_reference(self.reference_path).get(disease)
+            if reference is None: return None
+            with self._lock: stream = self.streams.setdefault(disease, FeatureStream(disease, reference))
+        return stream
+
+    def observe(self, disease, X):
+        """Feeds one predict call's input rows; never raises into the caller."""
+        try:
+            stream = self.stream(disease)
+            if stream is None: return
+            rows = stream.update(X); rows_total.inc(rows, disease=disease)
+            if time.monotonic() >= self._next_check and self._lock.acquire(blocking=False): # one thread checks; the others carry on
+                try:
+                    if time.monotonic() >= self._next_check: self._check()
+                finally: self._lock.release()
+        except Exception as e: print(f"Drift monitor: {disease} input not recorded: {e}")
+
+    def check(self):
+        """Recomputes every model's report, updates the gauges and logs features that newly entered an alert; returns the reports."""
+        with self._lock: return self._check()
+
+    def _check(self):
+        self._next_check = time.monotonic() + self.check_seconds
+        reports = {disease: stream.report() for disease, stream in list(self.streams.items())}
+        for disease, report in reports.items():
+            levels = {"moderate": 0, "major": 0}
+            for name, feature in report["features"].items():
+                psi_gauge.set(feature["psi"], disease=disease, feature=name); shift_gauge.set(feature["mean_shift"], disease=disease, feature=name)
+                if feature["level"]: levels[feature["level"]] += 1
+                previous = self.alerts.get((disease, name)); self.alerts[(disease, name)] = feature["level"]
+                if feature["level"] and feature["level"] != previous:
+                    print(f"Drift monitor: {disease} {name} {feature['level']} drift (PSI {feature['psi']:.3f}, mean shift {feature['mean_shift']:+.2f} sd, {report['rows']} rows)")
+            for level, n in levels.items(): alerts_gauge.set(n, disease=disease, level=level)
+        return reports
+
+    def summary(self):
+        """JSON-ready view: per model, rows seen and its alerting features first (by PSI), then the rest."""
+        reports = self.check()
+        for report in reports.values():
+            report["alerts"] = sorted((name for name, f in report["features"].items() if f["level"]), key=lambda name: -report["features"][name]["psi"])
+            report["features"] = dict(sorted(report["features"].items(), key=lambda item: -item[1]["psi"]))
+        return reports
+
+    def reset(self, disease=None):
+        for name, stream in list(self.streams.items()):
+            if disease in (None, name): stream.reset()
+        with self._lock: self.alerts = {key: level for key, level in self.alerts.items() if disease not in (None, key[0])}
+
+
+monitor = DriftMonitor()
+metrics.json_routes["/drift"] = monitor.summary
+
+
+def observe(disease, X):
+    """Feeds the process-wide monitor."""
+    monitor.observe(disease, X)
+
+
+def format_summary(reports, limit=5):
+    lines = []
+    for disease, report in reports.items():
+        lines.append(f"{disease}: {report['rows']} rows, {len(report.get('alerts', []))} features in alert")
+        for name, feature in list(report["features"].items())[:limit]:
+            lines.append(f"  {name:<26} PSI {feature['psi']:>7.3f}  shift {feature['mean_shift']:+6.2f} sd  median {feature['quantiles'][2]:>10.4g}"
+                         f" (train {feature['reference_quantiles'][2]:.4g})  {feature['level'] or ''}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build drift reference statistics or report drift of logged inputs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Reference statistics from dataset/*.csv"); build.add_argument("-o", "--output", default=REFERENCE_PATH)
+    report = commands.add_parser("report", help="Replay the prediction audit log through the monitor")
+    report.add_argument("--audit-db", default="audit/predictions.sqlite3"); report.add_argument("--since", type=float, help="Unix time")
+    report.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        reference = build_reference()
+        with open(args.output, "w", encoding="utf-8") as file: json.dump(reference, file, indent=1); file.write("\n")
+        print(f"Wrote drift reference for {sum(len(c) for c in reference['models'].values())} columns to {args.output}")
+        return
+    import audit_log
+    replay = DriftMonitor(check_seconds=float("inf"))
+    for disease in feature_schema.SCHEMA:
+        frame = audit_log.read_frame(args.audit_db, disease, args.since)
+        if len(frame): replay.observe(disease, frame[feature_schema.FEATURE_COLUMNS[disease]].to_numpy(dtype=np.float64))
+    reports = replay.summary()
+    print(json.dumps(reports, indent=2) if args.json else format_summary(reports))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Model Input Schema & Vectorized Validation
+# ----------------------------------------------------------------------
+# One declarative schema per model: column order (as trained), form
+# label/help, allowed choices and hard limits, plus plausible ranges
+# derived from dataset/*.csv (resources/feature_ranges.json). The forms,
+# the CSV batch path and the HTTP API all validate through `validate`,
+# which checks one record, a list of records or a whole frame in a single
+# vectorized pass and reports errors per row and field.
+#
+#   python feature_schema.py build    # re-derive ranges after a dataset change
+#   python feature_schema.py show Diabetes
+# ----------------------------------------------------------------------
+import argparse
+import hashlib
+import json
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+RANGES_PATH = "resources/feature_ranges.json"
+DATASET_FILES = {"Diabetes": "dataset/diabetes.csv", "Heart Disease": "dataset/heart.csv", "Parkinsons": "dataset/parkinsons.csv"}
+# Plausible range = observed [min, max] widened by this fraction of its span on
+# each side (never below 0 for columns that are never negative in the data).
+RANGE_MARGIN = 1.0
+
+
+class Field:
+    """One model input column; `choices` maps allowed value -> form label."""
+
+    def __init__(self, name, label=None, help=None, whole=False, min=None, max=None, choices=None):
+        self.name = name; self.label = label or name; self.help = help; self.choices = choices
+        self.whole = whole or choices is not None; self.min = min; self.max = max
+        self.dtype = "int" if self.whole else "float"
+
+    def bounds(self, ranges=None):
+        """(low, high) enforced for this field: explicit limits first, then the plausible range."""
+        if self.choices is not None: return None, None
+        derived = (ranges or {}).get(self.name, {})
+        return (self.min if self.min is not None else derived.get("min"), self.max if self.max is not None else derived.get("max"))
+
+    def as_dict(self, ranges=None):
+        low, high = self.bounds(ranges)
+        return {"name": self.name, "label": self.label, "dtype": self.dtype, "min": low, "max": high,
+                "choices": list(self.choices) if self.choices else None, "observed": (ranges or {}).get(self.name)}
+
+
+_YES_NO = {1: "Yes", 0: "No"}
+
+# --- SCHEMA (column order = dataset/*.csv minus label/id columns = model input order) ---
+SCHEMA = {
+    "Diabetes": [
+        Field("Pregnancies", help="0 if N/A", whole=True), Field("Glucose", "Glucose (mg/dL)"),
+        Field("BloodPressure", "Diastolic BP (mm Hg)"), Field("SkinThickness", "Skin Thickness (mm)"),
+        Field("Insulin", "Insulin (mu U/ml)"), Field("BMI", "BMI (kg/m²)"),
+        Field("DiabetesPedigreeFunction", "Pedigree Func.", help="Family history value"),
+        Field("Age", "Age (years)", whole=True, min=1, max=120),
+    ],
+    "Heart Disease": [
+        Field("age", "Age (years)", whole=True, min=1, max=120),
+        Field("sex", "Sex", choices={1: "Male", 0: "Female"}),
+        Field("cp", "Chest Pain Type", help="0: Typ Ang, 1: Atyp Ang, 2: Non-ang, 3: Asympt", choices={0: "0", 1: "1", 2: "2", 3: "3"}),
+        Field("trestbps", "Resting BP (mm Hg)"), Field("chol", "Cholesterol (mg/dl)"),
+        Field("fbs", "Fasting BS > 120", choices=_YES_NO),
+        Field("restecg", "Resting ECG", help="0: Norm, 1: ST-T abnorm, 2: LVH", choices={0: "0", 1: "1", 2: "2"}),
+        Field("thalach", "Max Heart Rate"),
+        Field("exang", "Exercise Angina", choices=_YES_NO),
+        Field("oldpeak", "ST Depression", help="Exercise induced"),
+        Field("slope", "Slope ST Seg", help="0: Up, 1: Flat, 2: Down", choices={0: "0", 1: "1", 2: "2"}),
+        Field("ca", "Major Vessels Colored", help="4: not recorded", choices={0: "0", 1: "1", 2: "2", 3: "3", 4: "Unk"}),
+        Field("thal", "Thalassemia", choices={0: "Unk", 1: "Norm", 2: "Fixed", 3: "Revers"}),
+    ],
+    "Parkinsons": [Field(name) for name in [
+        "MDVP:Fo(Hz)", "MDVP:Fhi(Hz)", "MDVP:Flo(Hz)", "MDVP:Jitter(%)", "MDVP:Jitter(Abs)", "MDVP:RAP", "MDVP:PPQ", "Jitter:DDP",
+        "MDVP:Shimmer", "MDVP:Shimmer(dB)", "Shimmer:APQ3", "Shimmer:APQ5", "MDVP:APQ", "Shimmer:DDA", "NHR", "HNR",
+        "RPDE", "DFA", "spread1", "spread2", "D2", "PPE"]],
+}
+FEATURE_COLUMNS = {disease: [field.name for field in fields] for disease, fields in SCHEMA.items()}
+
+# Per-cell result codes, in the order they are checked.
+OK, REQUIRED, NOT_NUMBER, NOT_FINITE, NOT_WHOLE, OUT_OF_RANGE, NOT_A_CHOICE = range(7)
+
+
+class RecordValidationError(ValueError):
+    """Raised when a single record fails the schema; `errors` maps field -> message."""
+    def __init__(self, errors):
+        super().__init__("; ".join(f"{field}: {msg}" for field, msg in errors.items()))
+        self.errors = errors
+
+
+# ----------------------------------------------------------------------
+# --- DERIVED RANGES (dataset/*.csv -> resources/feature_ranges.json) ---
+# ----------------------------------------------------------------------
+def _round_out(value, up):
+    """Rounds away from the observed data to 3 significant digits."""
+    if value == 0: return 0.0
+    digits = 2 - math.floor(math.log10(abs(value))); step = 10.0 ** -digits
+    return round((math.ceil if up else math.floor)(value / step) * step, max(digits, 0))
+
+
+def build_ranges(dataset_files=DATASET_FILES, margin=RANGE_MARGIN):
+    """{disease: {column: observed/plausible stats}} plus the source checksums."""
+    ranges = {"margin": margin, "sources": {}, "models": {}}
+    for disease, path in dataset_files.items():
+        with open(path, "rb") as file: ranges["sources"][disease] = hashlib.sha256(file.read()).hexdigest()[:16]
+        frame = pd.read_csv(path, encoding="utf-8-sig")
+        columns = ranges["models"][disease] = {}
+        for name in FEATURE_COLUMNS[disease]:
+            values = frame[name].to_numpy(dtype=np.float64); low, high = float(values.min()), float(values.max()); span = (high - low) * margin
+            columns[name] = {"observed_min": low, "observed_max": high, "mean": round(float(values.mean()), 6),
+                             "dtype": "int" if np.all(values == np.round(values)) else "float",
+                             "min": _round_out(max(low - span, 0.0) if low >= 0 else low - span, up=False), "max": _round_out(high + span, up=True)}
+    return ranges
+
+
+_ranges = None
+
+def load_ranges(path=RANGES_PATH):
+    """Derived ranges (loaded once per process); without the file only the explicit limits apply."""
+    global _ranges
+    if _ranges is None:
+        try:
+            with open(path, encoding="utf-8") as file: _ranges = json.load(file)["models"]
+        except FileNotFoundError:
+            print(f"Feature schema: {path} not found; plausible-range checks disabled"); _ranges = {}
+    return _ranges
+
+
+# ----------------------------------------------------------------------
+# --- VALIDATION ---
+# ----------------------------------------------------------------------
+class ValidationResult:
+    """X: float64 matrix in model column order (NaN where invalid); codes: per-cell result codes."""
+
+    def __init__(self, disease, X, codes):
+        self.disease = disease; self.X = X; self.codes = codes
+
+    @property
+    def ok(self):
+        return not self.codes.any()
+
+    @property
+    def n_errors(self):
+        return int(np.count_nonzero(self.codes))
+
+    def message(self, column, code):
+        field = SCHEMA[self.disease][column]
+        if code == REQUIRED: return "required"
+        if code == NOT_NUMBER: return "must be a number"
+        if code == NOT_FINITE: return "must be a finite number"
+        if code == NOT_WHOLE: return "must be a whole number"
+        if field.choices is not None: return "must be one of " + ", ".join(str(v) for v in sorted(field.choices)) # out of range / not a choice
+        low, high = field.bounds(load_ranges().get(self.disease))
+        if low is not None and high is not None: return f"must be between {low:g} and {high:g}"
+        return f"must be >= {low:g}" if low is not None else f"must be <= {high:g}"
+
+    def errors(self, limit=None):
+        """{row: {column name: message}} for the first `limit` invalid cells (row-major)."""
+        rows, columns = np.nonzero(self.codes)
+        if limit is not None: rows, columns = rows[:limit], columns[:limit]
+        names = FEATURE_COLUMNS[self.disease]; found = {}
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            found.setdefault(row, {})[names[column]] = self.message(column, self.codes[row, column])
+        return found
+
+
+_is_bool = np.frompyfunc(lambda value: isinstance(value, (bool, np.bool_)), 1, 1) # JSON true/false are not numbers
+_is_str = np.frompyfunc(lambda value: isinstance(value, str), 1, 1)
+
+
+def _fast_numbers(raw):
+    """One C-level float conversion of an object array of numbers / numeric strings (None -> NaN); None if any cell needs the slow path."""
+    try: numbers = raw.astype(np.float64)
+    except (ValueError, TypeError): return None
+    if raw.size and _is_bool(raw).astype(bool).any(): return None
+    missing = np.isnan(numbers); not_number = np.zeros_like(missing)
+    if missing.any(): # None/NaN cells are blanks, but the text "nan" is not a number
+        text = _is_str(raw[missing]).astype(bool); not_number[missing] = text; missing[missing] = ~text
+    return numbers, missing, not_number
+
+
+def _to_numbers(values):
+    """(float64 values, missing mask, not-a-number mask) for one raw column."""
+    if values.dtype.kind in "iuf": # already numeric (e.g. a parsed CSV column): empty cells are NaN
+        numbers = values.astype(np.float64, copy=False)
+        return numbers, np.isnan(numbers), np.zeros(len(numbers), dtype=bool)
+    parsed = _fast_numbers(values)
+    if parsed is not None: return parsed
+    series = pd.Series(values, dtype=object); types = series.map(type)
+    missing = series.isna().to_numpy(); strings = types.eq(str).to_numpy()
+    if strings.any(): missing[strings] |= series[strings].str.strip().eq("").to_numpy()
+    booleans = _is_bool(values).astype(bool)
+    numbers = pd.to_numeric(series.mask(booleans | missing), errors="coerce").to_numpy(dtype=np.float64)
+    return numbers, missing, np.isnan(numbers) & ~missing
+
+
+def _parse(data, names):
+    """(float64 matrix, missing mask, not-a-number mask) for a DataFrame, a list of records or one record."""
+    if isinstance(data, pd.DataFrame):
+        columns = [data[name].to_numpy() if name in data.columns else np.full(len(data), None, dtype=object) for name in names]
+    else:
+        if isinstance(data, dict): data = [data]
+        raw = np.array([[record.get(name) for name in names] for record in data], dtype=object).reshape(len(data), len(names))
+        parsed = _fast_numbers(raw)
+        if parsed is not None: return parsed
+        columns = list(raw.T)
+    parts = [_to_numbers(column) for column in columns]
+    return tuple(np.column_stack([part[i] for part in parts]) for i in range(3))
+
+
+_limits = {}
+
+def _limits_for(disease):
+    """(low, high, whole, non-contiguous choice columns) as per-column vectors, built once per process."""
+    if disease not in _limits:
+        ranges = load_ranges().get(disease); low, high, choice_sets = [], [], []
+        for j, field in enumerate(SCHEMA[disease]):
+            if field.choices is not None:
+                allowed = sorted(field.choices); low.append(allowed[0]); high.append(allowed[-1])
+                if allowed != list(range(allowed[0], allowed[-1] + 1)): choice_sets.append((j, np.array(allowed, dtype=np.float64)))
+                continue
+            field_low, field_high = field.bounds(ranges)
+            low.append(-np.inf if field_low is None else field_low); high.append(np.inf if field_high is None else field_high)
+        _limits[disease] = (np.array(low, dtype=np.float64), np.array(high, dtype=np.float64),
+                            np.array([field.whole for field in SCHEMA[disease]]), choice_sets)
+    return _limits[disease]
+
+
+def validate(disease, data):
+    """Checks `data` against the schema in one vectorized pass over the whole matrix; returns a ValidationResult."""
+    numbers, missing, not_number = _parse(data, FEATURE_COLUMNS[disease]); low, high, whole, choice_sets = _limits_for(disease)
+    with np.errstate(invalid="ignore"):
+        not_finite = np.isinf(numbers); finite = ~(missing | not_number | not_finite)
+        not_whole = finite & whole & (numbers != np.round(numbers))
+        out_of_range = finite & ((numbers < low) | (numbers > high))
+        not_a_choice = np.zeros_like(finite)
+        for j, allowed in choice_sets: not_a_choice[:, j] = finite[:, j] & ~np.isin(numbers[:, j], allowed)
+    codes = np.zeros(numbers.shape, dtype=np.int8)
+    for code, mask in ((NOT_A_CHOICE, not_a_choice), (OUT_OF_RANGE, out_of_range), (NOT_WHOLE, not_whole),
+                       (NOT_FINITE, not_finite), (NOT_NUMBER, not_number), (REQUIRED, missing)): codes[mask] = code # highest priority last
+    return ValidationResult(disease, numbers if not codes.any() else np.where(codes == OK, numbers, np.nan), codes)
+
+
+def validate_record(disease, record):
+    """One record (dict of column -> str/number) -> float row in model order; raises RecordValidationError."""
+    result = validate(disease, record)
+    if not result.ok: raise RecordValidationError(result.errors()[0])
+    return result.X[0].tolist()
+
+
+# ----------------------------------------------------------------------
+# --- COMMAND LINE ---
+# ----------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the HealthGuard model input schema.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Derive plausible ranges from dataset/*.csv"); build.add_argument("-o", "--output", default=RANGES_PATH)
+    show = commands.add_parser("show"); show.add_argument("disease", choices=list(SCHEMA))
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        ranges = build_ranges()
+        with open(args.output, "w", encoding="utf-8") as file: json.dump(ranges, file, indent=2); file.write("\n")
+        print(f"Wrote ranges for {sum(len(c) for c in ranges['models'].values())} columns to {args.output}")
+    else: json.dump([field.as_dict(load_ranges().get(args.disease)) for field in SCHEMA[args.disease]], sys.stdout, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
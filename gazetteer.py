@@ -0,0 +1,127 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Offline Gazetteer (towns, PIN codes, autocomplete)
+# ----------------------------------------------------------------------
+# Indian towns and cities with their PIN codes, read once from
+# resources/gazetteer.csv into parallel arrays (float64 coordinates, no
+# per-search string parsing). PIN codes resolve through a dict in O(1);
+# a PIN that is not listed falls back to the best-known town sharing its
+# first three digits (the postal sorting district). Names and aliases
+# are indexed in a prefix trie whose nodes keep their best-ranked rows,
+# so autocomplete costs O(len(prefix)). Nothing goes over the network.
+#
+# CSV columns: name, state, latitude, longitude, tier (1 metro, 2 city,
+# 3 town; ranks suggestions), pincodes (space separated), aliases (|).
+#
+#   python gazetteer.py kolh
+#   python gazetteer.py 416012
+# ----------------------------------------------------------------------
+import bisect
+import csv
+import re
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+import geo_distance
+
+GAZETTEER_PATH = "resources/gazetteer.csv"
+SUGGESTION_LIMIT = 8
+PIN_AREA_DIGITS = 3
+
+# match: "name", "pin", "pin_area" (nearest listed town in the PIN's sorting district) or "coordinates".
+Place = namedtuple("Place", ["label", "latitude", "longitude", "match"])
+
+
+def normalize(text):
+    """Lower-case, punctuation and repeated spaces folded to one space."""
+    return re.sub(r"[^0-9a-z]+", " ", str(text).lower()).strip()
+
+
+class PrefixTrie:
+    """Character trie over normalized keys; every node holds its `limit` best (rank, row) pairs."""
+
+    def __init__(self, limit=SUGGESTION_LIMIT * 2): # headroom for a place matching through both name and alias
+        self.root = {}; self.limit = limit
+
+    def insert(self, key, rank, row):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+            best = node.setdefault("", [])
+            if (rank, row) not in best: bisect.insort(best, (rank, row))
+            if len(best) > self.limit: best.pop()
+
+    def search(self, prefix):
+        """Rows under `prefix`, best first (empty for an empty or unknown prefix)."""
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None: return []
+        return [row for _rank, row in node.get("", [])]
+
+
+class Gazetteer:
+    """Array-backed place table with O(1) PIN lookup and trie autocomplete."""
+
+    def __init__(self, names, states, latitudes, longitudes, tiers, pincodes, aliases):
+        self.names = list(names); self.states = list(states)
+        self.lat = np.asarray(latitudes, dtype=np.float64); self.lon = np.asarray(longitudes, dtype=np.float64)
+        self.tier = np.asarray(tiers, dtype=np.int8)
+        self.pins = {}; self.pin_areas = {}; self.exact = {}; self.trie = PrefixTrie()
+        for row in sorted(range(len(self.names)), key=lambda r: (self.tier[r], self.names[r])): # best-ranked row wins shared PIN areas
+            for pin in pincodes[row]:
+                self.pins.setdefault(pin, row); self.pin_areas.setdefault(pin // 10 ** (6 - PIN_AREA_DIGITS), row)
+            for key in {normalize(self.names[row]), *(normalize(alias) for alias in aliases[row])} - {""}:
+                self.exact.setdefault(key, row); self.trie.insert(key, (int(self.tier[row]), normalize(self.names[row])), row)
+            self.exact.setdefault(normalize(self.label(row)), row) # "Kolhapur, Maharashtra" as shown in suggestions
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        names, states, lats, lons, tiers, pincodes, aliases = [], [], [], [], [], [], []
+        with open(path, newline="", encoding="utf-8") as file:
+            for record in csv.DictReader(file):
+                names.append(record["name"].strip()); states.append(record["state"].strip())
+                lats.append(float(record["latitude"])); lons.append(float(record["longitude"])); tiers.append(int(record["tier"] or 3))
+                pincodes.append([int(pin) for pin in record["pincodes"].split()])
+                aliases.append([alias.strip() for alias in record["aliases"].split("|") if alias.strip()])
+        return cls(names, states, lats, lons, tiers, pincodes, aliases)
+
+    def __len__(self):
+        return len(self.names)
+
+    def label(self, row):
+        return f"{self.names[row]}, {self.states[row]}"
+
+    def place(self, row, match="name"):
+        return Place(self.label(row), float(self.lat[row]), float(self.lon[row]), match)
+
+    def lookup_pin(self, pin):
+        """Place for a 6-digit PIN code: exact, else its sorting district's best-known town; None if neither is listed."""
+        pin = int(pin)
+        if pin in self.pins: return self.place(self.pins[pin], "pin")
+        row = self.pin_areas.get(pin // 10 ** (6 - PIN_AREA_DIGITS))
+        return None if row is None else self.place(row, "pin_area")
+
+    def suggest(self, query, limit=SUGGESTION_LIMIT):
+        """Rows whose name or alias starts with `query`, metros before cities before towns."""
+        rows = list(dict.fromkeys(self.trie.search(normalize(query))))
+        return rows[:limit]
+
+    def resolve(self, query):
+        """Place for an exact town name/alias, a 6-digit PIN code or 'lat,lon'; None if the query is only a prefix (or nothing)."""
+        query = str(query or "").strip()
+        if re.fullmatch(r"\d{3}\s?\d{3}", query): return self.lookup_pin(query.replace(" ", ""))
+        if "," in query:
+            try: lat, lon = geo_distance.parse_location(query)
+            except ValueError: pass
+            else: return Place(f"{lat:.4f}, {lon:.4f}", lat, lon, "coordinates")
+        row = self.exact.get(normalize(query))
+        return None if row is None else self.place(row)
+
+
+if __name__ == "__main__":
+    gazetteer = Gazetteer.load()
+    for query in sys.argv[1:]:
+        place = gazetteer.resolve(query)
+        print(f"{query!r}: {place}" if place else f"{query!r}: " + "; ".join(gazetteer.label(row) for row in gazetteer.suggest(query)))
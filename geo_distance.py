@@ -0,0 +1,93 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Vectorized Distance Engine
+# ----------------------------------------------------------------------
+# One user coordinate against an array of provider coordinates, in one
+# NumPy pass: a fast spherical haversine, and an exact ellipsoidal mode
+# (Vincenty inverse on WGS-84, iterated for all points at once; matches
+# geopy's geodesic to well under a metre).
+# ----------------------------------------------------------------------
+import numpy as np
+
+EARTH_RADIUS_MILES = 3958.7613
+METERS_PER_MILE = 1609.344
+# WGS-84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+# Spherical vs. ellipsoidal distance differ by < 0.6%.
+HAVERSINE_ERROR = 0.006
+
+
+def parse_location(loc_str):
+    """'lat,lon' -> (lat, lon) floats; raises ValueError if malformed or out of range."""
+    if not isinstance(loc_str, str) or ',' not in loc_str: raise ValueError("Comma missing")
+    lat, lon = map(float, loc_str.strip().split(','))
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180): raise ValueError("Range invalid")
+    return lat, lon
+
+
+def haversine_miles(lat, lon, lats, lons):
+    """Great-circle distance (miles) from (lat, lon) to every (lats[i], lons[i])."""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(np.asarray(lats, dtype=np.float64)), np.radians(np.asarray(lons, dtype=np.float64))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _vincenty_terms(lam, L, sinU1, cosU1, sinU2, cosU2):
+    """One Vincenty iteration; returns the updated lambda and the series terms needed for the distance."""
+    f = WGS84_F
+    sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+    sin_sigma = np.sqrt((cosU2 * sin_lam) ** 2 + (cosU1 * sinU2 - sinU1 * cosU2 * cos_lam) ** 2)
+    cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+    sigma = np.arctan2(sin_sigma, cos_sigma)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sin_alpha = np.where(sin_sigma > 0, cosU1 * cosU2 * sin_lam / sin_sigma, 0.0)
+        cos2_alpha = 1 - sin_alpha ** 2
+        cos_2sigma_m = np.where(cos2_alpha != 0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha, 0.0)
+    C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+    lam_new = L + (1 - C) * f * sin_alpha * (sigma + C * sin_sigma * (cos_2sigma_m + C * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)))
+    return lam_new, (sin_sigma, cos_sigma, sigma, cos2_alpha, cos_2sigma_m)
+
+
+def ellipsoidal_miles(lat, lon, lats, lons, tolerance=1e-12, max_iter=200):
+    """Exact WGS-84 distance (miles) via a vectorized Vincenty inverse; nearly-antipodal points fall back to geopy."""
+    lats = np.asarray(lats, dtype=np.float64).ravel(); lons = np.asarray(lons, dtype=np.float64).ravel()
+    a, b = WGS84_A, WGS84_B
+    U1 = np.arctan((1 - WGS84_F) * np.tan(np.radians(lat))); U2 = np.arctan((1 - WGS84_F) * np.tan(np.radians(lats)))
+    sinU1, cosU1, sinU2, cosU2 = np.sin(U1), np.cos(U1), np.sin(U2), np.cos(U2)
+    L = np.radians(lons - lon)
+    lam = L.copy(); terms = [np.zeros_like(L) for _ in range(5)]
+    active = np.arange(L.size) # iterate only the points that have not converged yet
+    for _ in range(max_iter):
+        if not active.size: break
+        lam_new, new_terms = _vincenty_terms(lam[active], L[active], sinU1, cosU1, sinU2[active], cosU2[active])
+        for term, value in zip(terms, new_terms): term[active] = value
+        moving = np.abs(lam_new - lam[active]) > tolerance
+        lam[active] = lam_new
+        active = active[moving]
+    sin_sigma, cos_sigma, sigma, cos2_alpha, cos_2sigma_m = terms
+    u2 = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    delta_sigma = B * sin_sigma * (cos_2sigma_m + B / 4 * (cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+                  - B / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)))
+    miles = b * A * (sigma - delta_sigma) / METERS_PER_MILE
+    if active.size: # Vincenty does not converge for nearly-antipodal points
+        from geopy.distance import geodesic
+        for i in active.tolist(): miles[i] = geodesic((lat, lon), (lats[i], lons[i])).miles
+    return miles
+
+
+def distances_miles(lat, lon, lats, lons, exact=False):
+    """Distances from one user coordinate to all provider coordinates (haversine, or exact ellipsoidal)."""
+    return ellipsoidal_miles(lat, lon, lats, lons) if exact else haversine_miles(lat, lon, lats, lons)
+
+
+def distances_within(lat, lon, lats, lons, max_distance):
+    """Haversine prefilter + exact refinement: returns (indices, exact_miles) of points within max_distance."""
+    approx = haversine_miles(lat, lon, lats, lons)
+    ids = np.flatnonzero(approx <= max_distance * (1 + HAVERSINE_ERROR))
+    exact = ellipsoidal_miles(lat, lon, np.asarray(lats)[ids], np.asarray(lons)[ids])
+    keep = exact <= max_distance
+    return ids[keep], exact[keep]
@@ -0,0 +1,154 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Linear Scoring Kernel (pure NumPy)
+# ----------------------------------------------------------------------
+# diabetes_model.sav / parkinsons_model.sav are SVC(kernel='linear') and
+# heart_disease_model.sav is a LogisticRegression: all three predict
+# classes_[X @ coef + intercept > 0]. `export` stores coef_/intercept_ in
+# a small versioned .npz next to each .sav; LinearKernel scores it with
+# NumPy alone, so serving never imports scikit-learn or unpickles SVC.
+#
+# With a shared directory (HEALTHGUARD_SHARED_DIR) the kernel's arrays are
+# read from a memory-mapped bundle (shared_arrays.py) that all workers on
+# the host map read-only instead of each loading its own copy.
+#
+#   python linear_kernel.py export      # writes saved_models/*.npz
+# ----------------------------------------------------------------------
+import argparse
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+import shared_arrays
+
+ARTIFACT_FORMAT_VERSION = 1
+MODEL_FILES = {"Diabetes": "saved_models/diabetes_model.sav", "Heart Disease": "saved_models/heart_disease_model.sav", "Parkinsons": "saved_models/parkinsons_model.sav"}
+SUPPORTED_ESTIMATORS = ("SVC", "LinearSVC", "LogisticRegression")
+
+
+def artifact_path(model_path):
+    """saved_models/x_model.sav -> saved_models/x_model.npz"""
+    return os.path.splitext(model_path)[0] + ".npz"
+
+
+def file_checksum(path):
+    """SHA-256 of a file, used as the artifact's model version."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""): digest.update(block)
+    return digest.hexdigest()
+
+
+# ----------------------------------------------------------------------
+# --- SCORING ENGINE ---
+# ----------------------------------------------------------------------
+class LinearKernel:
+    """Binary linear classifier: predict(X) = classes[X @ coef + intercept > 0]."""
+
+    def __init__(self, coef, intercept, classes, feature_names=(), estimator="", version=""):
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        self.classes = np.asarray(classes)
+        self.feature_names = [str(n) for n in feature_names]
+        self.estimator = estimator; self.version = version
+        self.n_features_in_ = self.coef.shape[0]
+
+    def decision_function(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1: X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_: raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+        return X @ self.coef + self.intercept
+
+    def predict(self, X):
+        return self.classes[(self.decision_function(X) > 0).astype(np.intp)]
+
+    @classmethod
+    def load(cls, path):
+        """Loads an exported .npz artifact (no pickle involved)."""
+        with np.load(path, allow_pickle=False) as data:
+            format_version = int(data["format_version"])
+            if format_version != ARTIFACT_FORMAT_VERSION: raise ValueError(f"Unsupported artifact format {format_version} in {path}")
+            return cls(data["coef"], data["intercept"], data["classes"], data["feature_names"], str(data["estimator"]), str(data["version"]))
+
+    def to_arrays(self):
+        """(arrays, meta) for a shared_arrays bundle."""
+        return ({"coef": self.coef, "classes": self.classes, "feature_names": np.asarray(self.feature_names, dtype=str)},
+                {"format_version": ARTIFACT_FORMAT_VERSION, "intercept": self.intercept, "estimator": self.estimator, "version": self.version})
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        """Kernel over a bundle's (memory-mapped) arrays; coef and classes are used in place, not copied."""
+        if meta["format_version"] != ARTIFACT_FORMAT_VERSION: raise ValueError(f"Unsupported artifact format {meta['format_version']}")
+        return cls(arrays["coef"], meta["intercept"], arrays["classes"], arrays["feature_names"], meta["estimator"], meta["version"])
+
+    @classmethod
+    def load_shared(cls, path, shared_dir, family=None):
+        """Like load(), through a read-only mapped bundle in shared_dir that the first worker writes (kernel-<family>-<checksum>)."""
+        family = family or os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+        name = f"kernel-{family}-{file_checksum(path)[:16]}"
+        return cls.from_arrays(*shared_arrays.shared_bundle(shared_dir, name, lambda: cls.load(path).to_arrays()))
+
+
+# ----------------------------------------------------------------------
+# --- EXPORT (needs scikit-learn only here) ---
+# ----------------------------------------------------------------------
+def _linear_parts(model, model_path):
+    """(estimator, coef, intercept) with a leading StandardScaler (Pipeline) folded into the coefficients."""
+    mean = scale = None
+    if type(model).__name__ == "Pipeline":
+        steps = [step for _, step in model.steps]
+        if len(steps) != 2 or type(steps[0]).__name__ != "StandardScaler":
+            raise ValueError(f"{model_path}: only StandardScaler + linear model pipelines can be exported")
+        scaler, model = steps
+        mean = scaler.mean_ if scaler.with_mean else 0.0; scale = scaler.scale_ if scaler.with_std else 1.0
+    estimator = type(model).__name__
+    if estimator not in SUPPORTED_ESTIMATORS or (estimator == "SVC" and model.kernel != "linear"):
+        raise ValueError(f"{model_path}: {estimator} is not a linear model and cannot be exported")
+    if len(model.classes_) != 2: raise ValueError(f"{model_path}: only binary classifiers are supported")
+    coef = np.asarray(model.coef_, dtype=np.float64).ravel(); intercept = float(np.ravel(model.intercept_)[0])
+    if scale is not None: # w.(x - m)/s + b == (w/s).x + (b - sum(w*m/s))
+        coef = coef / scale; intercept = intercept - float(np.sum(coef * mean))
+    return model, coef, intercept
+
+
+def export_linear_model(model_path, out_path=None):
+    """Extracts coef_/intercept_ from a pickled linear estimator (optionally behind a StandardScaler) into a versioned .npz."""
+    with open(model_path, "rb") as file: pipeline = pickle.load(file)
+    model, coef, intercept = _linear_parts(pipeline, model_path)
+    estimator = type(model).__name__
+    out_path = out_path or artifact_path(model_path)
+    np.savez(out_path,
+             format_version=np.int64(ARTIFACT_FORMAT_VERSION),
+             coef=coef,
+             intercept=np.float64(intercept),
+             classes=np.asarray(model.classes_),
+             feature_names=np.asarray(getattr(pipeline, "feature_names_in_", []), dtype=str),
+             estimator=np.str_(estimator),
+             version=np.str_(file_checksum(model_path)[:16]))
+    return out_path
+
+
+# ----------------------------------------------------------------------
+# --- LOADING FOR SERVING ---
+# ----------------------------------------------------------------------
+def load_scoring_model(model_path, shared_dir=None, family=None):
+    """Returns the NumPy kernel when its .npz matches the .sav checksum (mapped from shared_dir if given), else the unpickled estimator."""
+    npz_path = artifact_path(model_path)
+    if os.path.exists(npz_path):
+        kernel = LinearKernel.load_shared(npz_path, shared_dir, family) if shared_dir else LinearKernel.load(npz_path)
+        if not os.path.exists(model_path) or file_checksum(model_path).startswith(kernel.version): return kernel
+    with open(model_path, "rb") as file: return pickle.load(file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export linear HealthGuard models to NumPy artifacts.")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("models", nargs="*", help="Model .sav files (default: the three saved_models)")
+    args = parser.parse_args(argv)
+    for model_path in args.models or MODEL_FILES.values():
+        print(f"{model_path} -> {export_linear_model(model_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Concurrent Session Load Test
+# ----------------------------------------------------------------------
+# Simulates N users of one `streamlit run app.py` instance, speaking the
+# browser's websocket protocol (/_stcore/stream, BackMsg/ForwardMsg
+# protobufs): every session opens the app, picks its page in the sidebar
+# menu, submits the page's form with a random row of dataset/*.csv and
+# clicks "Search Nearby Options". Each action is timed from sending the
+# rerun to the server's script_finished, so the numbers include queueing
+# behind other sessions' reruns. Reports throughput and p50/p95/p99 per
+# action for each concurrency level, to size deployments.
+#
+# AppTest is not used: it installs a process-wide mock Runtime for every
+# run, so concurrent in-process sessions would not behave like a server.
+# The client shares the CPU with the server when both run on one host;
+# for large N, run it from another machine (--url).
+#
+#   streamlit run app.py --server.headless true &
+#   python load_test.py --sessions 1 5 10 20 --duration 60
+#   python load_test.py --launch --sessions 10 --duration 30 -o load_results.json
+# ----------------------------------------------------------------------
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import pandas as pd
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+import feature_schema
+
+DEFAULT_URL = "http://127.0.0.1:8501"
+# disease -> (sidebar option, schema_inputs key, doctor finder key)
+PAGES = {"Diabetes": ("Diabetes Prediction", "diabetes", "diabetes"),
+         "Heart Disease": ("Heart Disease Prediction", "heart", "heart"),
+         "Parkinsons": ("Parkinsons Prediction", "park", "parkinsons")}
+FORM_EXTRAS = {"Heart Disease": {"age": "heart_age_input"}} # columns rendered outside schema_inputs -> widget key
+ACTIONS = ["open", "navigate", "predict", "search"]
+PERCENTILES = [50, 95, 99]
+WIDGET_TYPES = {"button", "text_input", "number_input", "selectbox", "component_instance"}
+
+
+class ActionError(Exception):
+    """The app raised, or the rerun did not finish in time."""
+
+
+def widget_key(widget_id):
+    """User key of a widget id ('$$WIDGET_ID-<hash>-<key>'); 'None' for keyless widgets."""
+    return widget_id.split("-", 2)[-1]
+
+
+class Session:
+    """One simulated browser tab: a websocket, the widgets of the last run and the values the user has entered."""
+
+    def __init__(self, url, timeout):
+        self.url = url.rstrip("/").replace("http", "ws", 1) + "/_stcore/stream"; self.timeout = timeout
+        self.conn = None; self.widgets = []; self.alerts = []; self.states = {}; self.cache = {}
+
+    async def connect(self):
+        self.conn = await websocket_connect(self.url, max_message_size=256 * 1024 * 1024)
+
+    def close(self):
+        if self.conn is not None: self.conn.close(); self.conn = None
+
+    async def rerun(self, values=None, trigger=None):
+        """Sends a rerun with the stored widget values (+ `values`, + one-shot `trigger`); waits for the run to finish."""
+        for widget_id, state in (values or {}).items(): self.states[widget_id] = state
+        msg = BackMsg(); msg.rerun_script.query_string = ""
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+        if trigger is not None: msg.rerun_script.widget_states.widgets.add(id=trigger, trigger_value=True)
+        self.widgets = []; self.alerts = []; deadline = time.monotonic() + self.timeout
+        self.conn.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            try: data = await asyncio.wait_for(self.conn.read_message(), max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError: raise ActionError(f"no script_finished within {self.timeout:.0f} s")
+            if data is None: raise ActionError("server closed the connection")
+            forward = ForwardMsg(); forward.ParseFromString(data)
+            if forward.ref_hash: forward = self.cache.get(forward.ref_hash, forward) # large messages are sent once, then by reference
+            elif forward.hash: self.cache[forward.hash] = forward
+            kind = forward.WhichOneof("type")
+            if kind == "delta": self._read_delta(forward.delta)
+            elif kind == "script_finished":
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR: raise ActionError("app.py failed to compile")
+                if forward.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY: return self
+                self.widgets = []; self.alerts = [] # FINISHED_EARLY_FOR_RERUN (st.rerun): the next run follows on its own
+
+    def _read_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element": return
+        element = delta.new_element; kind = element.WhichOneof("type")
+        if kind == "exception": raise ActionError(f"{element.exception.type}: {element.exception.message}")
+        if kind == "alert": self.alerts.append(element.alert)
+        elif kind in WIDGET_TYPES: self.widgets.append((kind, getattr(element, kind)))
+
+    def widget(self, key=None, match=None):
+        """(kind, proto) of the last run's widget with user key `key`, or the first for which `match(kind, proto)` holds."""
+        for kind, widget in self.widgets:
+            if (match(kind, widget) if match else widget_key(widget.id) == key): return kind, widget
+        raise ActionError(f"widget {key!r} not on the page")
+
+    def form_values(self, disease, row, key):
+        """WidgetStates filling the page's form with one dataset row (coded fields select their option by index)."""
+        values = {}; extras = FORM_EXTRAS.get(disease, {})
+        for field in feature_schema.SCHEMA[disease]:
+            value = row[field.name]; kind, widget = self.widget(extras.get(field.name, f"{key}_{field.name}")); state = WidgetState(id=widget.id)
+            if kind == "selectbox": state.int_value = list(field.choices).index(int(value))
+            elif kind == "number_input":
+                if widget.data_type == widget.INT: state.int_value = int(value)
+                else: state.double_value = float(value)
+            else: state.string_value = f"{int(value)}" if field.whole else f"{value:g}"
+            values[widget.id] = state
+        return values
+
+
+async def user_journey(session, disease, row, record):
+    """open -> navigate -> predict -> search; `record(action, seconds)` per completed action."""
+    page, form_key, finder_key = PAGES[disease]
+    start = time.perf_counter(); await session.connect(); await session.rerun(); record("open", time.perf_counter() - start)
+    _, menu = session.widget(match=lambda kind, w: kind == "component_instance" and w.component_name.endswith("option_menu"))
+    start = time.perf_counter(); await session.rerun({menu.id: WidgetState(id=menu.id, json_value=json.dumps(page))}); record("navigate", time.perf_counter() - start)
+    _, submit = session.widget(match=lambda kind, w: kind == "button" and w.is_form_submitter)
+    values = session.form_values(disease, row, form_key)
+    start = time.perf_counter(); await session.rerun(values, trigger=submit.id); record("predict", time.perf_counter() - start)
+    if not any(alert.icon in ("✅", "⚠️") for alert in session.alerts): # the diagnosis; otherwise a validation message
+        raise ActionError("no prediction shown" + "".join(f": {alert.body}" for alert in session.alerts[:1]))
+    _, find = session.widget(f"find_{finder_key}")
+    if find.disabled: raise ActionError("Search Nearby Options is disabled (no location)")
+    start = time.perf_counter(); await session.rerun(trigger=find.id); record("search", time.perf_counter() - start)
+    if not any(alert.body.startswith(("Found", "No doctors")) for alert in session.alerts): raise ActionError("no search results shown")
+
+
+# ----------------------------------------------------------------------
+# --- LOAD LEVELS ---
+# ----------------------------------------------------------------------
+def load_rows():
+    """{disease: list of row dicts} from dataset/*.csv (model columns only)."""
+    rows = {}
+    for disease, path in feature_schema.DATASET_FILES.items():
+        frame = pd.read_csv(path, encoding="utf-8-sig")[feature_schema.FEATURE_COLUMNS[disease]]
+        rows[disease] = frame.to_dict("records")
+    return rows
+
+
+def percentiles(samples):
+    """Seconds -> {n, mean and p50/p95/p99 in milliseconds}."""
+    if not samples: return {"n": 0}
+    ms = np.asarray(samples) * 1000
+    return {"n": len(ms), "mean_ms": float(ms.mean()), **{f"p{p}_ms": float(np.percentile(ms, p)) for p in PERCENTILES}, "max_ms": float(ms.max())}
+
+
+async def run_level(url, n_sessions, duration, diseases, rows, ramp, think, timeout, seed=0):
+    """N sessions repeat the journey (a fresh tab each time) until `duration` has passed; timings after ramp-up only."""
+    samples = {action: [] for action in ACTIONS}; errors = {}; journeys = 0
+    start = time.monotonic(); measure_from = start + ramp; stop = measure_from + duration
+
+    def record(action, seconds):
+        if time.monotonic() >= measure_from: samples[action].append(seconds)
+
+    async def user(i):
+        nonlocal journeys
+        rng = random.Random(seed + i); disease = diseases[i % len(diseases)]
+        await asyncio.sleep(ramp * i / n_sessions)
+        while time.monotonic() < stop:
+            session = Session(url, timeout)
+            try:
+                await user_journey(session, disease, rng.choice(rows[disease]), record)
+                if time.monotonic() >= measure_from: journeys += 1
+            except (ActionError, OSError) as e:
+                message = str(e) or type(e).__name__; errors[message] = errors.get(message, 0) + 1
+                if isinstance(e, OSError): await asyncio.sleep(1)
+            finally: session.close()
+            if think: await asyncio.sleep(rng.expovariate(1 / think))
+
+    await asyncio.gather(*(user(i) for i in range(n_sessions)))
+    elapsed = time.monotonic() - measure_from
+    actions = {action: {**percentiles(s), "per_second": len(s) / elapsed} for action, s in samples.items()}
+    return {"sessions": n_sessions, "seconds": elapsed, "journeys": journeys, "journeys_per_second": journeys / elapsed,
+            "reruns_per_second": sum(len(s) for s in samples.values()) / elapsed, "errors": errors, "actions": actions}
+
+
+def format_level(result):
+    lines = [f"{result['sessions']:>4} sessions: {result['reruns_per_second']:.1f} reruns/s, {result['journeys_per_second']:.2f} journeys/s"
+             + (f", errors {result['errors']}" if result["errors"] else "")]
+    for action, stats in result["actions"].items():
+        if stats["n"]: lines.append(f"       {action:<9} n={stats['n']:<6} p50 {stats['p50_ms']:8.0f} ms  p95 {stats['p95_ms']:8.0f} ms  p99 {stats['p99_ms']:8.0f} ms")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# --- SERVER ---
+# ----------------------------------------------------------------------
+def wait_healthy(url, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url.rstrip("/") + "/_stcore/health", timeout=2) as response:
+                if response.status == 200: return
+        except OSError: time.sleep(0.5)
+    raise RuntimeError(f"{url} did not become healthy within {timeout} s")
+
+
+def launch_server(port):
+    """Starts `streamlit run app.py` headless on `port` (this directory); returns the process once it is healthy."""
+    process = subprocess.Popen([sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true", "--server.port", str(port),
+                                "--browser.gatherUsageStats", "false"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try: wait_healthy(f"http://127.0.0.1:{port}")
+    except Exception: process.kill(); raise
+    return process
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a running HealthGuard Streamlit app with concurrent simulated sessions.")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--launch", action="store_true", help="Start `streamlit run app.py` for the test (port from --url)")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10], help="Concurrency levels, run one after another")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per level")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds to start all sessions (not measured)")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean pause between journeys, seconds")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds before a rerun counts as failed")
+    parser.add_argument("--diseases", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("-o", "--output", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # app.py and dataset/ are relative paths
+    rows = load_rows(); server = launch_server(int(args.url.rsplit(":", 1)[-1].strip("/"))) if args.launch else None
+    try:
+        wait_healthy(args.url, 10)
+        results = []
+        for n in args.sessions:
+            result = asyncio.run(run_level(args.url, n, args.duration, args.diseases, rows, args.ramp, args.think, args.timeout))
+            results.append(result); print(format_level(result), flush=True)
+    finally:
+        if server is not None: server.terminate(); server.wait(30)
+    if args.output:
+        from benchmark import environment
+        report = {"environment": environment(), "config": {k: v for k, v in vars(args).items() if k != "output"}, "levels": results}
+        with open(args.output, "w", encoding="utf-8") as file: json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
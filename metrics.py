@@ -0,0 +1,252 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Stage Timing Metrics & Per-Rerun Traces
+# ----------------------------------------------------------------------
+# Process-wide latency histograms and counters for the app's stages
+# (model load, input parsing, predict, advice, doctor search/display),
+# exported in the Prometheus text format from a small local HTTP
+# endpoint or a textfile. Each rerun can also collect a structured trace
+# of the stages it ran. A timed stage costs two perf_counter() calls and
+# one short lock, so the hooks stay on in production.
+#
+#   GET /metrics  -> Prometheus text (version 0.0.4)
+#   GET /traces   -> JSON list of the most recent rerun traces
+# ----------------------------------------------------------------------
+import bisect
+import contextvars
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; fine-grained at the low end where reruns and predicts live.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STAGE_METRIC = "healthguard_stage_duration_seconds"
+TRACE_HISTORY = 200
+
+
+def _label_text(labels):
+    if not labels: return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for v in dict(labels).values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(dict(labels), escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set."""
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name; self.help = help_text; self.buckets = tuple(buckets)
+        self.series = {}; self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.series.get(key)
+            if series is None: series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1; series[1] += value; series[2] += 1
+
+    def snapshot(self):
+        with self.lock: return {key: ([*counts], total, count) for key, (counts, total, count) in self.series.items()}
+
+    def quantile(self, q, **labels):
+        """Upper bucket bound below which a fraction q of the observations fall (None if empty)."""
+        series = self.snapshot().get(tuple(sorted(labels.items())))
+        if not series or not series[2]: return None
+        target = q * series[2]; running = 0
+        for bound, n in zip(self.buckets + (float("inf"),), series[0]):
+            running += n
+            if running >= target: return bound
+        return float("inf")
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in sorted(self.snapshot().items()):
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_label_text(key + (('le', le),))} {running}")
+            lines.append(f"{self.name}_sum{_label_text(key)} {total}")
+            lines.append(f"{self.name}_count{_label_text(key)} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter, one series per label set."""
+
+    def __init__(self, name, help_text):
+        self.name = name; self.help = help_text; self.series = {}; self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self.lock: self.series[key] = self.series.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self.lock: return self.series.get(tuple(sorted(labels.items())), 0)
+
+    def exposition(self):
+        with self.lock: items = sorted(self.series.items())
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"] + [f"{self.name}{_label_text(k)} {v}" for k, v in items]
+
+
+class Gauge(Counter):
+    """Point-in-time value, one series per label set."""
+
+    def set(self, value, **labels):
+        with self.lock: self.series[tuple(sorted(labels.items()))] = value
+
+    def exposition(self):
+        return [line.replace(" counter", " gauge", 1) if line.startswith("# TYPE") else line for line in super().exposition()]
+
+
+class Registry:
+    """Named metrics, rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics = {}; self.lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, **kwargs):
+        with self.lock:
+            if name not in self.metrics: self.metrics[name] = cls(name, help_text, **kwargs)
+            return self.metrics[name]
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def counter(self, name, help_text):
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text):
+        return self._get(Gauge, name, help_text)
+
+    def exposition(self):
+        with self.lock: metrics = list(self.metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.exposition()) + "\n"
+
+
+registry = Registry()
+stage_seconds = registry.histogram(STAGE_METRIC, "Wall time of one app stage (model load, parsing, predict, advice, doctor search).")
+stage_errors = registry.counter("healthguard_stage_errors_total", "Stages that raised an exception.")
+reruns = registry.counter("healthguard_reruns_total", "Completed traced reruns per page.")
+
+
+# ----------------------------------------------------------------------
+# --- PER-RERUN TRACES ---
+# ----------------------------------------------------------------------
+_current_trace = contextvars.ContextVar("healthguard_trace", default=None)
+recent_traces = deque(maxlen=TRACE_HISTORY)
+
+
+class Trace:
+    """Stages run during one rerun/request, with offsets relative to its start."""
+
+    def __init__(self, name, **attrs):
+        self.trace_id = uuid.uuid4().hex[:16]; self.name = name; self.attrs = attrs
+        self.started_at = time.time(); self.start = time.perf_counter(); self.spans = []
+
+    def add(self, stage, labels, start, duration, error):
+        self.spans.append({"stage": stage, **labels, "offset_ms": round((start - self.start) * 1000, 3),
+                           "duration_ms": round(duration * 1000, 3), **({"error": error} if error else {})})
+
+    def as_dict(self, duration):
+        return {"trace_id": self.trace_id, "name": self.name, **self.attrs, "started_at": self.started_at,
+                "duration_ms": round(duration * 1000, 3), "spans": self.spans}
+
+
+def start_trace(name, **attrs):
+    """Begins a trace in the current context (one Streamlit session thread / request); replaces any unfinished one."""
+    trace = Trace(name, **attrs); _current_trace.set(trace)
+    return trace
+
+
+def finish_trace(trace_file=None):
+    """Ends the current trace: records the total as stage "rerun", keeps it in recent_traces and optionally appends it as JSON Lines."""
+    trace = _current_trace.get()
+    if trace is None: return None
+    _current_trace.set(None)
+    duration = time.perf_counter() - trace.start
+    stage_seconds.observe(duration, stage="rerun", **trace.attrs); reruns.inc(**trace.attrs)
+    record = trace.as_dict(duration); recent_traces.append(record)
+    if trace_file:
+        with open(trace_file, "a", encoding="utf-8") as file: file.write(json.dumps(record) + "\n")
+    return record
+
+
+# ----------------------------------------------------------------------
+# --- STAGE TIMERS ---
+# ----------------------------------------------------------------------
+class timer:
+    """`with metrics.timer("predict", disease="Diabetes"):` observes the block's wall time."""
+
+    __slots__ = ("stage", "labels", "start")
+
+    def __init__(self, stage, **labels):
+        self.stage = stage; self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter(); return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        stage_seconds.observe(duration, stage=self.stage, **self.labels)
+        # st.stop()/st.rerun() unwind with BaseException subclasses; those are not stage failures.
+        error = exc_type.__name__ if exc_type is not None and issubclass(exc_type, Exception) else None
+        if error: stage_errors.inc(stage=self.stage, **self.labels)
+        trace = _current_trace.get()
+        if trace is not None: trace.add(self.stage, self.labels, self.start, duration, error)
+        return False
+
+
+def timed(stage, **labels):
+    """Decorator form of `timer`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(stage, **labels): return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ----------------------------------------------------------------------
+# --- EXPORT ---
+# ----------------------------------------------------------------------
+_textfile_lock = threading.Lock()
+
+def write_textfile(path):
+    """Atomically writes the Prometheus exposition to `path` (node_exporter textfile collector style); safe from concurrent sessions."""
+    with _textfile_lock:
+        fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file: file.write(registry.exposition())
+            os.chmod(tmp, 0o644); os.replace(tmp, path) # mkstemp creates 0600; the collector may run as another user
+        except BaseException:
+            try: os.remove(tmp)
+            except OSError: pass
+            raise
+
+
+json_routes = {} # extra GET path -> callable returning a JSON-able view (drift_monitor.py adds /drift)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path == "/metrics": body, content_type, status = registry.exposition().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8", 200
+        elif path == "/traces": body, content_type, status = json.dumps(list(recent_traces)).encode("utf-8"), "application/json", 200
+        elif path in json_routes: body, content_type, status = json.dumps(json_routes[path]()).encode("utf-8"), "application/json", 200
+        else: body, content_type, status = b"Not found\n", "text/plain", 404
+        self.send_response(status); self.send_header("Content-Type", content_type); self.send_header("Content-Length", str(len(body)))
+        self.end_headers(); self.wfile.write(body)
+
+    def log_message(self, format, *args): pass # scrapes would otherwise flood stderr
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """Serves /metrics, /traces and json_routes from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler); server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="healthguard-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,232 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Versioned Model Registry & Hot Reload
+# ----------------------------------------------------------------------
+# saved_models/manifest.json lists every published model version (file,
+# sha256, metrics) and which version is active per disease. Serving
+# processes poll the manifest from a background thread; when the active
+# version changes they load it, verify its checksum, run a warm-up
+# predict and only then swap it in, so sessions never see a cold or
+# half-loaded model. Rolling back is re-activating the previous version.
+# Without a manifest the legacy saved_models/*.sav files are served.
+#
+#   python model_registry.py init                    # manifest from saved_models/*.sav
+#   python model_registry.py publish saved_models/runs/<run_id>
+#   python model_registry.py list
+#   python model_registry.py activate Diabetes <version>
+#   python model_registry.py rollback Diabetes
+# ----------------------------------------------------------------------
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+import batch_predict
+import linear_kernel
+import metrics
+
+MANIFEST_PATH = "saved_models/manifest.json"
+VERSIONS_DIR = "versions" # relative to the manifest's directory
+MANIFEST_FORMAT_VERSION = 1
+DEFAULT_POLL_SECONDS = 2.0
+
+swaps = metrics.registry.counter("healthguard_model_swaps_total", "Model versions swapped in by disease and result (ok, failed).")
+active_version = metrics.registry.gauge("healthguard_model_active_info", "1 for the model version currently served per disease.")
+
+
+def _slug(disease):
+    return disease.lower().replace(" ", "_")
+
+
+# ----------------------------------------------------------------------
+# --- MANIFEST (single writer: the CLI / training pipeline) ---
+# ----------------------------------------------------------------------
+def read_manifest(path=MANIFEST_PATH):
+    with open(path, encoding="utf-8") as file: manifest = json.load(file)
+    if manifest.get("format") != MANIFEST_FORMAT_VERSION: raise ValueError(f"Unsupported manifest format {manifest.get('format')} in {path}")
+    return manifest
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Atomic replace, so readers only ever see a complete manifest."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as file: json.dump(manifest, file, indent=2)
+    os.replace(tmp, path)
+
+
+def empty_manifest():
+    return {"format": MANIFEST_FORMAT_VERSION, "active": {}, "history": {}, "versions": {}}
+
+
+def load_or_create(path=MANIFEST_PATH):
+    return read_manifest(path) if os.path.exists(path) else empty_manifest()
+
+
+def add_version(manifest, disease, model_path, path=MANIFEST_PATH, info=None, activate=True):
+    """Copies a .sav (+ its .npz kernel) into versions/<disease>/<version>/ and records it; returns the version."""
+    sha256 = linear_kernel.file_checksum(model_path); version = sha256[:16]
+    rel_dir = os.path.join(VERSIONS_DIR, _slug(disease), version); abs_dir = os.path.join(os.path.dirname(path), rel_dir)
+    os.makedirs(abs_dir, exist_ok=True)
+    shutil.copyfile(model_path, os.path.join(abs_dir, "model.sav"))
+    kernel = linear_kernel.artifact_path(model_path)
+    has_kernel = os.path.exists(kernel) and linear_kernel.LinearKernel.load(kernel).version == version
+    if has_kernel: shutil.copyfile(kernel, os.path.join(abs_dir, "model.npz"))
+    manifest["versions"].setdefault(disease, {})[version] = {"file": os.path.join(rel_dir, "model.sav").replace(os.sep, "/"), "sha256": sha256,
+                                                            "kernel": has_kernel, "published_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), **(info or {})}
+    if activate: activate_version(manifest, disease, version)
+    return version
+
+
+def publish_run(manifest, run_dir, path=MANIFEST_PATH, activate=True):
+    """Adds every model of a train_models.py run (its metadata.json); returns {disease: version}."""
+    with open(os.path.join(run_dir, "metadata.json"), encoding="utf-8") as file: run = json.load(file)
+    published = {}
+    for disease, entry in run["models"].items():
+        info = {"source": run["run_id"], "candidate": entry["candidate"], "params": entry["params"], "cv_score": entry["cv_score"], "test": entry["test"]}
+        published[disease] = add_version(manifest, disease, os.path.join(run_dir, entry["file"]), path, info, activate)
+    return published
+
+
+def activate_version(manifest, disease, version):
+    if version not in manifest["versions"].get(disease, {}): raise KeyError(f"{disease} has no version {version}")
+    if manifest["active"].get(disease) == version: return
+    manifest["active"][disease] = version; manifest["history"].setdefault(disease, []).append(version)
+
+
+def rollback_version(manifest, disease):
+    """Re-activates the version that was active before the current one; returns it."""
+    history = manifest["history"].get(disease, [])
+    if len(history) < 2: raise ValueError(f"No earlier {disease} version to roll back to")
+    history.pop(); manifest["active"][disease] = history[-1]
+    return history[-1]
+
+
+# ----------------------------------------------------------------------
+# --- SERVING SIDE ---
+# ----------------------------------------------------------------------
+def load_verified(model_path, sha256=None, disease=None, shared_dir=None):
+    """Loads a model (NumPy kernel when exported, mapped from shared_dir if given) after checking the .sav against the manifest checksum."""
+    with metrics.timer("load_model", disease=disease):
+        if sha256 and linear_kernel.file_checksum(model_path) != sha256: raise ValueError(f"Checksum mismatch for {model_path}")
+        return linear_kernel.load_scoring_model(model_path, shared_dir, _slug(disease) if disease else None)
+
+
+def warm_up(model, disease):
+    """One predict on a zero row, so the first real request doesn't pay for lazy initialisation."""
+    n_features = getattr(model, "n_features_in_", None) or len(batch_predict.FEATURE_COLUMNS[disease])
+    model.predict(np.zeros((1, n_features), dtype=np.float64))
+
+
+class ModelRegistry:
+    """Active model per disease, loaded on first use and refreshed from the manifest; `get` is a lock-free dict lookup once loaded."""
+
+    def __init__(self, manifest_path=MANIFEST_PATH, preload=(), shared_dir=None):
+        self.manifest_path = manifest_path; self.shared_dir = shared_dir # kernels mapped from shared_arrays bundles when set
+        self.models = {}; self.versions = {}; self.errors = {}
+        self._stamp = None; self._retry = set(); self._lock = threading.Lock(); self._watcher = None; self._stop = threading.Event()
+        if preload: self.refresh(preload)
+
+    def get(self, disease):
+        """The currently served model, loading it on first use (None if it cannot be loaded)."""
+        model = self.models.get(disease)
+        if model is None: self.refresh([disease]); model = self.models.get(disease)
+        return model
+
+    def version(self, disease):
+        return self.versions.get(disease)
+
+    def _target(self, manifest, disease):
+        """(version, model_path, sha256) from the manifest (None: no manifest), or the legacy saved_models/*.sav file."""
+        version = manifest["active"].get(disease) if manifest is not None else None
+        if version is None: return None, linear_kernel.MODEL_FILES[disease], None
+        try: entry = manifest["versions"][disease][version]
+        except KeyError: raise KeyError(f"manifest has no entry for active version {version}") from None
+        return version, os.path.join(os.path.dirname(self.manifest_path), entry["file"]), entry["sha256"]
+
+    def refresh(self, diseases=(), force=False):
+        """Loads `diseases` and, if the manifest changed, every loaded disease whose active version moved
+        (verify -> load -> warm up -> swap); returns {disease: version} swapped in. Diseases that failed (unreadable
+        manifest, checksum mismatch while a file is still being copied, ...) keep their model and are retried on every refresh."""
+        with self._lock:
+            try: stat = os.stat(self.manifest_path); stamp = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError: stamp = None
+            wanted = [d for d in diseases if d not in self.models] + [d for d in self._retry if d not in diseases]
+            if stamp != self._stamp or force: wanted += [d for d in self.models if d not in wanted]
+            if not wanted: return {}
+            try: manifest = read_manifest(self.manifest_path) if stamp is not None else None
+            except Exception as e: manifest = e # malformed / mid-edit: fails each wanted disease below
+            swapped = {}; models = dict(self.models); versions = dict(self.versions)
+            for disease in wanted:
+                version = None
+                try:
+                    if isinstance(manifest, Exception): raise ValueError(f"unreadable manifest {self.manifest_path}: {manifest}")
+                    version, model_path, sha256 = self._target(manifest, disease)
+                    version = version or (linear_kernel.file_checksum(model_path)[:16] if os.path.exists(model_path) else None)
+                    if disease in models and versions.get(disease) == version: self._retry.discard(disease); self.errors.pop(disease, None); continue
+                    model = load_verified(model_path, sha256, disease, self.shared_dir); warm_up(model, disease)
+                except Exception as e: # keep serving the previous model; retried on the next refresh
+                    error = f"{version}: {e}"; swaps.inc(disease=disease, result="failed"); self._retry.add(disease)
+                    if self.errors.get(disease) != error: print(f"Model registry: {disease} version {version} not loaded ({e}); keeping {versions.get(disease)}")
+                    self.errors[disease] = error
+                    continue
+                if versions.get(disease): active_version.set(0, disease=disease, version=versions[disease])
+                models[disease] = model; versions[disease] = version; swapped[disease] = version
+                self._retry.discard(disease); self.errors.pop(disease, None); swaps.inc(disease=disease, result="ok"); active_version.set(1, disease=disease, version=version)
+            self.models = models; self.versions = versions; self._stamp = stamp # one reference swap per refresh
+            return swapped
+
+    def start_watcher(self, interval=DEFAULT_POLL_SECONDS):
+        """Polls the manifest from a daemon thread (a stat() per interval)."""
+        if self._watcher is not None: return self._watcher
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    for disease, version in self.refresh().items(): print(f"Model registry: now serving {disease} {version}")
+                except Exception as e: print(f"Model registry: refresh failed: {e}")
+        self._watcher = threading.Thread(target=watch, name="healthguard-model-registry", daemon=True); self._watcher.start()
+        return self._watcher
+
+    def stop_watcher(self):
+        self._stop.set()
+
+
+# ----------------------------------------------------------------------
+# --- COMMAND LINE ---
+# ----------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the HealthGuard model manifest.")
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init", help="Publish the current saved_models/*.sav files")
+    publish = commands.add_parser("publish", help="Publish a train_models.py run (metadata.json) and activate it")
+    publish.add_argument("run_dir"); publish.add_argument("--no-activate", action="store_true")
+    commands.add_parser("list")
+    activate = commands.add_parser("activate"); activate.add_argument("disease", choices=list(linear_kernel.MODEL_FILES)); activate.add_argument("version")
+    rollback = commands.add_parser("rollback"); rollback.add_argument("disease", choices=list(linear_kernel.MODEL_FILES))
+    args = parser.parse_args(argv)
+    manifest = load_or_create(args.manifest)
+    if args.command == "init":
+        for disease, model_path in linear_kernel.MODEL_FILES.items():
+            print(f"{disease}: {add_version(manifest, disease, model_path, args.manifest, {'source': model_path})}")
+    elif args.command == "publish":
+        for disease, version in publish_run(manifest, args.run_dir, args.manifest, not args.no_activate).items(): print(f"{disease}: {version}")
+    elif args.command == "list":
+        for disease, versions in manifest["versions"].items():
+            for version, entry in versions.items():
+                marker = "*" if manifest["active"].get(disease) == version else " "
+                print(f"{marker} {disease:<14} {version}  {entry['published_at']}  {entry.get('candidate', '')}  {entry.get('source', '')}")
+        return
+    elif args.command == "activate":
+        try: activate_version(manifest, args.disease, args.version)
+        except KeyError as e: parser.error(e.args[0])
+    elif args.command == "rollback":
+        try: print(f"{args.disease}: rolled back to {rollback_version(manifest, args.disease)}")
+        except ValueError as e: parser.error(str(e))
+    write_manifest(manifest, args.manifest)
+
+
+if __name__ == "__main__":
+    main()
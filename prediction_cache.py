@@ -0,0 +1,106 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Shared Prediction Cache
+# ----------------------------------------------------------------------
+# Re-submitted screening inputs (patient re-checks, staff retrying a
+# form) are answered from a process-wide LRU/TTL cache shared by every
+# Streamlit session, the batch path and the HTTP API.
+#
+# Keys are keyed BLAKE2b digests of (model version, normalized feature
+# vector) under a random per-process secret: no health values are kept
+# in the cache, and the key space cannot be enumerated offline to
+# recover them. Only the predicted class is stored.
+# ----------------------------------------------------------------------
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import metrics
+
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_TTL_SECONDS = 3600.0
+# Hashing costs ~1 us/row while a batch predict costs ~0.01 us/row, so large
+# uploads go straight to the model (and don't flush the LRU).
+DEFAULT_MAX_CACHED_ROWS = 1_000
+DECIMALS = 9 # "148", "148.0" and "148.0000000001" share one entry
+
+lookups = metrics.registry.counter("healthguard_prediction_cache_rows_total", "Rows looked up in the prediction cache by result (hit, miss, bypass).")
+evictions = metrics.registry.counter("healthguard_prediction_cache_evictions_total", "Entries dropped by reason (lru, ttl).")
+
+
+def model_version(model):
+    """Exported kernels carry their artifact version; a pickled fallback is versioned by object identity."""
+    return getattr(model, "version", None) or f"{type(model).__name__}@{id(model):x}"
+
+
+def normalize(X):
+    """float64 rows rounded to DECIMALS with -0.0 folded into 0.0."""
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1: X = X.reshape(1, -1)
+    return np.ascontiguousarray(np.round(X, DECIMALS) + 0.0)
+
+
+class PredictionCache:
+    """Thread-safe LRU + TTL map from hashed (model version, features) to the predicted class."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS, max_cached_rows=DEFAULT_MAX_CACHED_ROWS, secret=None, clock=time.monotonic):
+        self.max_entries = max_entries; self.ttl = ttl_seconds; self.max_cached_rows = max_cached_rows; self.clock = clock
+        self._secret = secret or os.urandom(32)
+        self.entries = OrderedDict(); self.lock = threading.Lock()
+        self.hits = 0; self.misses = 0; self.bypassed = 0
+
+    def _keys(self, version, X):
+        prefix = version.encode("utf-8") + b"\0"
+        return [hashlib.blake2b(prefix + row.tobytes(), key=self._secret, digest_size=16).digest() for row in X]
+
+    def predict(self, model, X):
+        """model.predict(X) with cached rows filled in; rows are normalized before both lookup and scoring."""
+        X = normalize(X)
+        if len(X) > self.max_cached_rows:
+            with self.lock: self.bypassed += len(X)
+            lookups.inc(len(X), result="bypass")
+            return np.asarray(model.predict(X))
+        keys = self._keys(model_version(model), X); now = self.clock()
+        results = [None] * len(X); missing = []; expired = 0
+        with self.lock:
+            for i, key in enumerate(keys):
+                entry = self.entries.get(key)
+                if entry is not None and entry[1] > now: self.entries.move_to_end(key); results[i] = entry[0]; continue
+                if entry is not None: del self.entries[key]; expired += 1
+                missing.append(i)
+            self.hits += len(X) - len(missing); self.misses += len(missing)
+        if expired: evictions.inc(expired, reason="ttl")
+        if len(X) - len(missing): lookups.inc(len(X) - len(missing), result="hit")
+        if missing:
+            lookups.inc(len(missing), result="miss")
+            predictions = np.asarray(model.predict(X[missing]))
+            self._store([keys[i] for i in missing], predictions.tolist(), now + self.ttl)
+            for i, value in zip(missing, predictions.tolist()): results[i] = value
+        return np.asarray(results)
+
+    def _store(self, keys, values, expires_at):
+        dropped = 0
+        with self.lock:
+            for key, value in zip(keys, values): self.entries[key] = (value, expires_at); self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries: self.entries.popitem(last=False); dropped += 1
+        if dropped: evictions.inc(dropped, reason="lru")
+
+    def clear(self):
+        with self.lock: self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            looked_up = self.hits + self.misses
+            return {"entries": len(self.entries), "max_entries": self.max_entries, "ttl_seconds": self.ttl, "hits": self.hits,
+                    "misses": self.misses, "bypassed_rows": self.bypassed, "hit_rate": self.hits / looked_up if looked_up else 0.0}
+
+
+shared_cache = PredictionCache()
+
+
+def predict(model, X):
+    """Scores through the process-wide cache."""
+    return shared_cache.predict(model, X)
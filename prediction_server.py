@@ -0,0 +1,232 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Headless Prediction Service (HTTP JSON API)
+# ----------------------------------------------------------------------
+# Loads the active models (model_registry.py) at startup and serves them
+# over plain HTTP/1.1 (keep-alive) on an asyncio event loop. Concurrent
+# requests for the same model are coalesced by a micro-batcher into a
+# single `predict` call. Newly activated versions are swapped in without
+# a restart; each batch is scored by whichever model is current.
+#
+#   python prediction_server.py --port 8600
+#   POST /predict/diabetes   {"Pregnancies": 6, "Glucose": 148, ...}
+#   POST /predict/heart      [{...}, {...}]
+#   POST /predict/parkinsons {"records": [{...}, {...}]}
+#   GET  /health
+#   GET  /metrics                              (Prometheus text, see metrics.py)
+#   GET  /drift                                (input drift summary, see drift_monitor.py)
+# Every scored batch is queued for the prediction audit log (audit_log.py)
+# and feeds the input drift monitor.
+# ----------------------------------------------------------------------
+import argparse
+import asyncio
+import functools
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import audit_log
+import batch_predict
+import drift_monitor
+import feature_schema
+import metrics
+import prediction_cache
+from model_registry import ModelRegistry
+
+# --- ENDPOINTS ---
+ENDPOINTS = {"diabetes": "Diabetes", "heart": "Heart Disease", "parkinsons": "Parkinsons"}
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_RECORDS_PER_REQUEST = 10_000
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def load_registry(shared_dir=None):
+    """Loads every active model up front and starts the hot-reload watcher."""
+    registry = ModelRegistry(preload=ENDPOINTS.values(), shared_dir=shared_dir)
+    missing = {disease: registry.errors.get(disease) for disease in ENDPOINTS.values() if disease not in registry.models}
+    if missing: raise SystemExit(f"Models failed to load: {missing}")
+    registry.start_watcher()
+    return registry
+
+
+# ----------------------------------------------------------------------
+# --- MICRO-BATCHING ---
+# ----------------------------------------------------------------------
+class MicroBatcher:
+    """Coalesces concurrent scoring requests for one model into a single `predict` call."""
+
+    def __init__(self, get_model, executor, max_batch_rows=4096, max_wait_ms=2.0, disease=None, audit=None, get_version=None):
+        self.get_model = get_model; self.get_version = get_version or (lambda: None); self.executor = executor; self.disease = disease; self.audit = audit
+        self.max_batch_rows = max_batch_rows; self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue(); self.task = None
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, rows):
+        """Queues a (n, features) matrix and waits for its n predictions."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.queue.get()]; n_rows = pending[0][0].shape[0]
+            deadline = loop.time() + self.max_wait
+            while n_rows < self.max_batch_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0: break
+                try: item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError: break
+                pending.append(item); n_rows += item[0].shape[0]
+            X = pending[0][0] if len(pending) == 1 else np.vstack([rows for rows, _ in pending])
+            try:
+                model = self.get_model(); version = self.get_version() # read together so the audit names the model that scored
+                with metrics.timer("predict", disease=self.disease, source="api"): predictions = await loop.run_in_executor(self.executor, prediction_cache.predict, model, X)
+                predictions = np.asarray(predictions).astype(int)
+                if self.audit is not None: self.audit.record(self.disease, version, X, predictions, "api") # enqueue only
+                drift_monitor.observe(self.disease, X)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done(): future.set_exception(e)
+                continue
+            start = 0
+            for rows, future in pending:
+                if not future.done(): future.set_result(predictions[start:start + rows.shape[0]].tolist())
+                start += rows.shape[0]
+
+
+# ----------------------------------------------------------------------
+# --- REQUEST HANDLING ---
+# ----------------------------------------------------------------------
+def parse_records(payload):
+    """Accepts a single record, a list of records or {"records": [...]}; returns (records, is_single)."""
+    if isinstance(payload, dict) and "records" in payload: payload = payload["records"]
+    if isinstance(payload, dict): return [payload], True
+    if isinstance(payload, list) and payload and all(isinstance(r, dict) for r in payload): return payload, False
+    raise ValueError("Body must be a JSON object, a non-empty array of objects, or {\"records\": [...]}")
+
+
+def validate_records(disease, records):
+    """Validates every record against the feature schema in one vectorized pass; returns (matrix, errors_by_index)."""
+    result = feature_schema.validate(disease, records)
+    if not result.ok: return None, result.errors()
+    return result.X, {}
+
+
+def format_result(prediction):
+    return {"prediction": prediction, "risk": batch_predict.RESULT_LABELS[prediction]}
+
+
+async def handle_predict(batchers, disease, body):
+    """Returns (status, response_dict) for one POST /predict/<disease>."""
+    try: records, is_single = parse_records(json.loads(body or b"null"))
+    except (ValueError, UnicodeDecodeError) as e: return 400, {"error": f"Invalid JSON body: {e}"}
+    if len(records) > MAX_RECORDS_PER_REQUEST: return 413, {"error": f"At most {MAX_RECORDS_PER_REQUEST} records per request"}
+    with metrics.timer("parse_input", disease=disease, source="api"): X, errors = validate_records(disease, records)
+    if errors:
+        return 400, {"error": "Validation failed", "errors": errors[0] if is_single else {str(i): e for i, e in errors.items()}}
+    predictions = await batchers[disease].submit(X)
+    if is_single: return 200, {"disease": disease, **format_result(predictions[0])}
+    return 200, {"disease": disease, "predictions": [format_result(p) for p in predictions]}
+
+
+async def route(batchers, method, path, body):
+    path = path.split("?", 1)[0].rstrip("/")
+    if path == "/health":
+        if method != "GET": return 405, {"error": "Use GET"}
+        return 200, {"status": "ok", "models": sorted(ENDPOINTS)}
+    if path == "/metrics":
+        if method != "GET": return 405, {"error": "Use GET"}
+        return 200, metrics.registry.exposition()
+    if path == "/drift":
+        if method != "GET": return 405, {"error": "Use GET"}
+        return 200, drift_monitor.monitor.summary()
+    if path.startswith("/predict/"):
+        disease = ENDPOINTS.get(path[len("/predict/"):])
+        if disease is None: return 404, {"error": f"Unknown model; use one of {sorted(ENDPOINTS)}"}
+        if method != "POST": return 405, {"error": "Use POST"}
+        with metrics.timer("api_request", disease=disease, source="api"): return await handle_predict(batchers, disease, body)
+    return 404, {"error": "Not found"}
+
+
+class LengthRequired(ValueError):
+    """A request body sent without Content-Length (e.g. Transfer-Encoding: chunked), which this server does not decode."""
+
+
+async def read_request(reader):
+    """Reads one HTTP/1.1 request; returns (method, path, headers, body) or None on EOF."""
+    request_line = await reader.readline()
+    if not request_line: return None
+    try: method, path, _version = request_line.decode("latin-1").split()
+    except ValueError: raise ValueError("Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""): break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "transfer-encoding" in headers: raise LengthRequired("Transfer-Encoding is not supported; send Content-Length")
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY_BYTES: raise OverflowError("Body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+def write_response(writer, status, payload, keep_alive):
+    """JSON for dict payloads; str payloads (the /metrics exposition) go out as text/plain."""
+    if isinstance(payload, str): body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else: body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode("latin-1") + body)
+
+
+async def handle_connection(batchers, reader, writer):
+    try:
+        while True:
+            try: request = await read_request(reader)
+            except LengthRequired as e: write_response(writer, 411, {"error": str(e)}, False); break
+            except OverflowError: write_response(writer, 413, {"error": "Body too large"}, False); break
+            except (ValueError, asyncio.IncompleteReadError): write_response(writer, 400, {"error": "Malformed request"}, False); break
+            if request is None: break
+            method, path, headers, body = request
+            keep_alive = headers.get("connection", "").lower() != "close"
+            try: status, payload = await route(batchers, method, path, body)
+            except Exception as e: status, payload = 500, {"error": f"Prediction failed: {e}"}
+            write_response(writer, status, payload, keep_alive)
+            await writer.drain()
+            if not keep_alive: break
+    except (ConnectionResetError, BrokenPipeError): pass
+    finally:
+        writer.close()
+        try: await writer.wait_closed()
+        except (ConnectionResetError, BrokenPipeError): pass
+
+
+async def serve(host, port, max_batch_rows, max_wait_ms, audit_path=audit_log.DEFAULT_PATH, shared_dir=None):
+    registry = load_registry(shared_dir); audit = audit_log.AuditLog(audit_path).start() if audit_path else None
+    executor = ThreadPoolExecutor(max_workers=len(ENDPOINTS), thread_name_prefix="predict")
+    batchers = {disease: MicroBatcher(functools.partial(registry.get, disease), executor, max_batch_rows, max_wait_ms, disease, audit, functools.partial(registry.version, disease)) for disease in ENDPOINTS.values()}
+    for batcher in batchers.values(): batcher.start()
+    server = await asyncio.start_server(lambda r, w: handle_connection(batchers, r, w), host, port)
+    print(f"HealthGuard prediction service listening on http://{host}:{port}")
+    async with server: await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless HealthGuard prediction service.")
+    parser.add_argument("--host", default="127.0.0.1"); parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--max-batch-rows", type=int, default=4096, help="Upper bound on rows coalesced into one predict call")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="How long the batcher waits to fill a batch")
+    parser.add_argument("--audit-log", default=audit_log.DEFAULT_PATH, help="SQLite prediction log ('' to disable)")
+    parser.add_argument("--shared-dir", default=os.environ.get("HEALTHGUARD_SHARED_DIR"), help="Map model arrays from bundles here, shared with other workers (e.g. /dev/shm/healthguard)")
+    args = parser.parse_args(argv)
+    try: asyncio.run(serve(args.host, args.port, args.max_batch_rows, args.max_wait_ms, args.audit_log, args.shared_dir))
+    except KeyboardInterrupt: pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Pre-rendered Sanjeevani Remedy Fragments
+# ----------------------------------------------------------------------
+# Advice output depends only on (disease, severity, age_group), so each
+# expander's Markdown is built once and kept in a process-wide LRU cache.
+# Consecutive Markdown pieces are merged, leaving one st.markdown call
+# per expander (plus any st.warning boxes) instead of one per line.
+# ----------------------------------------------------------------------
+import threading
+from collections import OrderedDict
+
+YOGA_TITLE = "🧘 Yoga Asanas"
+PRANAYAMA_TITLE = "🌬️ Pranayama (Breathing Exercises)"
+DIET_TITLE = "🍎 Dietary Guidelines"
+NATUROPATHY_TITLE = "💧 Naturopathy & Lifestyle"
+AYURVEDA_TITLE = "🌿 Ayurvedic Considerations"
+PROTIPS_TITLE = "💡 Pro-Tips & Extra Steps"
+AYURVEDA_ADVISORY = """**Important Health Advisory:** ... consult ... **Patanjali Chikitsalaya or Megastore** ..."""
+
+
+class _Section:
+    """Collects ("markdown" | "warning", text) parts, merging adjacent Markdown into one block."""
+
+    def __init__(self, title):
+        self.title = title; self.parts = []
+
+    def markdown(self, text):
+        if self.parts and self.parts[-1][0] == "markdown": self.parts[-1] = ("markdown", self.parts[-1][1] + "\n\n" + text)
+        else: self.parts.append(("markdown", text))
+
+    def warning(self, text):
+        self.parts.append(("warning", text))
+
+    def freeze(self):
+        return (self.title, tuple(self.parts))
+
+
+def _steps_markdown(steps):
+    return "**How:**\n" + "\n".join([f"  {i+1}. {s.strip()}" for i, s in enumerate(steps)])
+
+
+def _yoga(yoga_info):
+    section = _Section(YOGA_TITLE)
+    if any(k not in ["notes", "frequency", "steps_note"] for k in yoga_info): # Check if there's more than notes
+        asana_count = 0
+        for asana_name, details in yoga_info.items():
+            if asana_name not in ["pranayama", "frequency", "notes", "how_to_do", "steps_note"]:
+                section.markdown(f"**{asana_name}**")
+                if isinstance(details, dict) and details.get("steps"):
+                    section.markdown(_steps_markdown(details["steps"]))
+                    if details.get("duration"): section.markdown(f"  **Duration:** {details['duration']}")
+                    if details.get("frequency"): section.markdown(f"  **Frequency:** {details['frequency']}")
+                    section.markdown("---")
+                asana_count += 1
+        if yoga_info.get("steps_note"): section.markdown(f"**Asana Notes:** {yoga_info['steps_note']}")
+        if yoga_info.get("notes") and not yoga_info.get("steps_note"): section.markdown(f"**Notes:** {yoga_info['notes']}")
+        if yoga_info.get("frequency") and asana_count > 0: section.markdown(f"**Overall Frequency:** {yoga_info['frequency']}")
+    elif yoga_info.get("notes"): section.markdown(f"{yoga_info['notes']}") # Only notes exist
+    return section
+
+
+def _pranayama(pranayama_info):
+    section = _Section(PRANAYAMA_TITLE)
+    if any(k != "notes" for k in pranayama_info):
+        for pranayama_name, details in pranayama_info.items():
+            if pranayama_name != "notes":
+                section.markdown(f"**{pranayama_name}**")
+                if isinstance(details, dict) and details.get("steps"):
+                    section.markdown(_steps_markdown(details["steps"]))
+                    if details.get("duration"): section.markdown(f"  **Duration:** {details['duration']}")
+                    if details.get("frequency"): section.markdown(f"  **Frequency:** {details['frequency']}")
+                    if details.get("avoid"): section.markdown(f"  **Avoid If:** {details['avoid']}")
+                    section.markdown("---")
+                elif isinstance(details, list): section.markdown(", ".join(details)) # Fallback
+        if pranayama_info.get("notes"): section.markdown(f"**Notes:** {pranayama_info['notes']}")
+    elif pranayama_info.get("notes"): section.markdown(f"{pranayama_info['notes']}")
+    return section
+
+
+def _diet(diet_info):
+    section = _Section(DIET_TITLE)
+    if any(k != "notes" for k in diet_info):
+        if diet_info.get("breakfast"): section.markdown("**Breakfast:** " + ", ".join(diet_info["breakfast"]))
+        if diet_info.get("lunch"): section.markdown("**Lunch:** " + ", ".join(diet_info["lunch"]))
+        if diet_info.get("weekly_fasting_suggestion"): section.warning(f"**Fasting:** {diet_info['weekly_fasting_suggestion']}")
+        if diet_info.get("timing_notes"): section.markdown(f"**Timing/Notes:** {diet_info['timing_notes']}")
+        if diet_info.get("notes") and not diet_info.get("timing_notes"): section.markdown(f"**Notes:** {diet_info['notes']}")
+    elif diet_info.get("notes"): section.markdown(f"{diet_info['notes']}")
+    return section
+
+
+def _naturopathy(natu_info):
+    section = _Section(NATUROPATHY_TITLE)
+    if any(k != "notes" for k in natu_info):
+        displayed_practices = False
+        if natu_info.get("notes"): section.markdown(f"**Overall Notes:** {natu_info['notes']}")
+        if not displayed_practices and natu_info.get("notes"): section.markdown(f"**Notes:** {natu_info['notes']}")
+    elif natu_info.get("notes"): section.markdown(f"{natu_info['notes']}")
+    return section
+
+
+def _ayurveda(ayur_info):
+    section = _Section(AYURVEDA_TITLE)
+    if any(k != "notes" for k in ayur_info):
+        if ayur_info.get("lifestyle_principles"): section.markdown("**Lifestyle:** " + ", ".join(ayur_info["lifestyle_principles"]))
+        if ayur_info.get("herbs_decoctions"): section.warning(AYURVEDA_ADVISORY)
+        if ayur_info.get("notes"): section.markdown(f"**Notes:** {ayur_info['notes']}")
+    elif ayur_info.get("notes"): section.markdown(f"{ayur_info['notes']}")
+    return section
+
+
+def _protips(tips_info):
+    section = _Section(PROTIPS_TITLE)
+    if any(k != "notes" for k in tips_info):
+        if tips_info.get("lifestyle"): section.markdown("**Lifestyle/Extra Steps:**\n" + "\n".join([f"- {item}" for item in tips_info["lifestyle"]]))
+        if tips_info.get("notes"): section.markdown(f"**Notes:** {tips_info['notes']}")
+    elif tips_info.get("notes"): section.markdown(f"{tips_info['notes']}")
+    return section
+
+
+SECTION_RENDERERS = [("Yoga", _yoga), ("Pranayama", _pranayama), ("Diet", _diet), ("Naturopathy", _naturopathy), ("Ayurveda", _ayurveda), ("ProTips", _protips)]
+
+
+def render_advice(advice):
+    """Builds ((expander_title, parts), ...) for one resolved advice entry; empty sections are dropped."""
+    sections = []
+    for key, renderer in SECTION_RENDERERS:
+        info = advice.get(key, {})
+        if info and isinstance(info, dict):
+            section = renderer(info)
+            if section.parts: sections.append(section.freeze())
+    return tuple(sections)
+
+
+# ----------------------------------------------------------------------
+# --- LRU FRAGMENT CACHE ---
+# ----------------------------------------------------------------------
+class FragmentCache:
+    """Thread-safe LRU of rendered fragments keyed by (store checksum, disease, severity, age_group)."""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize; self.entries = OrderedDict(); self.lock = threading.Lock()
+        self.hits = 0; self.misses = 0
+
+    def get(self, key, build):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key); self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        value = build() # built outside the lock; a concurrent duplicate build is harmless
+        with self.lock:
+            self.entries[key] = value; self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize: self.entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self.lock: return {"size": len(self.entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+fragment_cache = FragmentCache()
+
+
+def get_fragments(store, disease, severity, age_group):
+    """Cached (found_level, sections) for a triple; sections is None when no advice exists."""
+    def build():
+        advice, found_level = store.resolve(disease, severity, age_group)
+        return found_level, (render_advice(advice) if advice else None)
+    return fragment_cache.get((store.checksum, disease, severity, age_group), build)
@@ -0,0 +1,73 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Compiled Sanjeevani Remedy Store
+# ----------------------------------------------------------------------
+# The remedy content lives in resources/sanjeevani.json. It is compiled
+# into a table with the resolved entry and fallback label for every
+# (disease, severity, age_group) triple, so advice lookup is one dict hit.
+# A disease's triples are compiled the first time that disease is asked
+# for, so a page only pays for its own subtree.
+# ----------------------------------------------------------------------
+import hashlib
+import json
+import threading
+
+REMEDY_FORMAT_VERSION = 1
+SEVERITIES = ["Mild", "Moderate", "Severe"]
+AGE_GROUPS = ["Young", "Adult", "Senior"]
+
+
+def load_remedy_data(path):
+    """Reads the versioned remedy file; returns (version, checksum, {disease: {severity: {age_group: advice}}})."""
+    with open(path, "rb") as file: raw = file.read()
+    content = json.loads(raw.decode("utf-8"))
+    version = content.get("version")
+    if version != REMEDY_FORMAT_VERSION: raise ValueError(f"Unsupported remedy file version {version} in {path}")
+    return version, hashlib.sha256(raw).hexdigest()[:16], content["remedies"]
+
+
+def lookup_order(severity, age_group):
+    """Fallback chain: requested level first, then Adult, then milder levels."""
+    order = [(severity, age_group), (severity, "Adult")]
+    if severity == "Severe": order.extend([("Moderate", age_group), ("Moderate", "Adult"), ("Mild", age_group), ("Mild", "Adult")])
+    elif severity == "Moderate": order.extend([("Mild", age_group), ("Mild", "Adult")])
+    return order
+
+
+def _has_content(advice):
+    """True if the entry has more than notes (a non-empty section dict/list)."""
+    return any(k != "notes" and isinstance(advice[k], (dict, list)) and advice[k] for k in advice)
+
+
+def resolve_advice(disease_data, severity, age_group):
+    """Walks the fallback chain; returns (advice, "Severity / AgeGroup") or (None, None)."""
+    advice = None; found_level = None
+    for sev, age_g in lookup_order(severity, age_group):
+        candidate = disease_data.get(sev, {}).get(age_g)
+        if candidate and _has_content(candidate): return candidate, f"{sev} / {age_g}"
+        if candidate and not advice: advice = candidate; found_level = f"{sev} / {age_g}" # Keep first found advice even if minimal
+    return advice, found_level
+
+
+class RemedyStore:
+    """(disease, severity, age_group) -> (advice, found_level) table, compiled per disease on first use."""
+
+    def __init__(self, remedies, version=REMEDY_FORMAT_VERSION, checksum=""):
+        self.version = version; self.checksum = checksum
+        self.remedies = remedies; self.diseases = list(remedies)
+        self.table = {}; self.compiled = set(); self._lock = threading.Lock()
+
+    def _compile(self, disease):
+        with self._lock:
+            if disease in self.compiled: return
+            self.table.update({(disease, severity, age_group): resolve_advice(self.remedies[disease], severity, age_group)
+                               for severity in SEVERITIES for age_group in AGE_GROUPS})
+            self.compiled.add(disease)
+
+    def resolve(self, disease, severity, age_group):
+        if disease not in self.compiled and disease in self.remedies: self._compile(disease)
+        return self.table.get((disease, severity, age_group), (None, None))
+
+
+def load_remedy_store(path):
+    version, checksum, remedies = load_remedy_data(path)
+    return RemedyStore(remedies, version, checksum)
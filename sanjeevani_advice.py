@@ -0,0 +1,79 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Sanjeevani Advice Section
+# ----------------------------------------------------------------------
+# Renders the Sanjeevani holistic remedy companion below a prediction:
+# age group and severity resolution, the compiled remedy store (loaded
+# once per process) and the pre-rendered, LRU-cached fragments. Shared by
+# app.py and benchmark.py.
+#
+#   HEALTHGUARD_STATIC_URL   CDN base for static/ (CSS linked instead of inlined)
+# ----------------------------------------------------------------------
+import os
+
+import streamlit as st
+
+import metrics
+import remedy_render
+import remedy_store
+import static_assets
+
+STATIC_URL = os.environ.get("HEALTHGUARD_STATIC_URL") # set when static/ is served with real content types, so CSS can be linked
+
+# ----------------------------------------------------------------------
+# --- SANJEEVANI REMEDY DATA (resources/sanjeevani.json - VERIFY & REPLACE REMAINING PLACEHOLDERS) ---
+# ----------------------------------------------------------------------
+REMEDY_DATA_PATH = 'resources/sanjeevani.json'
+
+@st.cache_resource
+def load_remedies(path=REMEDY_DATA_PATH):
+    """Compiles the remedy file once per process into a (disease, severity, age_group) lookup table. Handles errors."""
+    try: return remedy_store.load_remedy_store(path)
+    except Exception as e: st.error(f"Error loading remedy data {path}: {e}"); return None
+# --- END OF SANJEEVANI DATA ---
+
+def advice_age_group(age_str):
+    """Young (<18) / Adult / Senior (60+) as used for Sanjeevani advice; None if the age is missing or invalid."""
+    if age_str is None or not str(age_str).isdigit(): return None
+    user_age = int(age_str)
+    return "Young" if user_age < 18 else "Senior" if user_age >= 60 else "Adult"
+
+@st.cache_data
+def apply_sanjeevani_styling():
+    """Sanjeevani section CSS; injected only on reruns that actually show advice."""
+    st.markdown(static_assets.style_html("sanjeevani.css", STATIC_URL or static_assets.STATIC_URL, link=bool(STATIC_URL)), unsafe_allow_html=True)
+
+# ----------------------------------------------------------------------
+# --- FUNCTION TO DISPLAY SANJEEVANI ADVICE (Updated Formatting) ---
+# ----------------------------------------------------------------------
+@metrics.timed("sanjeevani_advice")
+def display_sanjeevani_advice(disease, age_str, severity_str, heading=None):
+    """Retrieves and displays holistic advice based on disease, severity, and age."""
+    apply_sanjeevani_styling()
+    st.markdown("---"); st.markdown("<div class='sanjeevani-section'>", unsafe_allow_html=True)
+    st.subheader(f"🌿 Sanjeevani Holistic Remedy Companion{f' — {heading}' if heading else ''}")
+    st.caption("_Note: Guidance is illustrative & based on general principles/user input. Severity is subjective. Consult qualified professionals._")
+
+    # Determine age group logic...
+    age_group = advice_age_group(age_str)
+    if age_group is None: age_group = "Adult"; st.warning("Age input missing/invalid; using Adult age group for advice.")
+    # Determine severity logic...
+    valid_severities = ["Mild", "Moderate", "Severe"]; severity = severity_str.strip().capitalize()
+    if severity not in valid_severities: severity = "Moderate"; st.warning("Invalid severity; defaulting to Moderate.")
+    # Prioritized Lookup (fallback chain precomputed in the compiled store; fragments pre-rendered & LRU cached)...
+    remedies = load_remedies()
+    found_level, sections = remedy_render.get_fragments(remedies, disease, severity, age_group) if remedies else (None, None)
+
+    # --- Display Section (one expander per section, pre-built Markdown) ---
+    if sections is not None:
+        original_request = f"{severity} / {age_group}";
+        if found_level and found_level != original_request: st.caption(f"_Showing guidance for {found_level} as specific advice for {original_request} wasn't available._")
+        for title, parts in sections:
+            with st.expander(title, expanded=False):
+                for kind, text in parts:
+                    if kind == "warning": st.warning(text)
+                    else: st.markdown(text)
+
+    else: # No advice found
+        st.info(f"No specific holistic remedy information currently available for {disease} / {severity} / {age_group}.")
+
+    st.markdown("</div>", unsafe_allow_html=True) # Close custom div
@@ -0,0 +1,107 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Memory-Mapped Array Bundles (shared by worker processes)
+# ----------------------------------------------------------------------
+# A bundle is one file: a small JSON header (metadata + dtype/shape/
+# offset per array) followed by the raw, 64-byte aligned array data.
+# Opening it maps the file read-only and returns NumPy views into the
+# mapping: nothing is parsed or copied, and every process that maps the
+# same file shares the same physical pages. Put the directory on tmpfs
+# (/dev/shm/...) to keep them in RAM; any directory works, then they are
+# shared through the page cache.
+#
+# shared_bundle() builds a missing bundle once (atomic rename, so racing
+# workers never see a partial file) and maps it. Bundles are named
+# <family>-<version> (kernel-diabetes-<sha>, doctors-diabetes-<sha>), so
+# a new model or registry gets a new bundle; writing one deletes all but
+# the KEEP_VERSIONS most recently used of its family. Processes that
+# still map a deleted bundle keep its pages until they unmap it.
+#
+#   python shared_arrays.py /dev/shm/healthguard      # list bundles
+# ----------------------------------------------------------------------
+import json
+import os
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+MAGIC = b"HGARRAY1"
+ALIGN = 64
+SUFFIX = ".hga"
+KEEP_VERSIONS = 2 # current + previous per family (a rollback maps the previous one without rebuilding)
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_bundle(path, arrays, meta=None):
+    """Writes {name: array} (numeric or fixed-width str dtypes) + JSON-able `meta` to `path` atomically."""
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    for name, array in arrays.items():
+        if array.dtype.hasobject: raise TypeError(f"Array {name!r} has dtype object; bundles hold plain data only")
+    entries, offset = {}, 0
+    for name, array in arrays.items():
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}; offset = _aligned(offset + array.nbytes)
+    header = json.dumps({"meta": meta or {}, "arrays": entries}).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(MAGIC); file.write(struct.pack("<Q", len(header))); file.write(header)
+            for name, array in arrays.items():
+                file.seek(data_start + entries[name]["offset"]); file.write(array.tobytes())
+            file.truncate(max(data_start + offset, file.tell()))
+        os.chmod(tmp, 0o644); os.replace(tmp, path) # mkstemp creates 0600; workers may run as other users
+    except BaseException:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+    return path
+
+
+def open_bundle(path):
+    """({name: read-only array view into the mapping}, meta)."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC: raise ValueError(f"{path} is not an array bundle")
+        (header_size,) = struct.unpack("<Q", file.read(8)); header = json.loads(file.read(header_size))
+    data_start = _aligned(len(MAGIC) + 8 + header_size)
+    mapping = np.memmap(path, dtype=np.uint8, mode="r")
+    arrays = {name: np.ndarray(tuple(entry["shape"]), dtype=np.dtype(entry["dtype"]), buffer=mapping, offset=data_start + entry["offset"])
+              for name, entry in header["arrays"].items()}
+    return arrays, header["meta"]
+
+
+def prune_bundles(directory, family, keep=KEEP_VERSIONS):
+    """Deletes all but the `keep` most recently used (mapped or written) <family>-<version> bundles in directory; returns the removed names."""
+    found = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(SUFFIX) and entry.name[:-len(SUFFIX)].rsplit("-", 1)[0] == family:
+            try: found.append((entry.stat().st_mtime_ns, entry.name))
+            except FileNotFoundError: pass # pruned by another worker
+    removed = []
+    for _mtime, name in sorted(found, reverse=True)[keep:]:
+        try: os.remove(os.path.join(directory, name)); removed.append(name)
+        except FileNotFoundError: pass
+    return removed
+
+
+def shared_bundle(directory, name, build):
+    """Maps directory/name (<family>-<version>), first writing it from `build()` -> (arrays, meta) if no process has yet."""
+    path = os.path.join(directory, name + SUFFIX)
+    try: os.utime(path) # mark as in use, so pruning keeps it while it is served (e.g. after a rollback)
+    except FileNotFoundError:
+        os.makedirs(directory, exist_ok=True)
+        write_bundle(path, *build())
+        prune_bundles(directory, name.rsplit("-", 1)[0])
+    return open_bundle(path)
+
+
+if __name__ == "__main__":
+    for directory in sys.argv[1:]:
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(SUFFIX): continue
+            arrays, meta = open_bundle(os.path.join(directory, name))
+            print(f"{name}: {os.path.getsize(os.path.join(directory, name)):,} bytes, "
+                  + ", ".join(f"{k} {v.dtype}{list(v.shape)}" for k, v in arrays.items()) + f"  {meta}")
@@ -0,0 +1,169 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Static Asset Build (background image & page CSS)
+# ----------------------------------------------------------------------
+# Build step for the bytes a first visit has to download. nature.png
+# (2.4 MB) becomes resized WebP + JPEG variants; resources/css/*.css are
+# minified. Every output file is named by its content hash and listed in
+# static/assets.json. Streamlit serves static/ at app/static/ when
+# server.enableStaticServing is on (.streamlit/config.toml); a ?v=<hash>
+# query makes it send a 10-year Cache-Control, so browsers fetch each
+# variant once and reruns only carry a small <style> block.
+#
+# Streamlit serves non-image static files as text/plain (nosniff), which
+# browsers refuse as stylesheets, so the minified CSS is inlined unless
+# HEALTHGUARD_STATIC_URL points at a server/CDN with proper types, in
+# which case the page @imports the hashed file instead.
+#
+#   python static_assets.py build     # -> static/*, static/assets.json
+# ----------------------------------------------------------------------
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+
+SOURCE_DIR = "resources/css"
+STATIC_DIR = "static"
+MANIFEST_PATH = "static/assets.json"
+STATIC_URL = "app/static" # Streamlit's static route, relative to the app URL
+STYLESHEETS = ["app.css", "sanjeevani.css"]
+BACKGROUND_SOURCE = "nature.png"
+BACKGROUND_SELECTOR = '[data-testid="stAppViewContainer"] > .main'
+BACKGROUND_WIDTHS = [768, 1536] # a variant is used on viewports up to its width (phones get 768)
+WEBP_QUALITY = 78
+JPEG_QUALITY = 80
+MANIFEST_FORMAT_VERSION = 1
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def minify_css(text):
+    """Drops comments and whitespace the parser ignores (the stylesheets have no strings needing protection)."""
+    text = re.sub(r"/\*.*?\*/", "", text, flags=re.S)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+    text = re.sub(r":\s+", ":", text)
+    return text.replace(";}", "}").strip()
+
+
+def _write_hashed(data, stem, suffix, static_dir):
+    """Writes `data` as <stem>.<hash><suffix>; returns (file name, hash)."""
+    digest = content_hash(data); name = f"{stem}.{digest}{suffix}"
+    with open(os.path.join(static_dir, name), "wb") as file: file.write(data)
+    return name, digest
+
+
+# ----------------------------------------------------------------------
+# --- BUILD ---
+# ----------------------------------------------------------------------
+def build_background(source=BACKGROUND_SOURCE, static_dir=STATIC_DIR, widths=BACKGROUND_WIDTHS):
+    """Resized WebP (+ progressive JPEG fallback) per width, never upscaled; returns the manifest entry."""
+    from PIL import Image # build-time only (Pillow ships with Streamlit)
+    stem = os.path.splitext(os.path.basename(source))[0]; variants = []
+    with Image.open(source) as image:
+        image = image.convert("RGB")
+        for width in sorted({min(w, image.width) for w in widths}):
+            resized = image if width == image.width else image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            variant = {"width": resized.width, "height": resized.height}
+            for fmt, suffix, options in (("WEBP", ".webp", {"quality": WEBP_QUALITY, "method": 6}),
+                                         ("JPEG", ".jpg", {"quality": JPEG_QUALITY, "optimize": True, "progressive": True})):
+                buffer = io.BytesIO(); resized.save(buffer, fmt, **options)
+                name, digest = _write_hashed(buffer.getvalue(), f"{stem}-{width}", suffix, static_dir)
+                variant[fmt.lower()] = {"file": name, "hash": digest, "bytes": buffer.tell()}
+            variants.append(variant)
+    return {"source": source, "source_bytes": os.path.getsize(source), "variants": variants}
+
+
+def build_stylesheet(name, source_dir=SOURCE_DIR, static_dir=STATIC_DIR):
+    with open(os.path.join(source_dir, name), encoding="utf-8") as file: source = file.read()
+    data = minify_css(source).encode("utf-8")
+    file_name, digest = _write_hashed(data, os.path.splitext(name)[0], ".css", static_dir)
+    return {"file": file_name, "hash": digest, "bytes": len(data), "source_bytes": len(source.encode("utf-8"))}
+
+
+def build(source_dir=SOURCE_DIR, static_dir=STATIC_DIR, background=BACKGROUND_SOURCE):
+    """Builds every asset into static/, writes the manifest and removes files only the previous build referenced."""
+    os.makedirs(static_dir, exist_ok=True)
+    manifest_path = os.path.join(static_dir, os.path.basename(MANIFEST_PATH))
+    previous = _files(read_manifest(manifest_path) or {})
+    manifest = {"format": MANIFEST_FORMAT_VERSION, "stylesheets": {name: build_stylesheet(name, source_dir, static_dir) for name in STYLESHEETS},
+                "background": build_background(background, static_dir)}
+    with open(manifest_path, "w", encoding="utf-8") as file: json.dump(manifest, file, indent=2); file.write("\n")
+    for name in previous - _files(manifest):
+        try: os.remove(os.path.join(static_dir, name))
+        except FileNotFoundError: pass
+    return manifest
+
+
+def _files(manifest):
+    files = {entry["file"] for entry in manifest.get("stylesheets", {}).values()}
+    for variant in manifest.get("background", {}).get("variants", []): files.update(variant[fmt]["file"] for fmt in ("webp", "jpeg"))
+    return files
+
+
+# ----------------------------------------------------------------------
+# --- SERVING (app.py) ---
+# ----------------------------------------------------------------------
+def read_manifest(path=MANIFEST_PATH):
+    """The build manifest, or None if static_assets.py build has not been run."""
+    try:
+        with open(path, encoding="utf-8") as file: manifest = json.load(file)
+    except FileNotFoundError: return None
+    return manifest if manifest.get("format") == MANIFEST_FORMAT_VERSION else None
+
+
+_manifest = None
+
+def load_manifest(path=MANIFEST_PATH):
+    """Process-wide copy of the manifest ({} when not built: source CSS is minified at runtime, no background image)."""
+    global _manifest
+    if _manifest is None:
+        _manifest = read_manifest(path)
+        if _manifest is None: print(f"Static assets: {path} not found; run 'python static_assets.py build' for the background image and hashed CSS"); _manifest = {}
+    return _manifest
+
+
+def _url(base_url, entry):
+    return f'url("{base_url}/{entry["file"]}?v={entry["hash"]}")'
+
+
+def background_css(background, base_url=STATIC_URL):
+    """background-image rules: WebP via image-set() with a JPEG fallback; each smaller variant overrides on viewports up to its width."""
+    rules = []; variants = sorted(background["variants"], key=lambda v: -v["width"])
+    for i, variant in enumerate(variants):
+        jpeg, webp = _url(base_url, variant["jpeg"]), _url(base_url, variant["webp"])
+        rule = f'{BACKGROUND_SELECTOR}{{background-image:{jpeg};background-image:image-set({webp} type("image/webp"),{jpeg} type("image/jpeg"))}}'
+        rules.append(rule if i == 0 else f"@media (max-width:{variant['width']}px){{{rule}}}")
+    return "".join(rules)
+
+
+def style_html(name, base_url=STATIC_URL, link=False, background=False, source_dir=SOURCE_DIR, static_dir=STATIC_DIR):
+    """<style> block for one stylesheet: the built file inlined (or @imported with `link`), the minified source if not built."""
+    manifest = load_manifest(); entry = manifest.get("stylesheets", {}).get(name)
+    if entry and link: css = f'@import {_url(base_url, entry)};'
+    else:
+        path = os.path.join(static_dir, entry["file"]) if entry else os.path.join(source_dir, name)
+        with open(path, encoding="utf-8") as file: css = file.read() if entry else minify_css(file.read())
+    if background and manifest.get("background"): css += background_css(manifest["background"], base_url)
+    return f"<style>{css}</style>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the HealthGuard static assets (hashed image variants and minified CSS).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_cmd = commands.add_parser("build"); build_cmd.add_argument("--static-dir", default=STATIC_DIR)
+    args = parser.parse_args(argv)
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # resources/ and nature.png are relative paths
+    manifest = build(static_dir=args.static_dir)
+    for name, entry in manifest["stylesheets"].items(): print(f"{name}: {entry['source_bytes']:,} -> {entry['bytes']:,} bytes  {entry['file']}")
+    background = manifest["background"]
+    for variant in background["variants"]:
+        print(f"{background['source']} ({background['source_bytes']:,} bytes) @ {variant['width']}x{variant['height']}: "
+              f"webp {variant['webp']['bytes']:,}, jpeg {variant['jpeg']['bytes']:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
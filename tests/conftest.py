@@ -0,0 +1,19 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Test Setup
+# ----------------------------------------------------------------------
+# The app's modules live flat at the repository root and open their data
+# files (resources/, saved_models/) by relative path; make both work
+# however pytest is invoked (python -m pytest, pytest tests/, an IDE runner).
+# ----------------------------------------------------------------------
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path: sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def repo_cwd(monkeypatch):
+    monkeypatch.chdir(ROOT)
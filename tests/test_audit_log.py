@@ -0,0 +1,38 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Prediction Audit Log Queue Tests
+# ----------------------------------------------------------------------
+# Queueing without a writer thread: inputs are split by batch_rows and a
+# non-blocking caller loses only the rows over max_pending_rows.
+# ----------------------------------------------------------------------
+import numpy as np
+
+import audit_log
+
+
+def record(log, n, **kwargs):
+    return log.record("Diabetes", "v1", np.ones((n, 8)), np.zeros(n), "test", **kwargs)
+
+
+def test_large_input_is_queued_in_batches(tmp_path):
+    log = audit_log.AuditLog(str(tmp_path / "a.sqlite3"), max_pending_rows=1000, batch_rows=100)
+    assert record(log, 950)
+    assert [len(X) for _meta, X, _p in log.pending] == [100] * 9 + [50] and log.stats()["dropped"] == 0
+
+
+def test_non_blocking_input_over_the_limit_keeps_what_fits(tmp_path):
+    log = audit_log.AuditLog(str(tmp_path / "a.sqlite3"), max_pending_rows=1000, batch_rows=300)
+    assert not record(log, 2500) # more than the whole queue, into an empty queue
+    assert log.pending_rows == 1000 and log.stats()["dropped"] == 1500
+    assert not record(log, 10) and log.stats()["dropped"] == 1510
+
+
+def test_closed_log_drops_everything(tmp_path):
+    log = audit_log.AuditLog(str(tmp_path / "a.sqlite3")); log.close()
+    assert not record(log, 5, block=True) and log.pending_rows == 0 and log.stats()["dropped"] == 5
+
+
+def test_blocking_caller_waits_for_the_writer(tmp_path):
+    log = audit_log.AuditLog(str(tmp_path / "a.sqlite3"), max_pending_rows=50, batch_rows=20, flush_seconds=0.01).start()
+    assert record(log, 500, block=True)
+    log.close(timeout=None)
+    assert log.stats()["written"] == 500 and len(audit_log.read_frame(log.path)) == 500
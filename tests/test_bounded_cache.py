@@ -0,0 +1,91 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Bounded Cache Tests
+# ----------------------------------------------------------------------
+# LRU eviction by bytes and by entries, oversize values, TTL expiry (with
+# an injected clock) and generation-based invalidation of BoundedCache.
+# ----------------------------------------------------------------------
+import pytest
+
+from bounded_cache import BoundedCache
+
+
+class Clock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+
+def fill(cache, *keys, size=10):
+    for key in keys: cache.get(key, lambda: key.upper(), size_of=lambda _value: size)
+
+
+def cached_keys(cache):
+    return list(cache.entries)
+
+
+def test_hit_does_not_rebuild():
+    cache = BoundedCache("test", max_bytes=100); builds = []
+    build = lambda: builds.append(1) or "value"
+    assert cache.get("a", build) == "value" and cache.get("a", build) == "value"
+    assert len(builds) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = BoundedCache("test", max_bytes=100)
+    fill(cache, "a", "b", size=40); fill(cache, "a", size=40) # hit: "a" becomes most recent
+    fill(cache, "c", size=40)
+    assert cached_keys(cache) == ["a", "c"]
+    assert cache.bytes == 80 and cache.evicted["lru"] == 1
+
+
+def test_one_large_entry_evicts_several_small_ones():
+    cache = BoundedCache("test", max_bytes=100)
+    fill(cache, "a", "b", "c", size=30); fill(cache, "d", size=70)
+    assert cached_keys(cache) == ["c", "d"] and cache.bytes == 100
+
+
+def test_evicts_least_recently_used_by_entries():
+    cache = BoundedCache("test", max_bytes=10_000, max_entries=3)
+    fill(cache, "a", "b", "c", "b", "d")
+    assert cached_keys(cache) == ["c", "b", "d"] and cache.evicted["lru"] == 1
+
+
+def test_oversize_value_is_returned_but_not_kept():
+    cache = BoundedCache("test", max_bytes=100); fill(cache, "a")
+    assert cache.get("big", lambda: "BIG", size_of=lambda _value: 101) == "BIG"
+    assert cached_keys(cache) == ["a"] and cache.evicted["oversize"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock(); cache = BoundedCache("test", max_bytes=100, ttl_seconds=30, clock=clock); builds = []
+    build = lambda: builds.append(1) or "value"
+    cache.get("a", build); clock.now += 29.9; cache.get("a", build)
+    assert len(builds) == 1
+    clock.now += 0.1; cache.get("a", build)
+    assert len(builds) == 2 and cache.evicted["ttl"] == 1 and len(cache.entries) == 1
+
+
+@pytest.mark.parametrize("ttl", [None, 0])
+def test_no_ttl_never_expires(ttl):
+    clock = Clock(); cache = BoundedCache("test", max_bytes=100, ttl_seconds=ttl, clock=clock)
+    fill(cache, "a"); clock.now += 10 ** 9; fill(cache, "a")
+    assert cache.stats()["hits"] == 1
+
+
+def test_set_generation_drops_entries():
+    cache = BoundedCache("test", max_bytes=100)
+    cache.set_generation("v1"); fill(cache, "a", "b")
+    cache.set_generation("v1")
+    assert cached_keys(cache) == ["a", "b"]
+    cache.set_generation("v2")
+    assert cached_keys(cache) == [] and cache.bytes == 0 and cache.evicted["invalidated"] == 2
+    assert cache.stats()["generation"] == "v2"
+
+
+def test_value_built_under_an_old_generation_is_not_stored():
+    cache = BoundedCache("test", max_bytes=100); cache.set_generation("v1")
+    def build():
+        cache.set_generation("v2") # e.g. the registry file changed while building
+        return "stale"
+    assert cache.get("a", build) == "stale"
+    assert cached_keys(cache) == []
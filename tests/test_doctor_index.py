@@ -0,0 +1,48 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Doctor Index Tests
+# ----------------------------------------------------------------------
+# query_ids against a brute-force reference (every provider's exact
+# distance, full sort): same ids and order, including ties at the top_k
+# cut, which the partial selection must break by registry order.
+# ----------------------------------------------------------------------
+import numpy as np
+import pytest
+
+import geo_distance
+from doctor_index import DoctorIndex
+
+USER = (19.07, 72.88)
+
+
+def make_doctors(seed, n=2000, duplicated=0):
+    rng = np.random.default_rng(seed)
+    lat = USER[0] + rng.normal(0, 0.3, n); lon = USER[1] + rng.normal(0, 0.3, n)
+    if duplicated: lat[-duplicated:], lon[-duplicated:] = lat[0], lon[0] # providers sharing one address
+    return [{"name": f"Provider {i}", "location": (float(a), float(b)), "rating": float(r)}
+            for i, (a, b, r) in enumerate(zip(lat, lon, rng.uniform(3, 5, n)))]
+
+
+def reference(doctors, max_distance, min_rating, top_k):
+    lat = np.array([d["location"][0] for d in doctors]); lon = np.array([d["location"][1] for d in doctors])
+    miles = geo_distance.ellipsoidal_miles(*USER, lat, lon)
+    ids = np.flatnonzero((miles <= max_distance) & (np.array([d["rating"] for d in doctors]) >= min_rating))
+    order = sorted(ids.tolist(), key=lambda i: (miles[i], i))[:top_k]
+    return order, miles[order]
+
+
+@pytest.mark.parametrize("top_k", [None, 0, 1, 10, 100, 5000])
+@pytest.mark.parametrize("min_rating", [0.0, 4.0])
+def test_matches_full_sort(top_k, min_rating):
+    doctors = make_doctors(seed=1); index = DoctorIndex(doctors)
+    ids, miles = index.query_ids(*USER, 30, min_rating, top_k)
+    expected_ids, expected_miles = reference(doctors, 30, min_rating, top_k)
+    assert ids.tolist() == expected_ids
+    np.testing.assert_allclose(miles, expected_miles, rtol=1e-12)
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 12, 30])
+def test_ties_at_the_cut_keep_registry_order(top_k):
+    doctors = make_doctors(seed=2, duplicated=20); index = DoctorIndex(doctors)
+    ids, _miles = index.query_ids(*doctors[0]["location"], 5, 0.0, top_k)
+    tied = [0] + list(range(len(doctors) - 20, len(doctors)))
+    assert ids.tolist()[:len(tied)] == tied[:top_k] # the co-located providers come first, in registry order
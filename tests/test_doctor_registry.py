@@ -0,0 +1,33 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Doctor Registry Tests
+# ----------------------------------------------------------------------
+# Provider dicts come back with the display name exactly as listed in
+# doctor_data/providers.csv, in registry order, from every lookup path.
+# ----------------------------------------------------------------------
+import pytest
+
+import doctor_registry
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return doctor_registry.load_registry("doctor_data/providers.csv")
+
+
+def test_names_are_shown_as_listed(registry):
+    heart = [doctor["name"] for doctor in registry.providers(disease="Heart Disease")]
+    assert "Fortis Escorts Heart Institute" in heart and "Narayana Inst. Cardiac Sciences" in heart # specialty already in the name
+    assert "Ruby Hall Clinic (Cardiology)" in heart
+    assert "Ruby Hall Clinic (Endocrinology)" in [doctor["name"] for doctor in registry.providers(disease="Diabetes")]
+
+
+def test_card_uses_the_listed_name(registry):
+    doctor = registry.providers(disease="Heart Disease", specialty="Cardiology")[0]
+    assert doctor["card_head"].startswith(f"**{doctor['name']}**")
+
+
+@pytest.mark.parametrize("disease", ["Diabetes", "Heart Disease", "Parkinsons"])
+def test_lookup_by_id_matches_listing(registry, disease):
+    ids = registry.locations(disease)[0].tolist()
+    listed = registry.providers(disease=disease)
+    assert [d["name"] for d in registry.providers_by_id(ids[::-1])] == [d["name"] for d in listed][::-1]
@@ -0,0 +1,95 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Feature Schema Validation Tests
+# ----------------------------------------------------------------------
+# Table-driven checks of `validate` / `validate_record`: one bad cell per
+# case on an otherwise valid record, the derived plausible ranges and
+# agreement between the vectorized (list / frame) and per-record paths.
+# ----------------------------------------------------------------------
+import pandas as pd
+import pytest
+
+import feature_schema
+from feature_schema import FEATURE_COLUMNS, RANGE_MARGIN, RecordValidationError, validate, validate_record
+
+VALID = {
+    "Diabetes": {"Pregnancies": "6", "Glucose": "148", "BloodPressure": "72", "SkinThickness": "35", "Insulin": "0",
+                 "BMI": "33.6", "DiabetesPedigreeFunction": "0.627", "Age": "50"},
+    "Heart Disease": {"age": "63", "sex": 1, "cp": 3, "trestbps": "145", "chol": "233", "fbs": 1, "restecg": 0,
+                      "thalach": "150", "exang": 0, "oldpeak": "2.3", "slope": 0, "ca": 0, "thal": 1},
+}
+
+# (disease, column, raw value, expected message; None = accepted)
+CASES = [
+    ("Diabetes", "Glucose", "", "required"),
+    ("Diabetes", "Glucose", "   ", "required"),
+    ("Diabetes", "Glucose", None, "required"),
+    ("Diabetes", "Glucose", float("nan"), "required"),
+    ("Diabetes", "Glucose", "abc", "must be a number"),
+    ("Diabetes", "Glucose", True, "must be a number"),
+    ("Diabetes", "Glucose", "nan", "must be a number"),
+    ("Diabetes", "BMI", "inf", "must be a finite number"),
+    ("Diabetes", "BMI", "-inf", "must be a finite number"),
+    ("Diabetes", "BMI", float("inf"), "must be a finite number"),
+    ("Diabetes", "Pregnancies", "2.5", "must be a whole number"),
+    ("Diabetes", "Age", "0", "must be between 1 and 120"),
+    ("Diabetes", "Age", "121", "must be between 1 and 120"),
+    ("Diabetes", "Age", "120", None),
+    ("Diabetes", "Glucose", " 148 ", None),
+    ("Diabetes", "Glucose", 148, None),
+    ("Heart Disease", "sex", "2", "must be one of 0, 1"),
+    ("Heart Disease", "sex", "-1", "must be one of 0, 1"),
+    ("Heart Disease", "thal", 4, "must be one of 0, 1, 2, 3"),
+    ("Heart Disease", "ca", "4", None),
+    ("Heart Disease", "cp", "1.5", "must be a whole number"),
+    ("Heart Disease", "cp", "", "required"),
+]
+
+
+def record_with(disease, column, value):
+    return {**VALID[disease], column: value}
+
+
+@pytest.mark.parametrize("disease", list(VALID))
+def test_valid_record_in_model_order(disease):
+    row = validate_record(disease, VALID[disease])
+    assert row == [float(VALID[disease][name]) for name in FEATURE_COLUMNS[disease]]
+
+
+@pytest.mark.parametrize("disease, column, value, expected", CASES)
+def test_single_cell(disease, column, value, expected):
+    result = validate(disease, record_with(disease, column, value))
+    assert result.errors() == ({} if expected is None else {0: {column: expected}})
+    if expected is None: validate_record(disease, record_with(disease, column, value))
+    else:
+        with pytest.raises(RecordValidationError) as caught: validate_record(disease, record_with(disease, column, value))
+        assert caught.value.errors == {column: expected}
+
+
+@pytest.mark.parametrize("disease, column", [("Diabetes", "Glucose"), ("Diabetes", "BMI"), ("Heart Disease", "chol")])
+def test_plausible_range_widens_observed_by_margin(disease, column):
+    stats = feature_schema.load_ranges()[disease][column]
+    span = (stats["observed_max"] - stats["observed_min"]) * RANGE_MARGIN
+    assert stats["max"] >= stats["observed_max"] + span
+    assert stats["min"] <= max(stats["observed_min"] - span, 0.0)
+    for value in (stats["observed_max"], stats["observed_max"] + span, stats["max"]):
+        assert validate(disease, record_with(disease, column, str(value))).ok
+    expected = f"must be between {stats['min']:g} and {stats['max']:g}"
+    assert validate(disease, record_with(disease, column, str(stats["max"] * 1.01 + 1))).errors() == {0: {column: expected}}
+
+
+@pytest.mark.parametrize("disease", list(VALID))
+def test_vectorized_matches_per_record(disease):
+    records = [record_with(d, column, value) for d, column, value, _ in CASES if d == disease] + [VALID[disease]]
+    per_record = {}
+    for i, record in enumerate(records):
+        try: validate_record(disease, record)
+        except RecordValidationError as e: per_record[i] = e.errors
+    assert validate(disease, records).errors() == per_record
+    assert validate(disease, pd.DataFrame(records)).errors() == per_record
+
+
+def test_error_limit_is_row_major():
+    records = [record_with("Diabetes", "Glucose", ""), {}, VALID["Diabetes"]]
+    result = validate("Diabetes", records)
+    assert result.n_errors == 1 + len(FEATURE_COLUMNS["Diabetes"])
+    assert result.errors(limit=3) == {0: {"Glucose": "required"}, 1: {"Pregnancies": "required", "Glucose": "required"}}
@@ -0,0 +1,142 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Model Registry Tests
+# ----------------------------------------------------------------------
+# Publishes small logistic-regression models into a temporary manifest and
+# checks refresh (verify -> load -> warm up -> swap), failure handling,
+# rollback and the background watcher.
+# ----------------------------------------------------------------------
+import os
+import pickle
+import time
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+import model_registry
+from model_registry import ModelRegistry
+
+DISEASE = "Diabetes"
+N_FEATURES = 8
+
+
+def make_model(tmp_path, name, seed):
+    """Pickles a fitted model; different seeds give different files (and so versions)."""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(60, N_FEATURES)); y = (X[:, seed % N_FEATURES] > 0).astype(int)
+    path = tmp_path / f"{name}.sav"
+    with open(path, "wb") as file: pickle.dump(LogisticRegression().fit(X, y), file)
+    return str(path)
+
+
+@pytest.fixture
+def manifest_path(tmp_path):
+    return str(tmp_path / "models" / "manifest.json")
+
+
+def publish(manifest_path, model_path):
+    """Adds and activates a version, then writes the manifest as the CLI would."""
+    manifest = model_registry.load_or_create(manifest_path)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    version = model_registry.add_version(manifest, DISEASE, model_path, manifest_path)
+    model_registry.write_manifest(manifest, manifest_path)
+    return version
+
+
+def corrupt(manifest_path, version):
+    entry = model_registry.read_manifest(manifest_path)["versions"][DISEASE][version]
+    with open(os.path.join(os.path.dirname(manifest_path), entry["file"]), "ab") as file: file.write(b"\0corrupted")
+
+
+def failed_swaps():
+    return model_registry.swaps.value(disease=DISEASE, result="failed")
+
+
+def test_serves_the_active_version(tmp_path, manifest_path):
+    v1 = publish(manifest_path, make_model(tmp_path, "v1", 1))
+    registry = ModelRegistry(manifest_path, preload=[DISEASE])
+    assert registry.version(DISEASE) == v1
+    assert registry.get(DISEASE).predict(np.zeros((1, N_FEATURES))).shape == (1,)
+    assert DISEASE not in registry.errors
+
+
+def test_corrupted_version_keeps_last_good_model(tmp_path, manifest_path):
+    v1 = publish(manifest_path, make_model(tmp_path, "v1", 1))
+    registry = ModelRegistry(manifest_path, preload=[DISEASE]); good_model = registry.get(DISEASE)
+    v2 = publish(manifest_path, make_model(tmp_path, "v2", 2)); corrupt(manifest_path, v2)
+    failed_before = failed_swaps()
+
+    assert registry.refresh(force=True) == {}
+    assert registry.get(DISEASE) is good_model and registry.version(DISEASE) == v1
+    assert registry.errors[DISEASE].startswith(v2) and "Checksum mismatch" in registry.errors[DISEASE]
+    assert failed_swaps() == failed_before + 1
+
+
+def test_rollback_reactivates_previous_version(tmp_path, manifest_path):
+    v1 = publish(manifest_path, make_model(tmp_path, "v1", 1))
+    v2 = publish(manifest_path, make_model(tmp_path, "v2", 2))
+    registry = ModelRegistry(manifest_path, preload=[DISEASE])
+    assert registry.version(DISEASE) == v2
+
+    manifest = model_registry.read_manifest(manifest_path)
+    assert model_registry.rollback_version(manifest, DISEASE) == v1
+    model_registry.write_manifest(manifest, manifest_path)
+    assert registry.refresh(force=True) == {DISEASE: v1}
+    assert registry.version(DISEASE) == v1
+
+    with pytest.raises(ValueError): model_registry.rollback_version(manifest, DISEASE)
+
+
+def test_successful_swap_clears_error(tmp_path, manifest_path):
+    publish(manifest_path, make_model(tmp_path, "v1", 1))
+    registry = ModelRegistry(manifest_path, preload=[DISEASE])
+    corrupt(manifest_path, publish(manifest_path, make_model(tmp_path, "v2", 2)))
+    registry.refresh(force=True); assert DISEASE in registry.errors
+
+    v3 = publish(manifest_path, make_model(tmp_path, "v3", 3))
+    assert registry.refresh(force=True) == {DISEASE: v3}
+    assert DISEASE not in registry.errors
+
+
+def test_watcher_picks_up_activation(tmp_path, manifest_path):
+    publish(manifest_path, make_model(tmp_path, "v1", 1))
+    registry = ModelRegistry(manifest_path, preload=[DISEASE]); registry.start_watcher(interval=0.02)
+    try:
+        v2 = publish(manifest_path, make_model(tmp_path, "v2", 2))
+        deadline = time.monotonic() + 5
+        while registry.version(DISEASE) != v2 and time.monotonic() < deadline: time.sleep(0.02)
+        assert registry.version(DISEASE) == v2
+    finally:
+        registry.stop_watcher()
+
+
+def test_failed_version_is_retried_without_a_manifest_change(tmp_path, manifest_path):
+    v1 = publish(manifest_path, make_model(tmp_path, "v1", 1))
+    registry = ModelRegistry(manifest_path, preload=[DISEASE])
+    v2 = publish(manifest_path, make_model(tmp_path, "v2", 2))
+    entry = model_registry.read_manifest(manifest_path)["versions"][DISEASE][v2]
+    model_file = os.path.join(os.path.dirname(manifest_path), entry["file"])
+    with open(model_file, "rb") as file: complete = file.read()
+    with open(model_file, "wb") as file: file.write(complete[:len(complete) // 2]) # still being copied
+
+    assert registry.refresh() == {} and registry.version(DISEASE) == v1 and DISEASE in registry.errors
+    with open(model_file, "wb") as file: file.write(complete)
+    assert registry.refresh() == {DISEASE: v2} # same manifest stamp
+    assert DISEASE not in registry.errors and registry.refresh() == {}
+
+
+@pytest.mark.parametrize("damage", ["malformed", "missing_entry"])
+def test_bad_manifest_keeps_current_model(tmp_path, manifest_path, damage):
+    v1 = publish(manifest_path, make_model(tmp_path, "v1", 1))
+    registry = ModelRegistry(manifest_path, preload=[DISEASE]); good_model = registry.get(DISEASE)
+    if damage == "malformed":
+        with open(manifest_path, "w", encoding="utf-8") as file: file.write('{"format": 1, "active": {')
+    else:
+        manifest = model_registry.read_manifest(manifest_path); manifest["active"][DISEASE] = "0123456789abcdef"
+        model_registry.write_manifest(manifest, manifest_path)
+    failed_before = failed_swaps()
+
+    assert registry.refresh(force=True) == {}
+    assert registry.get(DISEASE) is good_model and registry.version(DISEASE) == v1
+    assert DISEASE in registry.errors and failed_swaps() == failed_before + 1
+    assert ModelRegistry(manifest_path).get(DISEASE) is None # nothing loaded yet: get() reports, never raises
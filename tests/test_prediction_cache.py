@@ -0,0 +1,91 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Prediction Cache Tests
+# ----------------------------------------------------------------------
+# Key hashing/normalization, the large-batch bypass, LRU eviction and TTL
+# expiry (driven by an injected clock) of prediction_cache.PredictionCache.
+# ----------------------------------------------------------------------
+import numpy as np
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache
+
+
+class CountingModel:
+    """Predicts 1 when the first feature is positive; records every row it scores."""
+
+    def __init__(self, version="v1"):
+        self.version = version; self.scored = []
+
+    def predict(self, X):
+        self.scored.extend(map(tuple, X))
+        return (np.asarray(X)[:, 0] > 0).astype(int)
+
+
+class Clock:
+    def __init__(self): self.now = 1000.0
+    def __call__(self): return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def test_equivalent_rows_share_a_key():
+    cache = PredictionCache(secret=b"s" * 32)
+    keys = cache._keys("v1", prediction_cache.normalize([[148, 0.0], ["148.0", -0.0], [148.0000000001, 0]]))
+    assert len(set(keys)) == 1 and len(keys[0]) == 16
+
+
+def test_keys_depend_on_version_and_secret():
+    X = prediction_cache.normalize([[148.0, 33.6]])
+    first = PredictionCache(secret=b"a" * 32)
+    assert first._keys("v1", X) != first._keys("v2", X)
+    assert first._keys("v1", X) != PredictionCache(secret=b"b" * 32)._keys("v1", X)
+    assert X.tobytes() not in first._keys("v1", X)[0] # no feature bytes kept
+
+
+def test_hits_skip_the_model():
+    cache = PredictionCache(); model = CountingModel()
+    assert cache.predict(model, [[1.0, 2.0], [-1.0, 2.0]]).tolist() == [1, 0]
+    assert cache.predict(model, [[-1.0, 2.0], [3.0, 2.0]]).tolist() == [0, 1]
+    assert model.scored == [(1.0, 2.0), (-1.0, 2.0), (3.0, 2.0)]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 3)
+
+
+def test_new_model_version_misses():
+    cache = PredictionCache(); old, new = CountingModel("v1"), CountingModel("v2")
+    cache.predict(old, [[1.0]]); cache.predict(new, [[1.0]])
+    assert len(new.scored) == 1
+
+
+def test_large_batches_bypass_the_cache():
+    cache = PredictionCache(max_cached_rows=1000); model = CountingModel()
+    X = np.arange(1001, dtype=np.float64).reshape(-1, 1)
+    assert cache.predict(model, X).tolist() == (X[:, 0] > 0).astype(int).tolist()
+    assert cache.stats()["bypassed_rows"] == 1001 and cache.stats()["entries"] == 0
+    cache.predict(model, X[:1000])
+    assert cache.stats()["entries"] == 1000
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2); model = CountingModel()
+    lru_before = prediction_cache.evictions.value(reason="lru")
+    cache.predict(model, [[1.0]]); cache.predict(model, [[2.0]])
+    cache.predict(model, [[1.0]]) # refreshes 1.0, so 2.0 is now the oldest
+    cache.predict(model, [[3.0]])
+    assert prediction_cache.evictions.value(reason="lru") == lru_before + 1
+    model.scored.clear(); cache.predict(model, [[1.0], [3.0], [2.0]])
+    assert model.scored == [(2.0,)]
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(ttl_seconds=60, clock=clock); model = CountingModel()
+    ttl_before = prediction_cache.evictions.value(reason="ttl")
+    cache.predict(model, [[1.0]])
+    clock.now += 59.9; cache.predict(model, [[1.0]])
+    assert len(model.scored) == 1
+    clock.now += 0.1; cache.predict(model, [[1.0]])
+    assert len(model.scored) == 2 and prediction_cache.evictions.value(reason="ttl") == ttl_before + 1
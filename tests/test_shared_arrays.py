@@ -0,0 +1,48 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Shared Array Bundle Tests
+# ----------------------------------------------------------------------
+# Round trip through a mapped bundle, no temp files left behind, and
+# pruning to the current + previous bundle of each family.
+# ----------------------------------------------------------------------
+import os
+import time
+
+import numpy as np
+
+import shared_arrays
+
+
+def build(value):
+    return lambda: ({"x": np.full(3, value, dtype=np.float64), "names": np.array(["a", "bc"])}, {"version": value})
+
+
+def test_round_trip_is_read_only_view(tmp_path):
+    arrays, meta = shared_arrays.shared_bundle(str(tmp_path), "doctors-diabetes-v1", build(1.5))
+    assert arrays["x"].tolist() == [1.5] * 3 and arrays["names"].tolist() == ["a", "bc"] and meta == {"version": 1.5}
+    assert not arrays["x"].flags.writeable
+    assert os.listdir(tmp_path) == ["doctors-diabetes-v1.hga"]
+
+
+def test_existing_bundle_is_not_rebuilt(tmp_path):
+    shared_arrays.shared_bundle(str(tmp_path), "kernel-diabetes-v1", build(1.0))
+    arrays, _meta = shared_arrays.shared_bundle(str(tmp_path), "kernel-diabetes-v1", lambda: 1 / 0)
+    assert arrays["x"][0] == 1.0
+
+
+def test_keeps_current_and_previous_per_family(tmp_path):
+    directory = str(tmp_path)
+    for version in range(1, 5):
+        shared_arrays.shared_bundle(directory, f"kernel-diabetes-v{version}", build(version))
+        shared_arrays.shared_bundle(directory, f"kernel-heart_disease-v{version}", build(version))
+        time.sleep(0.01) # distinct mtimes
+    assert sorted(os.listdir(directory)) == ["kernel-diabetes-v3.hga", "kernel-diabetes-v4.hga",
+                                             "kernel-heart_disease-v3.hga", "kernel-heart_disease-v4.hga"]
+
+
+def test_mapping_marks_a_bundle_as_in_use(tmp_path):
+    directory = str(tmp_path)
+    for version in (1, 2):
+        shared_arrays.shared_bundle(directory, f"doctors-diabetes-v{version}", build(version)); time.sleep(0.01)
+    shared_arrays.shared_bundle(directory, "doctors-diabetes-v1", build(1)); time.sleep(0.01) # rolled back
+    shared_arrays.shared_bundle(directory, "doctors-diabetes-v3", build(3))
+    assert sorted(os.listdir(directory)) == ["doctors-diabetes-v1.hga", "doctors-diabetes-v3.hga"]
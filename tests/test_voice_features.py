@@ -0,0 +1,58 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Voice Feature WAV Input Tests
+# ----------------------------------------------------------------------
+# read_chunks on damaged or unsupported uploads: everything the
+# Parkinson's page can receive must either decode or raise
+# VoiceFeatureError (the only error the page reports).
+# ----------------------------------------------------------------------
+import io
+import wave
+
+import numpy as np
+import pytest
+
+import voice_features
+from voice_features import VoiceFeatureError, read_chunks
+
+RATE = 8000
+
+
+def wav_bytes(width=2, channels=2, frames=RATE):
+    samples = (np.sin(np.arange(frames * channels) / 5) * 100).astype({1: "u1", 2: "<i2", 4: "<i4"}[width])
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(channels); writer.setsampwidth(width); writer.setframerate(RATE); writer.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def decoded_frames(data, **kwargs):
+    return sum(len(block) for _rate, block in read_chunks(io.BytesIO(data), **kwargs))
+
+
+@pytest.mark.parametrize("width", [1, 2, 4])
+def test_decodes_whole_file(width):
+    assert decoded_frames(wav_bytes(width)) == RATE
+
+
+@pytest.mark.parametrize("cut", [1, 2, 3, 5])
+def test_truncated_upload_drops_the_partial_frame(cut):
+    assert decoded_frames(wav_bytes(2, 2)[:-cut]) == RATE - 1 - (cut - 1) // 4
+
+
+def test_truncated_mid_chunk():
+    assert decoded_frames(wav_bytes(2, 2)[:-3], chunk_seconds=0.1) == RATE - 1
+
+
+@pytest.mark.parametrize("width", [5, 8])
+def test_unsupported_sample_width(width):
+    data = bytearray(wav_bytes(2, 1))
+    data[32:34] = width.to_bytes(2, "little"); data[34:36] = (8 * width).to_bytes(2, "little") # block align, bits per sample
+    with pytest.raises(VoiceFeatureError, match="sample width"): list(read_chunks(io.BytesIO(bytes(data))))
+
+
+def test_not_a_wav():
+    with pytest.raises(VoiceFeatureError): list(read_chunks(io.BytesIO(b"ID3 not a wav file at all")))
+
+
+def test_extract_reports_short_or_damaged_recordings():
+    with pytest.raises(VoiceFeatureError): voice_features.extract(io.BytesIO(wav_bytes(2, 1, frames=100)[:-3]))
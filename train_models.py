@@ -0,0 +1,173 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Model Training Pipeline
+# ----------------------------------------------------------------------
+# Command-line replacement for the Colab notebooks. Reads dataset/*.csv,
+# runs a cross-validated hyperparameter search for every candidate model
+# (Random Forest, Decision Tree, SVM, Logistic Regression) per disease in
+# a process pool, and writes the best model per disease as a versioned
+# artifact with a metadata.json of metrics, parameters and timings.
+# Every split and estimator is seeded, so a run is reproducible.
+#
+#   python train_models.py                       # -> saved_models/runs/<run_id>/
+#   python train_models.py --diseases Diabetes --candidates svm logistic_regression
+#   python train_models.py --install             # also publish + activate (model_registry.py)
+# ----------------------------------------------------------------------
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+import batch_predict
+import linear_kernel
+import model_registry
+
+DATASET_FILES = {"Diabetes": "dataset/diabetes.csv", "Heart Disease": "dataset/heart.csv", "Parkinsons": "dataset/parkinsons.csv"}
+LABEL_COLUMNS = {"Diabetes": "Outcome", "Heart Disease": "target", "Parkinsons": "status"}
+RUNS_DIR = "saved_models/runs"
+TEST_SIZE = 0.2
+CV_FOLDS = 5
+DEFAULT_SEED = 2 # the notebooks' train_test_split random_state
+TEST_METRICS = ["accuracy", "precision", "recall", "f1", "roc_auc"]
+
+
+def _candidate(name, seed):
+    """(estimator, param_grid) for one candidate; SVM and LR get a StandardScaler (folded into the .npz on export)."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+    from sklearn.tree import DecisionTreeClassifier
+    if name == "random_forest":
+        return RandomForestClassifier(n_estimators=200, random_state=seed, n_jobs=1), {
+            "max_depth": [None, 8], "min_samples_leaf": [1, 3], "max_features": ["sqrt", 0.5]}
+    if name == "decision_tree":
+        return DecisionTreeClassifier(random_state=seed), {
+            "criterion": ["gini", "entropy"], "max_depth": [3, 5, 8, None], "min_samples_leaf": [1, 5, 10]}
+    if name == "svm":
+        return Pipeline([("scale", StandardScaler()), ("model", SVC(probability=False, random_state=seed))]), [
+            {"model__kernel": ["linear"], "model__C": [0.1, 1, 10]},
+            {"model__kernel": ["rbf"], "model__C": [0.1, 1, 10], "model__gamma": ["scale", 0.01, 0.1]}]
+    if name == "logistic_regression":
+        return Pipeline([("scale", StandardScaler()), ("model", LogisticRegression(max_iter=5000, random_state=seed))]), {
+            "model__C": [0.01, 0.1, 1, 10, 100]}
+    raise ValueError(f"Unknown candidate {name!r}")
+
+
+CANDIDATES = ["random_forest", "decision_tree", "svm", "logistic_regression"]
+
+
+def file_sha256(path):
+    return linear_kernel.file_checksum(path)
+
+
+def load_dataset(disease):
+    """(X, y) as float64/int arrays in the model input column order."""
+    frame = pd.read_csv(DATASET_FILES[disease], encoding="utf-8-sig")
+    return frame[batch_predict.FEATURE_COLUMNS[disease]].to_numpy(dtype=np.float64), frame[LABEL_COLUMNS[disease]].to_numpy(dtype=np.int64)
+
+
+def split_dataset(disease, seed):
+    from sklearn.model_selection import train_test_split
+    X, y = load_dataset(disease)
+    return train_test_split(X, y, test_size=TEST_SIZE, stratify=y, random_state=seed)
+
+
+def search_candidate(disease, name, seed, scoring, folds):
+    """Worker: grid search one candidate for one disease; returns the refit model and its scores."""
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold
+    start = time.perf_counter()
+    X_train, X_test, y_train, y_test = split_dataset(disease, seed)
+    estimator, grid = _candidate(name, seed)
+    search = GridSearchCV(estimator, grid, scoring=scoring, cv=StratifiedKFold(folds, shuffle=True, random_state=seed), n_jobs=1, refit=True)
+    search.fit(X_train, y_train)
+    best = search.best_index_
+    return {"disease": disease, "candidate": name, "model": search.best_estimator_, "params": search.best_params_,
+            "cv_score": float(search.cv_results_["mean_test_score"][best]), "cv_std": float(search.cv_results_["std_test_score"][best]),
+            "grid_size": len(search.cv_results_["params"]), "test": evaluate(search.best_estimator_, X_test, y_test),
+            "seconds": time.perf_counter() - start}
+
+
+def evaluate(model, X_test, y_test):
+    from sklearn import metrics as skm
+    predicted = model.predict(X_test)
+    scores = model.decision_function(X_test) if hasattr(model, "decision_function") else model.predict_proba(X_test)[:, 1]
+    return {"accuracy": float(skm.accuracy_score(y_test, predicted)), "precision": float(skm.precision_score(y_test, predicted, zero_division=0)),
+            "recall": float(skm.recall_score(y_test, predicted)), "f1": float(skm.f1_score(y_test, predicted)),
+            "roc_auc": float(skm.roc_auc_score(y_test, scores)), "n_test": int(len(y_test))}
+
+
+def write_artifacts(result, run_dir):
+    """Pickles the chosen model (+ .npz kernel when linear); returns its metadata entry."""
+    filename = os.path.basename(linear_kernel.MODEL_FILES[result["disease"]])
+    model_path = os.path.join(run_dir, filename)
+    with open(model_path, "wb") as file: pickle.dump(result["model"], file)
+    entry = {"file": filename, "sha256": file_sha256(model_path), "candidate": result["candidate"], "estimator": type(result["model"]).__name__,
+             "params": result["params"], "cv_score": result["cv_score"], "cv_std": result["cv_std"], "test": result["test"], "kernel": None}
+    entry["version"] = entry["sha256"][:16]
+    try: entry["kernel"] = os.path.basename(linear_kernel.export_linear_model(model_path))
+    except ValueError: pass # non-linear winner: served from the pickle
+    return entry
+
+
+def install(run_dir, metadata, manifest_path=model_registry.MANIFEST_PATH):
+    """Publishes and activates a run's models in the manifest; running apps hot-swap them."""
+    manifest = model_registry.load_or_create(manifest_path)
+    published = model_registry.publish_run(manifest, run_dir, manifest_path)
+    model_registry.write_manifest(manifest, manifest_path)
+    for disease, version in published.items(): print(f"Activated {disease}: {metadata['models'][disease]['candidate']} v{version} in {manifest_path}")
+
+
+def train(diseases, candidates, seed=DEFAULT_SEED, scoring="accuracy", folds=CV_FOLDS, workers=None, runs_dir=RUNS_DIR):
+    """Runs the search for every (disease, candidate) in a process pool; returns (run_dir, metadata)."""
+    import sklearn
+    start = time.perf_counter(); results = {}
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(search_candidate, disease, name, seed, scoring, folds) for disease in diseases for name in candidates]
+        for future in as_completed(futures):
+            result = future.result(); results.setdefault(result["disease"], []).append(result)
+            print(f"  {result['disease']:<14} {result['candidate']:<20} cv {scoring} {result['cv_score']:.4f} ± {result['cv_std']:.4f}"
+                  f"  test acc {result['test']['accuracy']:.4f}  ({result['seconds']:.1f}s, {result['grid_size']} settings)")
+    datasets = {disease: file_sha256(DATASET_FILES[disease])[:16] for disease in diseases}
+    run_id = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime()) + "-" + hashlib.sha256(json.dumps([datasets, candidates, seed, scoring, folds]).encode()).hexdigest()[:8]
+    run_dir = os.path.join(runs_dir, run_id); os.makedirs(run_dir, exist_ok=True)
+    metadata = {"run_id": run_id, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "seed": seed, "scoring": scoring,
+                "cv_folds": folds, "test_size": TEST_SIZE, "workers": workers, "python": platform.python_version(),
+                "scikit_learn": sklearn.__version__, "numpy": np.__version__, "datasets": datasets, "models": {}, "candidates": {}}
+    for disease in diseases:
+        ranked = sorted(results[disease], key=lambda r: (-r["cv_score"], CANDIDATES.index(r["candidate"]))) # deterministic tie-break
+        metadata["models"][disease] = write_artifacts(ranked[0], run_dir)
+        metadata["candidates"][disease] = [{k: r[k] for k in ("candidate", "params", "cv_score", "cv_std", "test", "grid_size", "seconds")} for r in ranked]
+    metadata["training_seconds"] = time.perf_counter() - start
+    with open(os.path.join(run_dir, "metadata.json"), "w", encoding="utf-8") as file: json.dump(metadata, file, indent=2, default=str)
+    return run_dir, metadata
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and select HealthGuard models from dataset/*.csv.")
+    parser.add_argument("--diseases", nargs="+", choices=list(DATASET_FILES), default=list(DATASET_FILES))
+    parser.add_argument("--candidates", nargs="+", choices=CANDIDATES, default=CANDIDATES)
+    parser.add_argument("--scoring", default="accuracy", help="scikit-learn scorer used to pick the best model (e.g. accuracy, f1, roc_auc)")
+    parser.add_argument("--folds", type=int, default=CV_FOLDS); parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: all cores)")
+    parser.add_argument("--runs-dir", default=RUNS_DIR)
+    parser.add_argument("--install", action="store_true", help="Publish and activate the selected models in saved_models/manifest.json")
+    args = parser.parse_args(argv)
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # dataset/ and saved_models/ are relative paths
+    run_dir, metadata = train(args.diseases, args.candidates, args.seed, args.scoring, args.folds, args.workers, args.runs_dir)
+    for disease, entry in metadata["models"].items():
+        print(f"{disease}: {entry['candidate']} {entry['params']} cv {entry['cv_score']:.4f}, test acc {entry['test']['accuracy']:.4f} -> v{entry['version']}")
+    print(f"Run {metadata['run_id']} written to {run_dir} in {metadata['training_seconds']:.1f}s")
+    if args.install: install(run_dir, metadata)
+
+
+if __name__ == "__main__":
+    main()
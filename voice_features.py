@@ -0,0 +1,312 @@
+# ----------------------------------------------------------------------
+# HEALTHGUARD - Voice Features from a Sustained-Vowel Recording
+# ----------------------------------------------------------------------
+# Computes the 22 voice measures of the Parkinson's dataset (MDVP pitch,
+# jitter, shimmer and noise measures plus RPDE, DFA, spread1/2, D2, PPE)
+# from a WAV file of a sustained "aaah", in the model's column order.
+#
+# The file is read in CHUNK_SECONDS blocks; each block is framed with a
+# strided view and pitch-tracked in one batch (windowed FFT
+# autocorrelation, Boersma-style window correction). Glottal cycles are
+# then marked peak to peak inside voiced frames, giving the period and
+# amplitude sequences that jitter, shimmer and the pitch-entropy measures
+# are computed from. Only those per-cycle/per-frame values and one
+# NONLINEAR_SECONDS segment of voiced audio (for RPDE, DFA and D2) are
+# kept, so memory does not grow with the waveform.
+#
+# The values follow the published definitions (MDVP/Praat; Little et al.
+# 2007, 2009) but are not MDVP's exact implementation: they fill in the
+# form for review, they are not a clinical measurement.
+#
+#   python voice_features.py recording.wav [more.wav ...]
+# ----------------------------------------------------------------------
+import argparse
+import json
+import time
+import wave
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+import feature_schema
+
+F0_MIN = 65.0 # Hz; MDVP's Flo in the dataset goes down to 65
+F0_MAX = 600.0
+FRAME_PERIODS = 3 # analysis window = 3 periods of F0_MIN (Hann window)
+HOP_SECONDS = 0.01
+VOICING_THRESHOLD = 0.45 # normalized autocorrelation at the pitch lag
+SILENCE_DB = -30.0 # frames this far below the loudest frame so far are unvoiced
+OCTAVE_RATIO = 0.9 # shortest-lag autocorrelation peak within this ratio of the highest wins (the window correction inflates long lags)
+CYCLE_SEARCH = (0.7, 1.3) # next glottal peak is searched this many local periods after the last
+CHUNK_SECONDS = 1.0
+MIN_CYCLES = 20
+PPE_REFERENCE_HZ = 127.09 # semitone reference (Little et al. 2009)
+PPE_BINS = 30
+PPE_RANGE = 6.0 # semitones either side of zero residual (bins of 0.4 semitone)
+ONSET_SECONDS = 0.1 # voiced audio skipped before the nonlinear segment starts
+NONLINEAR_SECONDS = 1.0
+NONLINEAR_RATE = 25000 # RPDE / DFA / D2 run on the segment resampled to this rate
+RPDE_DIMENSION, RPDE_DELAY, RPDE_RADIUS, RPDE_T_MAX, RPDE_ANCHORS = 4, 50, 0.12, 1000, 1500
+DFA_SCALES = np.arange(50, 101, 10) # window lengths, samples at NONLINEAR_RATE
+D2_DIMENSION, D2_DELAY, D2_POINTS, D2_THEILER = 6, 12, 1200, 100
+D2_FIT_RANGE = (0.002, 0.05) # correlation sum range whose log-log slope is D2
+
+COLUMNS = feature_schema.FEATURE_COLUMNS["Parkinsons"]
+
+
+class VoiceFeatureError(ValueError):
+    """The recording cannot be read, or holds too little steady voicing to measure."""
+
+
+def read_chunks(file, chunk_seconds=CHUNK_SECONDS):
+    """Yields (sample rate, mono float64 block in [-1, 1]) from a PCM WAV path or file object."""
+    try: reader = wave.open(file, "rb")
+    except (wave.Error, EOFError) as e: raise VoiceFeatureError(f"Not a PCM WAV file: {e}")
+    with reader:
+        rate, channels, width = reader.getframerate(), reader.getnchannels(), reader.getsampwidth()
+        if width not in (1, 2, 3, 4): raise VoiceFeatureError(f"Unsupported sample width: {8 * width} bits (8, 16, 24 or 32-bit PCM expected)")
+        if channels < 1 or rate < 1: raise VoiceFeatureError(f"Invalid WAV header: {channels} channels at {rate} Hz")
+        frames_per_chunk = max(int(rate * chunk_seconds), 1); frame_bytes = width * channels
+        while True:
+            data = reader.readframes(frames_per_chunk)
+            data = data[:len(data) - len(data) % frame_bytes] # a truncated upload ends mid-frame
+            if not data: return
+            if width == 1: samples = (np.frombuffer(data, np.uint8).astype(np.float64) - 128) / 128
+            elif width == 3:
+                raw = np.frombuffer(data, np.uint8).reshape(-1, 3).astype(np.int32)
+                samples = ((raw[:, 0] | raw[:, 1] << 8 | raw[:, 2] << 16) << 8 >> 8) / float(1 << 23)
+            else: samples = np.frombuffer(data, {2: "<i2", 4: "<i4"}[width]).astype(np.float64) / float(1 << (8 * width - 1))
+            yield rate, samples.reshape(-1, channels).mean(axis=1)
+
+
+def _parabolic(left, mid, right):
+    """Offset (-0.5 .. 0.5) of the extremum of the parabola through three equally spaced values (arrays)."""
+    denominator = left - 2 * mid + right
+    return np.clip(np.where(denominator != 0, 0.5 * (left - right) / np.where(denominator != 0, denominator, 1), 0.0), -0.5, 0.5)
+
+
+class VoiceAnalyzer:
+    """Streaming analysis: feed() blocks in order, then features(); state is per-frame/per-cycle values plus one short segment."""
+
+    def __init__(self, rate):
+        self.rate = rate; self.hop = max(int(round(rate * HOP_SECONDS)), 1)
+        self.frame_len = int(round(FRAME_PERIODS * rate / F0_MIN)); self.nfft = 1 << int(np.ceil(np.log2(2 * self.frame_len)))
+        self.lag_min = max(int(np.floor(rate / F0_MAX)), 2); self.lag_max = min(int(np.ceil(rate / F0_MIN)), self.frame_len // 2)
+        self.window = np.hanning(self.frame_len)
+        window_ac = np.fft.irfft(np.abs(np.fft.rfft(self.window, self.nfft)) ** 2)[:self.lag_max + 2]
+        self.window_ac = window_ac / window_ac[0]
+        self.buffer = np.zeros(0); self.start = 0; self.next_frame = 0; self.loudest = 0.0
+        self.f0 = np.zeros(0); self.strength = np.zeros(0); self.voiced = np.zeros(0, bool)
+        self.last_peak = None; self.cursor = 0; self.run = 0; self.periods = []; self.amplitudes = []; self.runs = []
+        self.segment = []; self.segment_len = 0; self.onset = int(ONSET_SECONDS * rate)
+
+    # --- pitch track: all complete frames of the buffer in one batch ---
+    def _track(self):
+        offset = self.next_frame - self.start; n = (len(self.buffer) - offset - self.frame_len) // self.hop + 1
+        if n <= 0: return
+        frames = sliding_window_view(self.buffer[offset:], self.frame_len)[::self.hop][:n]
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        rms = np.sqrt(np.mean(frames ** 2, axis=1)); self.loudest = max(self.loudest, float(rms.max()))
+        ac = np.fft.irfft(np.abs(np.fft.rfft(frames * self.window, self.nfft, axis=1)) ** 2, axis=1)[:, :self.lag_max + 2]
+        r = ac / np.maximum(ac[:, :1], 1e-20) / self.window_ac
+        lags = np.arange(self.lag_min, self.lag_max + 1)
+        candidates = r[:, lags]; peaks = (candidates > r[:, lags - 1]) & (candidates >= r[:, lags + 1])
+        peaks &= candidates >= OCTAVE_RATIO * np.max(np.where(peaks, candidates, -1), axis=1, keepdims=True)
+        best = lags[np.where(peaks.any(axis=1), np.argmax(peaks, axis=1), np.argmax(candidates, axis=1))]; rows = np.arange(n)
+        shift = _parabolic(r[rows, best - 1], r[rows, best], r[rows, best + 1])
+        strength = np.clip(r[rows, best], 0, 0.999999); f0 = self.rate / (best + shift)
+        voiced = (strength >= VOICING_THRESHOLD) & (rms >= self.loudest * 10 ** (SILENCE_DB / 20))
+        self.f0 = np.concatenate([self.f0, f0]); self.strength = np.concatenate([self.strength, strength]); self.voiced = np.concatenate([self.voiced, voiced])
+        self._collect_segment(frames, voiced)
+        self.next_frame += n * self.hop
+
+    def _collect_segment(self, frames, voiced):
+        """Keeps the middle hop of voiced frames (contiguous audio for consecutive frames) until NONLINEAR_SECONDS are held."""
+        need = int(NONLINEAR_SECONDS * self.rate) - self.segment_len
+        if need <= 0 or not voiced.any(): return
+        first = (self.frame_len - self.hop) // 2; spans = frames[voiced, first:first + self.hop].ravel()
+        if self.onset > 0: skip = min(self.onset, len(spans)); self.onset -= skip; spans = spans[skip:]
+        spans = spans[:need]; self.segment.append(spans); self.segment_len += len(spans)
+
+    # --- glottal cycles: peak to peak, searched around the local period ---
+    def _frame_at(self, position):
+        return int(round((position - self.frame_len / 2) / self.hop))
+
+    def _peak_offset(self, peak):
+        i = peak - self.start; left, mid, right = self.buffer[i - 1:i + 2].tolist(); denominator = left - 2 * mid + right
+        return min(max(0.5 * (left - right) / denominator, -0.5), 0.5) if denominator else 0.0
+
+    def _mark_cycles(self):
+        x = self.buffer; end = self.start + len(x) - 2; n_frames = len(self.f0)
+        while True:
+            if self.last_peak is None:
+                k = max(self._frame_at(self.cursor), 0)
+                ahead = np.flatnonzero(self.voiced[k:])
+                if not len(ahead): self.cursor = max(self.cursor, (n_frames - 1) * self.hop + self.frame_len // 2); return
+                k += int(ahead[0]); period = self.rate / self.f0[k]
+                lo = max(int(k * self.hop + self.frame_len // 2 - period / 2), self.cursor, self.start + 1); hi = int(lo + period) + 1
+                if hi > end: return
+                peak = lo + int(np.argmax(x[lo - self.start:hi - self.start]))
+                self.last_peak = peak + self._peak_offset(peak); continue
+            expected = self.last_peak + self.rate / self.f0[min(max(self._frame_at(self.last_peak), 0), n_frames - 1)]; k = self._frame_at(expected)
+            if k >= n_frames: return
+            if k < 0 or not self.voiced[k]: # voicing ends: resume the search at the next voiced frame past it
+                self.cursor = int(expected) + 1; self.last_peak = None; self.run += 1; continue
+            period = self.rate / self.f0[k]
+            lo = int(self.last_peak + CYCLE_SEARCH[0] * period); hi = int(self.last_peak + CYCLE_SEARCH[1] * period) + 1
+            if hi > end: return
+            peak = lo + int(np.argmax(x[lo - self.start:hi - self.start]))
+            if peak in (lo, hi - 1): # no peak inside the window (voicing ending, or a glitch): start a new stretch after it
+                self.cursor = hi; self.last_peak = None; self.run += 1; continue
+            position = peak + self._peak_offset(peak); cycle = x[int(self.last_peak) - self.start:peak - self.start]
+            self.periods.append((position - self.last_peak) / self.rate); self.amplitudes.append(float(x[peak - self.start] - cycle.mean())); self.runs.append(self.run)
+            self.last_peak = position
+
+    def feed(self, samples):
+        self.buffer = np.concatenate([self.buffer, samples]); self._track(); self._mark_cycles()
+        keep = min(self.next_frame, self.cursor if self.last_peak is None else int(self.last_peak) - 1) # frames and cycles still to come
+        if keep > self.start: self.buffer = self.buffer[keep - self.start:]; self.start = keep
+        return self
+
+    # --- features ---
+    def features(self):
+        """{column: value} in the model's column order."""
+        periods, amplitudes, runs = np.array(self.periods), np.array(self.amplitudes), np.array(self.runs)
+        if len(periods) < MIN_CYCLES: raise VoiceFeatureError(f"Only {len(periods)} voice cycles found; record at least 2 seconds of a steady 'aaah'")
+        voiced = self.voiced
+        values = {**pitch_measures(periods, runs), **amplitude_measures(amplitudes, runs)}
+        r = self.strength[voiced]; values["NHR"] = float(np.mean((1 - r) / r)); values["HNR"] = float(np.mean(10 * np.log10(r / (1 - r))))
+        values.update(pitch_entropy(periods, runs))
+        segment = np.concatenate(self.segment) if self.segment else np.zeros(0)
+        if len(segment) < 0.25 * NONLINEAR_SECONDS * self.rate: raise VoiceFeatureError("Too little steady voicing for the nonlinear measures")
+        segment = np.interp(np.arange(0, len(segment) * NONLINEAR_RATE / self.rate) * self.rate / NONLINEAR_RATE, np.arange(len(segment)), segment)
+        segment = segment / np.max(np.abs(segment))
+        values.update(RPDE=rpde(segment), DFA=dfa(segment), D2=correlation_dimension(segment))
+        return {column: values[column] for column in COLUMNS}
+
+
+# ----------------------------------------------------------------------
+# --- PERIOD / AMPLITUDE PERTURBATION (MDVP definitions) ---
+# ----------------------------------------------------------------------
+def _runs(values, runs):
+    """Splits a per-cycle sequence into its unbroken voiced stretches."""
+    cuts = np.flatnonzero(np.diff(runs)) + 1
+    return np.split(values, cuts)
+
+
+def _perturbation(values, runs, points):
+    """Mean |value - its `points`-point centred average| over all stretches (points=1: mean |consecutive difference|)."""
+    deviations = []
+    for stretch in _runs(values, runs):
+        if points == 1: deviations.append(np.abs(np.diff(stretch)))
+        elif len(stretch) >= points:
+            average = np.convolve(stretch, np.ones(points) / points, mode="valid")
+            deviations.append(np.abs(stretch[points // 2:len(stretch) - points // 2] - average))
+    deviations = np.concatenate(deviations) if deviations else np.zeros(0)
+    return float(deviations.mean()) if len(deviations) else 0.0
+
+
+def pitch_measures(periods, runs):
+    mean_period = periods.mean(); f0 = 1 / periods; jitter = _perturbation(periods, runs, 1); rap = _perturbation(periods, runs, 3) / mean_period
+    return {"MDVP:Fo(Hz)": float(f0.mean()), "MDVP:Fhi(Hz)": float(f0.max()), "MDVP:Flo(Hz)": float(f0.min()),
+            "MDVP:Jitter(%)": jitter / mean_period, "MDVP:Jitter(Abs)": jitter, "MDVP:RAP": rap,
+            "MDVP:PPQ": _perturbation(periods, runs, 5) / mean_period, "Jitter:DDP": 3 * rap} # the dataset's DDP is exactly 3 x RAP
+
+
+def amplitude_measures(amplitudes, runs):
+    mean_amplitude = amplitudes.mean(); apq3 = _perturbation(amplitudes, runs, 3) / mean_amplitude
+    db = [np.abs(20 * np.diff(np.log10(stretch))) for stretch in _runs(np.maximum(amplitudes, 1e-12), runs)]
+    return {"MDVP:Shimmer": _perturbation(amplitudes, runs, 1) / mean_amplitude, "MDVP:Shimmer(dB)": float(np.concatenate(db).mean()),
+            "Shimmer:APQ3": apq3, "Shimmer:APQ5": _perturbation(amplitudes, runs, 5) / mean_amplitude,
+            "MDVP:APQ": _perturbation(amplitudes, runs, 11) / mean_amplitude, "Shimmer:DDA": 3 * apq3} # DDA = 3 x APQ3, as in the dataset
+
+
+def pitch_entropy(periods, runs):
+    """spread1, spread2, PPE from the semitone pitch sequence whitened by a per-recording AR(2) fit (after Little et al. 2009)."""
+    semitones = 12 * np.log2(1 / periods / PPE_REFERENCE_HZ)
+    rows, targets = [], []
+    for stretch in _runs(semitones, runs):
+        if len(stretch) >= 3: rows.append(np.column_stack([stretch[1:-1], stretch[:-2], np.ones(len(stretch) - 2)])); targets.append(stretch[2:])
+    if rows:
+        A, b = np.vstack(rows), np.concatenate(targets)
+        residual = b - A @ np.linalg.lstsq(A, b, rcond=None)[0]
+    else: residual = semitones - semitones.mean()
+    counts = np.histogram(np.clip(residual, -PPE_RANGE, PPE_RANGE), bins=PPE_BINS, range=(-PPE_RANGE, PPE_RANGE))[0]
+    p = counts[counts > 0] / counts.sum()
+    return {"spread1": float(np.log(max(residual.std() * np.log(2) / 12, 1e-9))), # log of the relative cycle-to-cycle F0 deviation
+            "spread2": float(semitones.std()), "PPE": float(-(p * np.log(p)).sum() / np.log(PPE_BINS))}
+
+
+# ----------------------------------------------------------------------
+# --- NONLINEAR MEASURES (segment at NONLINEAR_RATE, scaled to [-1, 1]) ---
+# ----------------------------------------------------------------------
+def _embed(x, dimension, delay):
+    return sliding_window_view(x, (dimension - 1) * delay + 1)[:, ::delay]
+
+
+def rpde(x, dimension=RPDE_DIMENSION, delay=RPDE_DELAY, radius=RPDE_RADIUS, t_max=RPDE_T_MAX, anchors=RPDE_ANCHORS):
+    """Recurrence period density entropy: normalized entropy of first-return times to a `radius` ball (Little et al. 2007)."""
+    points = _embed(x, dimension, delay); n = len(points) - t_max
+    if n <= 0: return float("nan")
+    starts = np.linspace(0, n - 1, min(anchors, n)).astype(int); counts = np.zeros(t_max + 1)
+    for batch in np.array_split(starts, max(len(starts) // 200, 1)):
+        ahead = sliding_window_view(points, (t_max + 1, dimension))[batch, 0] # (anchors, t_max + 1, dimension)
+        inside = np.sum((ahead - points[batch, None]) ** 2, axis=2) < radius ** 2
+        left = np.argmax(~inside, axis=1); valid = ~inside[np.arange(len(batch)), left]
+        returned = inside & (np.arange(t_max + 1) > left[:, None]); back = np.argmax(returned, axis=1)
+        ok = valid & returned[np.arange(len(batch)), back]
+        counts += np.bincount(back[ok], minlength=t_max + 1)
+    p = counts[counts > 0] / max(counts.sum(), 1)
+    return float(-(p * np.log(p)).sum() / np.log(t_max)) if len(p) else float("nan")
+
+
+def dfa(x, scales=DFA_SCALES):
+    """Detrended fluctuation analysis exponent, squashed to (0, 1) with 1 / (1 + exp(-alpha)) as in the dataset."""
+    profile = np.cumsum(x - x.mean()); fluctuations = []
+    for scale in scales:
+        windows = profile[:len(profile) // scale * scale].reshape(-1, scale)
+        t = np.arange(scale) - (scale - 1) / 2; centred = windows - windows.mean(axis=1, keepdims=True)
+        residual = centred - np.outer(centred @ t / (t @ t), t)
+        fluctuations.append(np.sqrt(np.mean(residual ** 2)))
+    alpha = np.polyfit(np.log(scales), np.log(fluctuations), 1)[0]
+    return float(1 / (1 + np.exp(-alpha)))
+
+
+def correlation_dimension(x, dimension=D2_DIMENSION, delay=D2_DELAY, n_points=D2_POINTS, theiler=D2_THEILER):
+    """Grassberger-Procaccia D2: log-log slope of the correlation sum over D2_FIT_RANGE, on evenly spaced embedded points."""
+    points = _embed(x, dimension, delay); index = np.linspace(0, len(points) - 1, min(n_points, len(points))).astype(int)
+    sample = points[index]; squared = np.sum(sample ** 2, axis=1)
+    distances = np.sqrt(np.maximum(squared[:, None] + squared[None] - 2 * sample @ sample.T, 0))
+    i, j = np.triu_indices(len(index), 1); keep = index[j] - index[i] > theiler
+    distances = np.sort(distances[i[keep], j[keep]]); total = len(distances)
+    low, high = (int(total * fraction) for fraction in D2_FIT_RANGE)
+    ranks = np.unique(np.geomspace(max(low, 1), high, 20).astype(int))
+    slope = np.polyfit(np.log(np.maximum(distances[ranks - 1], 1e-12)), np.log(ranks / total), 1)[0]
+    return float(slope)
+
+
+def extract(file, chunk_seconds=CHUNK_SECONDS):
+    """{column: value} for one WAV recording (path or file object), read block by block."""
+    analyzer = None
+    for rate, samples in read_chunks(file, chunk_seconds):
+        if analyzer is None:
+            if rate < 8000: raise VoiceFeatureError(f"Sample rate {rate} Hz is too low; record at 8 kHz or more")
+            analyzer = VoiceAnalyzer(rate)
+        analyzer.feed(samples)
+    if analyzer is None: raise VoiceFeatureError("The recording is empty")
+    return analyzer.features()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract the Parkinson's model's voice features from sustained-vowel WAV recordings.")
+    parser.add_argument("recordings", nargs="+")
+    args = parser.parse_args(argv)
+    for path in args.recordings:
+        start = time.perf_counter()
+        try: features = extract(path)
+        except VoiceFeatureError as e: print(f"{path}: {e}"); continue
+        print(f"{path} ({(time.perf_counter() - start) * 1000:.0f} ms):"); print(json.dumps(features, indent=2))
+
+
+if __name__ == "__main__":
+    main()